@@ -1,9 +1,15 @@
 from core import LoveOS_Physics
+from loveos_lexicon import compile_lexicon
 
 class LoveOS_Agent:
-    def __init__(self):
+    def __init__(self, perception=None, log=print):
         self.physics = LoveOS_Physics()
         self.history = []
+        # Turn-log sink: print, a logger method (e.g. logging.getLogger('loveos.agent').info), or None
+        self.log = log
+        # Optional scorer with estimate_VA(text) -> (V, A), e.g. a
+        # loveos_perception.PerceptionService; None keeps the lexicon rules below.
+        self.perception = perception
 
         # Bilingual lexicons (English + Japanese). All lowercased for matching.
         self.stress_words = [
@@ -14,17 +20,27 @@ class LoveOS_Agent:
             "thank you", "thanks", "love", "awesome", "helpful",
             "ありがとう", "好き", "すごい", "助かる"
         ]
+        self.compile_lexicon()
+
+    def compile_lexicon(self):
+        """(Re)build the matcher for stress_words / love_words; call after editing the lists."""
+        self.lexicon = compile_lexicon({'stress': self.stress_words, 'love': self.love_words})
 
     def perceive_delta(self, user_text: str) -> float:
         """
         Very simple Δ estimator from user text.
-        In production, let an LLM or classifier score the "shock level".
+        With a perception backend the "shock level" is Δ = 0.8·A − 0.6·V
+        (the ContextBridge impact formula); otherwise lexicon rules.
         """
-        t = user_text.lower()
+        if self.perception is not None:
+            V, A = self.perception.estimate_VA(user_text)
+            return 0.8*A - 0.6*V
+
+        hits = self.lexicon.scan(user_text.lower())
 
-        if any(w in t for w in self.stress_words):
+        if hits.distinct('stress'):
             return 1.5    # strong shock
-        if any(w in t for w in self.love_words):
+        if hits.distinct('love'):
             return -0.5   # positive surprise / relief
         return 0.1        # baseline noise
 
@@ -85,14 +101,13 @@ Valence: {val:.2f}, Arousal: {aro:.2f}
         # Dummy response for simulation
         response = "(LLM response would be generated here based on state)"
 
-        # Audit log
-        print("\n--- Turn Log ---")
-        print(f"User Input: '{user_text}'")
-        print(f"Detected Δ: {delta:.2f}")
-        if ritual:
-            print(f"*** AUTO-RITUAL TRIGGERED: {ritual} ***")
-        R, L, E, C = self.physics.z
-        print(f"New State => R={R:.2f}, L={L:.2f}, E={E:.2f}, C={C:.2f}")
-        print("Behavior Guideline:")
-        print(self.generate_system_prompt().split("[Behavior Guideline]")[1].strip())
+        # Audit log (one record per turn)
+        if self.log is not None:
+            R, L, E, C = self.physics.z
+            lines = ["\n--- Turn Log ---", f"User Input: '{user_text}'", f"Detected Δ: {delta:.2f}"]
+            if ritual:
+                lines.append(f"*** AUTO-RITUAL TRIGGERED: {ritual} ***")
+            lines += [f"New State => R={R:.2f}, L={L:.2f}, E={E:.2f}, C={C:.2f}", "Behavior Guideline:",
+                      sys_prompt.split("[Behavior Guideline]")[1].strip()]
+            self.log("\n".join(lines))
         return response
@@ -1,5 +1,18 @@
 import numpy as np
 
+from loveos_engine import RLECEngine
+from loveos_integrators import bind_integrator
+
+# Ritual inputs for this engine (Love-OS v0.95 core)
+RITUALS = {
+    # Deep breathing: reduce Ego, restore Control, dampen Δ
+    'BREATH': {'uL': 0.0, 'uC': +0.2, 'uE': -0.3, 'd_scale': 0.6},
+    # Affective labeling: induce integration (Love)
+    'LABEL':  {'uL': +0.3, 'uC': 0.0, 'uE': 0.0, 'd_scale': 0.8},
+}
+ENGINE = RLECEngine(-2.0, 2.0, RITUALS)
+
+
 class LoveOS_Physics:
     """
     The Core Physics Engine of Love-OS.
@@ -28,6 +41,8 @@ class LoveOS_Physics:
         self.dt = 0.5
         # Integration depth per turn (more steps -> richer "afterglow")
         self.steps_per_turn = 5
+        # Time integrator: 'fused' (fast Euler), 'euler', 'rk4', 'rk45' or a callable
+        self.integrator = 'fused'
 
     def step(self, delta_val: float, ritual_type: str | None = None):
         """
@@ -35,33 +50,10 @@ class LoveOS_Physics:
         delta_val : external stimulus / prediction error Δ
         ritual_type : 'BREATH', 'LABEL', or None
         """
-        # Ritual inputs (uL, uC, uE) and Δ attenuation
-        uL, uC, uE = 0.0, 0.0, 0.0
-        eff_delta = float(delta_val)
-
-        if ritual_type == 'BREATH':
-            # Deep breathing: reduce Ego, restore Control, dampen Δ
-            uE = -0.3
-            uC = +0.2
-            eff_delta *= 0.6
-        elif ritual_type == 'LABEL':
-            # Affective labeling: induce integration (Love)
-            uL = +0.3
-            eff_delta *= 0.8
-
-        # Euler integration for several micro-steps
-        for _ in range(self.steps_per_turn):
-            R, L, E, C = self.z
-            p = self.params
-
-            dR = p['aR'] * eff_delta - p['bR'] * L * R - p['gR'] * C * R
-            dL = p['aL'] * C - p['bL'] * E * R - p['dL'] * L + uL
-            dE = p['aE'] * abs(eff_delta) - p['bE'] * L - p['dE'] * E + uE
-            dC = -p['aC'] * R + p['bC'] * L - p['dC'] * C + uC
-
-            # Update & clip (anti-explosion safety)
-            self.z += np.array([dR, dL, dE, dC]) * (self.dt / self.steps_per_turn)
-            self.z = np.clip(self.z, -2.0, 2.0)
+        # Integrate one turn (default: Euler micro-steps, clipped for anti-explosion safety)
+        z = ENGINE.turn(self.z.tolist(), self.params, float(delta_val), ritual_type,
+                        dt=self.dt, steps=self.steps_per_turn, integrator=bind_integrator(self, self.integrator))
+        self.z = np.array(z, dtype=float)
 
         return self.z
 
@@ -72,7 +64,62 @@ class LoveOS_Physics:
           Arousal: activation
         """
         R, L, E, C = self.z
-        valence = np.tanh(1.0 * (-R) + 0.8 * L - 1.0 * E + 0.7 * C)
-        # Using softplus-ish form with R,E as proxies of activation
-        arousal = np.log1p(np.exp(0.5 * abs(R) + 0.5 * E))
-        return valence, arousal
+        return ENGINE.observe(R, L, E, C)
+
+
+class LoveOS_PhysicsBatch:
+    """
+    Vectorized Love-OS physics for N independent sessions.
+    Row i of `z` evolves exactly like its own LoveOS_Physics instance,
+    but all rows advance together in one NumPy call per micro-step.
+    """
+    # Ritual codes: 0 = none, then the rituals understood by LoveOS_Physics.step
+    RITUALS = ENGINE.names
+    # (uL, uC, uE, Δ scale) per ritual code
+    RITUAL_TABLE = ENGINE.table
+
+    def __init__(self, n: int, z0=None, params: dict | None = None):
+        """
+        n      : number of sessions
+        z0     : initial states, shape (4,) or (n, 4); defaults to LoveOS_Physics()
+        params : per-key overrides, each a scalar or an array of shape (n,)
+        """
+        base = LoveOS_Physics()
+        self.n = int(n)
+        init = base.z if z0 is None else np.asarray(z0, dtype=float)
+        self.z = np.array(np.broadcast_to(init, (self.n, 4)), dtype=float)
+        self.params = {k: np.full(self.n, v, dtype=float) for k, v in base.params.items()}
+        for k, v in (params or {}).items():
+            self.params[k] = np.array(np.broadcast_to(v, (self.n,)), dtype=float)
+        self.dt = base.dt
+        self.steps_per_turn = base.steps_per_turn
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        """Pack existing LoveOS_Physics instances (same dt / steps) into a batch."""
+        sessions = list(sessions)
+        batch = cls(len(sessions), z0=np.array([s.z for s in sessions]),
+                    params={k: [s.params[k] for s in sessions] for k in sessions[0].params})
+        batch.dt = sessions[0].dt
+        batch.steps_per_turn = sessions[0].steps_per_turn
+        return batch
+
+    def __len__(self):
+        return self.n
+
+    def ritual_codes(self, ritual_types) -> np.ndarray:
+        """Map a sequence of ritual names (or None) to integer ritual codes."""
+        return ENGINE.ritual_codes(ritual_types, self.n)
+
+    def step(self, deltas, ritual_types=None):
+        """
+        Advance every session by one conversation turn.
+        deltas       : Δ per session, shape (n,) (or a scalar for all)
+        ritual_types : per-session ritual names / None, or integer codes
+        """
+        return ENGINE.turn_batch(self.z, self.params, deltas, self.ritual_codes(ritual_types),
+                                 dt=self.dt, steps=self.steps_per_turn)
+
+    def get_observation(self):
+        """Vectorized LoveOS_Physics.get_observation: (valence, arousal) arrays."""
+        return ENGINE.observe_batch(self.z)
@@ -0,0 +1,241 @@
+"""
+Love-OS Async Context Bridge
+----------------------------
+asyncio-native ContextBridge for serving many conversations at once:
+
+    bridge = AsyncContextBridge()
+    result = await bridge.process_turn(session_id, user_text)   # same dict as ContextBridge
+
+Per turn: Perceive -> Physics -> Memory -> Instruction, as in ContextBridge, with
+  - per-session ordering: turns of one session update the state in arrival
+    order, while perception of any turns (same session or not) overlaps
+  - grouped physics: every turn whose perception finished in the same
+    event-loop tick is advanced in one vectorized RLECEngine.turn_batch call
+    (bit-identical to LoveOSState's fused Euler step)
+  - perception: backends with estimate_VA_async (loveos_perception.PerceptionService)
+    are awaited; plain estimate_VA (the lexicon) runs inline, it is microseconds
+  - non-blocking logs: turn logs go to the 'loveos.bridge' logger; see
+    nonblocking_logging() to move handler I/O off the event loop
+  - sessions: a loveos_sessions.SessionManager (default: unbounded, in memory;
+    give it a SessionStore for eviction, lazy restore and snapshots)
+
+Usage:
+  python loveos_async_bridge.py                              # 2000 sessions x 5 turns, p50/p99 latency
+  python loveos_async_bridge.py --sessions 5000 --llm-latency 0.05 --timeout 0.2
+"""
+
+from typing import Dict, List
+import asyncio
+import logging
+import logging.handlers
+import queue
+import time
+
+import numpy as np
+
+from loveos_context_bridge import ContextBridge, EmotionalMemory
+from loveos_integrators import PARAM_KEYS, param_tuple
+from loveos_llm_bridge import ENGINE, LoveOSParams, SimplePerception
+from loveos_sessions import Session, SessionManager
+
+log = logging.getLogger('loveos.bridge')
+
+
+def nonblocking_logging(logger: logging.Logger = log, *handlers: logging.Handler) -> logging.handlers.QueueListener:
+    """
+    Route `logger` through a queue: the event loop only enqueues records, a
+    listener thread formats and writes them with `handlers` (default: stderr).
+    Call .stop() on the returned listener at shutdown to flush it.
+    """
+    q = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(q))
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(q, *(handlers or (logging.StreamHandler(),)))
+    listener.start()
+    return listener
+
+
+class AsyncContextBridge:
+    """ContextBridge for many sessions; all states live in the SessionManager's (N, 4) array."""
+    _generate_instruction = ContextBridge._generate_instruction
+
+    def __init__(self, agent_name="Love-OS", perception=None, params: LoveOSParams = None,
+                 init=(0.1, 0.5, 0.2, 0.5), max_memory_size=50, dt=0.5, steps=5, sessions: SessionManager = None):
+        self.agent_name = agent_name
+        self.perception = perception or SimplePerception()
+        self._perceive_async = getattr(self.perception, 'estimate_VA_async', None)
+        self.K = dict(zip(PARAM_KEYS, param_tuple(params or LoveOSParams())))
+        self.dt, self.steps = dt, steps
+        self.sessions = sessions if sessions is not None else SessionManager(init=init, memory_size=max_memory_size)
+        self._pending: List[tuple] = []          # (row, delta, future) waiting for the next physics batch
+        self._flush_scheduled = False
+        self.stats = dict(turns=0, batches=0, max_batch=0)
+
+    # ------------------------------
+    # Sessions
+    # ------------------------------
+    def session(self, session_id: str) -> Session:
+        return self.sessions.get(session_id)
+
+    def state(self, session_id: str) -> Dict[str, float]:
+        return self.sessions.state(session_id)
+
+    # ------------------------------
+    # Physics: one vectorized step per event-loop tick
+    # ------------------------------
+    def _physics(self, row: int, delta: float) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((row, delta, fut))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return fut
+
+    def _flush(self):
+        pending, self._pending, self._flush_scheduled = self._pending, [], False
+        try:
+            rows = np.fromiter((p[0] for p in pending), dtype=np.intp, count=len(pending))
+            deltas = np.fromiter((p[1] for p in pending), dtype=float, count=len(pending))
+            Z = self.sessions.Z
+            z = Z[rows]
+            # Auto-ritual from the pre-turn state, as in ContextBridge
+            codes = np.where(z[:, 2] > 0.8, ENGINE.codes['BREATH'], np.where(z[:, 0] > 0.8, ENGINE.codes['LABEL'], 0))
+            ENGINE.turn_batch(z, self.K, deltas, codes, dt=self.dt, steps=self.steps)
+            Z[rows] = z
+        except Exception as e:
+            # Fail the whole batch: every waiting turn gets the error instead of hanging
+            for _, _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        names = ENGINE.names
+        for (_, _, fut), out, c in zip(pending, z.tolist(), codes.tolist()):
+            if not fut.cancelled():
+                fut.set_result((out, names[c]))
+        self.stats['batches'] += 1
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(pending))
+
+    # ------------------------------
+    # Turn pipeline
+    # ------------------------------
+    async def process_turn(self, session_id: str, user_text: str) -> Dict[str, str]:
+        """ContextBridge.process_turn for one session; turns of a session apply in call order."""
+        s = self.session(session_id)
+        prev, s.tail = s.tail, asyncio.get_running_loop().create_future()
+        mine = s.tail
+        s.busy += 1
+        try:
+            # 1. Perception (overlaps with everything else in flight)
+            if self._perceive_async is not None:
+                uV, uA = await self._perceive_async(user_text)
+            else:
+                uV, uA = self.perception.estimate_VA(user_text)
+            impact = 0.8 * uA - 0.6 * uV
+
+            # 2. Physics, after this session's previous turn
+            if prev is not None and not prev.done():
+                await prev
+            (R, L, E, C), ritual = await self._physics(s.row, impact)
+        finally:
+            s.busy -= 1
+            mine.set_result(None)
+        if s.tail is mine:
+            s.tail = None
+
+        # 3. Memory
+        snapshot = {'R': R, 'L': L, 'E': E, 'C': C}
+        s.memory.append(EmotionalMemory(timestamp=time.time(), user_input=user_text, ai_state=snapshot,
+                                        delta=impact, ritual_triggered=ritual))
+        s.turns += 1
+        s.dirty = True
+        self.stats['turns'] += 1
+        log.debug("%s #%d delta=%.2f ritual=%s R=%.2f L=%.2f E=%.2f C=%.2f",
+                  session_id, s.turns, impact, ritual, R, L, E, C)
+
+        # 4. Instructions
+        return {
+            "system_instruction": self._generate_instruction(snapshot, ritual),
+            "debug_state": str(snapshot),
+            "ritual": str(ritual)
+        }
+
+# ------------------------------
+# Load generator
+# ------------------------------
+SAMPLE_TURNS = ["Hi, how are you?", "You are terrible at this!", "Why are you so slow? This is useless!",
+                "Wait, I'm sorry, I didn't mean that.", "Thank you for understanding.", "バカ！使えない",
+                "ありがとう、助かる", "Can you explain that again?"]
+
+
+async def load_test(bridge: AsyncContextBridge, sessions=2000, turns=5, think=0.5, seed=0):
+    """
+    `sessions` concurrent users, each sending `turns` messages with exponential
+    think time (mean `think` seconds) in between. Returns per-turn latencies (s).
+    """
+    rng = np.random.default_rng(seed)
+    latencies = []
+
+    async def user(sid, msgs, waits):
+        for text, w in zip(msgs, waits):
+            await asyncio.sleep(w)
+            t0 = time.perf_counter()
+            await bridge.process_turn(sid, text)
+            latencies.append(time.perf_counter() - t0)
+
+    users = [user(f"user-{i}", [SAMPLE_TURNS[j] for j in rng.integers(0, len(SAMPLE_TURNS), turns)],
+                  rng.exponential(think, turns).tolist()) for i in range(sessions)]
+    await asyncio.gather(*users)
+    return np.array(latencies)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import tempfile
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=2000)
+    ap.add_argument("--turns", type=int, default=5)
+    ap.add_argument("--think", type=float, default=0.5, help="mean think time between a user's turns (s)")
+    ap.add_argument("--llm-latency", type=float, default=None,
+                    help="score with the stand-in LLM endpoint at this latency (s) instead of the lexicon")
+    ap.add_argument("--timeout", type=float, default=0.0,
+                    help="max wait for the LLM score with --llm-latency (s); 0 = never wait, use the lexicon")
+    args = ap.parse_args()
+
+    fd, log_path = tempfile.mkstemp(prefix='loveos_async_bridge-', suffix='.log')
+    os.close(fd)
+    listener = nonblocking_logging(log, logging.FileHandler(log_path, mode='w'))
+    log.setLevel(logging.DEBUG)
+
+    # Parity: the grouped async path reproduces the synchronous ContextBridge
+    sync = ContextBridge()
+    ref = [sync.process_turn(t)['debug_state'] for t in SAMPLE_TURNS]
+
+    async def parity():
+        b = AsyncContextBridge()
+        return [r['debug_state'] for r in await asyncio.gather(*(b.process_turn('s', t) for t in SAMPLE_TURNS))]
+    print(f"matches ContextBridge turn by turn: {asyncio.run(parity()) == ref}")
+
+    server = svc = None
+    perception = None
+    if args.llm_latency is not None:
+        from loveos_perception import LLMBackend, PerceptionService, StandInScorer
+        server = StandInScorer(latency=args.llm_latency)
+        svc = perception = PerceptionService(LLMBackend(server.url), timeout=args.timeout, workers=32)
+
+    bridge = AsyncContextBridge(perception=perception)
+    t0 = time.perf_counter()
+    lat = asyncio.run(load_test(bridge, args.sessions, args.turns, args.think))
+    wall = time.perf_counter() - t0
+    p50, p99 = np.percentile(lat, [50, 99]) * 1e3
+    print(f"{args.sessions:,} sessions x {args.turns} turns, mean think {args.think}s "
+          f"(offered ~{args.sessions/args.think:,.0f} turns/s): {len(lat):,} turns in {wall:.2f}s")
+    print(f"per-turn latency: p50 {p50:.2f} ms | p99 {p99:.2f} ms | max {lat.max()*1e3:.2f} ms")
+    print(f"physics batches: {bridge.stats['batches']:,} (mean {bridge.stats['turns']/bridge.stats['batches']:.1f} "
+          f"turns, max {bridge.stats['max_batch']:,})")
+    if svc is not None:
+        print(f"perception: {svc.stats}")
+        svc.close()
+        server.close()
+    listener.stop()
+    print(f"turn log: {log_path}")
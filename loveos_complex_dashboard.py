@@ -12,22 +12,94 @@ Love-OS Complex Dashboard — amplitude / phase / synchrony (v0.1)
 - Dashboard plots (time series): |psi1|, |psi2|, phases arg(psi1/psi2), Kuramoto R, Valence/Arousal.
 
 Run modes:
-  1) Headless demo (default here): simulates and saves PNG + CSV.
+  1) Headless demo (default here): simulates and saves PNG + data (CSV, or NPZ / Parquet / raw via loveos_runio).
   2) Live mode (if you run locally): add flag --live to open an interactive window.
 
 Usage:
   python loveos_complex_dashboard.py            # headless demo, saves files
   python loveos_complex_dashboard.py --live     # interactive window (matplotlib)
+  python loveos_complex_dashboard.py --bench 5000   # ComplexPopulation throughput, 5000 coupled agents
 """
 
 import argparse
+import heapq
+import math
+from dataclasses import dataclass
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 
+from loveos_report import render
+from loveos_runio import RunWriter, open_run
+
 # ------------------------------
 # Complex ODE core
 # ------------------------------
+PARAM_KEYS = ('sigma1', 'omega1', 'kappa1', 'eta1', 'sigma2', 'omega2', 'kappa2', 'eta2', 'Gamma1', 'Gamma2')
+
+# Ritual -> parameter nudges (added for the ritual's duration)
+RITUAL_EFFECTS = {
+    # calm rotation and phase twist
+    'BREATH': {'omega1': -0.6, 'omega2': -0.4, 'eta1': -0.05, 'eta2': -0.03},
+    # enhance integration gain
+    'LABEL': {'sigma1': +0.15},
+    # increase integration + mild saturation to avoid overshoot
+    'REAPPRAISE': {'sigma1': +0.12, 'kappa1': +0.08, 'eta1': -0.02},
+    'CBT': {'sigma1': +0.12, 'kappa1': +0.08, 'eta1': -0.02},
+    # align rhythms and soften phase nonlinearity
+    'COMPASSION': {'omega1': -0.3, 'eta1': -0.06},
+    'AUTONOMY': {'sigma2': +0.12},
+}
+# Parameters rituals can nudge (the real-valued ones)
+OFFSET_KEYS = tuple(k for k in PARAM_KEYS if not k.startswith('Gamma'))
+
+class EffectManager:
+    """
+    Time-aware ritual effects for one agent. Keeps a running sum of the
+    active parameter offsets; expiries sit in a min-heap keyed by t_end, so
+    adding or expiring an effect is O(log n) and reading the offsets O(1),
+    however many rituals have run. An effect is active while t <= t_end.
+    """
+    def __init__(self):
+        self.offsets = {}
+        self.version = 0       # bumped whenever the offsets change
+        self._heap = []        # (t_end, seq, effect)
+        self._seq = 0
+
+    def add(self, t_end: float, eff: dict):
+        for k, v in eff.items():
+            self.offsets[k] = self.offsets.get(k, 0) + v
+        heapq.heappush(self._heap, (t_end, self._seq, eff))
+        self._seq += 1
+        self.version += 1
+
+    def expire(self, t: float):
+        heap = self._heap
+        if not heap or heap[0][0] >= t:
+            return
+        while heap and heap[0][0] < t:
+            _, _, eff = heapq.heappop(heap)
+            for k, v in eff.items():
+                self.offsets[k] -= v
+        if not heap:
+            self.offsets = {}  # drop round-off left by add/subtract
+        self.version += 1
+
+    def active(self):
+        """[(t_end, effect)] of the effects not yet expired, soonest first."""
+        return [(t_end, eff) for t_end, _, eff in sorted(self._heap)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def _deriv(psi, sigma, omega, kappa, eta, Gamma, D, U=0+0j, psi_other=None, K=0.0):
+    coup = 0.0+0.0j
+    if psi_other is not None and K != 0.0:
+        # diffusive complex coupling (align amplitude+phase)
+        coup = K*(psi_other - psi)
+    return (sigma + 1j*omega)*psi - (kappa + 1j*eta)*abs(psi)**2*psi + Gamma*D + U + coup
+
+
 class ComplexAgent:
     def __init__(self, name='self',
                  psi1=0.2+0.1j, psi2=0.2+0.0j,
@@ -43,66 +115,52 @@ class ComplexAgent:
             sigma2=sigma2, omega2=omega2, kappa2=kappa2, eta2=eta2,
             Gamma1=Gamma1, Gamma2=Gamma2
         )
-        # Active ritual schedule: list of (t_end, effect_dict)
-        self.active_effects = []
+        # Simulation clock (advanced by step) and ritual effects
+        self.t = 0.0
+        self.effects = EffectManager()
+        self._cur = (None, None)   # (effects version, params with effects)
+
+    @property
+    def active_effects(self):
+        """Active ritual schedule: list of (t_end, effect_dict)."""
+        return self.effects.active()
 
     def _params_with_effects(self, t):
-        p = self.params.copy()
-        # apply active effects whose t_end >= t
-        new_active = []
-        for t_end, eff in self.active_effects:
-            if t <= t_end:
-                for k,v in eff.items():
-                    p[k] = p.get(k,0) + v
-                new_active.append((t_end, eff))
-        self.active_effects = new_active
+        """Params with the effects active at time t. Cached until an effect starts or ends; do not mutate."""
+        self.effects.expire(t)
+        version, p = self._cur
+        if version != self.effects.version:
+            p = self.params.copy()
+            for k, v in self.effects.offsets.items():
+                p[k] = p.get(k, 0) + v
+            self._cur = (self.effects.version, p)
         return p
 
     def ritual(self, name: str, t: float, duration: float=8.0):
         """Schedule a ritual effect lasting `duration` seconds."""
-        name = name.upper()
-        eff = {}
-        if name == 'BREATH':
-            # calm rotation and phase twist
-            eff = {'omega1': -0.6, 'omega2': -0.4, 'eta1': -0.05, 'eta2': -0.03}
-        elif name == 'LABEL':
-            # enhance integration gain
-            eff = {'sigma1': +0.15}
-        elif name in ('REAPPRAISE','CBT'):
-            # increase integration + mild saturation to avoid overshoot
-            eff = {'sigma1': +0.12, 'kappa1': +0.08, 'eta1': -0.02}
-        elif name == 'COMPASSION':
-            # align rhythms and soften phase nonlinearity
-            eff = {'omega1': -0.3, 'eta1': -0.06}
-        elif name == 'AUTONOMY':
-            eff = {'sigma2': +0.12}
-        else:
+        eff = RITUAL_EFFECTS.get(name.upper())
+        if eff is None:
             return
-        self.active_effects.append((t + duration, eff))
+        self.effects.add(t + duration, dict(eff))
 
-    def step(self, dt: float, Delta: float, other: 'ComplexAgent|None'=None, K: float=0.0):
-        p = self.params
-        # include time-varying effects in derivative computation by reading applied deltas
+    def step(self, dt: float, Delta: float, other: 'ComplexAgent|None'=None, K: float=0.0, t: float=None):
+        """Advance by dt from time t (default: the agent's own clock)."""
         # For stability, use small dt (e.g., 0.02)
-        def deriv(psi, sigma, omega, kappa, eta, Gamma, D, U=0+0j, psi_other=None, K=0.0):
-            coup = 0.0+0.0j
-            if psi_other is not None and K != 0.0:
-                # diffusive complex coupling (align amplitude+phase)
-                coup = K*(psi_other - psi)
-            return (sigma + 1j*omega)*psi - (kappa + 1j*eta)*abs(psi)**2*psi + Gamma*D + U + coup
-
-        # pull dynamic params with current effects (approx by midpoint rule)
-        cur = self._params_with_effects(t=0.0)  # effects already filtered per call site
+        if t is None:
+            t = self.t
+        # params with the ritual effects active at t
+        cur = self._params_with_effects(t)
         # compute derivatives
         psi1_other = other.psi1 if other is not None else None
-        d1 = deriv(self.psi1, cur['sigma1'], cur['omega1'], cur['kappa1'], cur['eta1'], cur['Gamma1'], Delta,
-                   psi_other=psi1_other, K=K)
+        d1 = _deriv(self.psi1, cur['sigma1'], cur['omega1'], cur['kappa1'], cur['eta1'], cur['Gamma1'], Delta,
+                    psi_other=psi1_other, K=K)
         psi2_other = other.psi2 if other is not None else None
-        d2 = deriv(self.psi2, cur['sigma2'], cur['omega2'], cur['kappa2'], cur['eta2'], cur['Gamma2'], Delta*0.6,
-                   psi_other=psi2_other, K=0.5*K)
+        d2 = _deriv(self.psi2, cur['sigma2'], cur['omega2'], cur['kappa2'], cur['eta2'], cur['Gamma2'], Delta*0.6,
+                    psi_other=psi2_other, K=0.5*K)
 
         self.psi1 += dt * d1
         self.psi2 += dt * d2
+        self.t = t + dt
 
     # Readouts
     @property
@@ -121,206 +179,465 @@ class ComplexAgent:
         # V = tanh(a1*Re(psi1) + a2*Re(psi2) - a3*Im(psi1))
         return np.tanh(1.0*self.psi1.real + 0.6*self.psi2.real - 0.8*self.psi1.imag)
 
+# ------------------------------
+# Vectorized population
+# ------------------------------
+class ComplexPopulation:
+    """
+    N coupled ComplexAgents advanced together with array operations.
+      psi1, psi2 : (N,) complex128 state
+      params     : dict of (N,) arrays, same keys as ComplexAgent.params
+      K          : coupling. (N, N) matrix (dense ndarray or scipy.sparse) where
+                   agent i feels sum_j K[i, j]*(psi1_j - psi1_i) on psi1 and half
+                   of that on psi2. A scalar K couples every pair with strength K, as
+                   ComplexAgent.step does for two agents; it is not normalised, so the
+                   total pull on an agent grows with N (pass K/N for mean-field coupling).
+    All agents update simultaneously from the same state. Rituals add parameter
+    offsets to single agents and are removed once their duration has passed.
+    """
+    def __init__(self, psi1, psi2, params: dict, K=0.0, names=None):
+        self.psi1 = np.array(psi1, dtype=np.complex128).ravel()
+        self.psi2 = np.array(psi2, dtype=np.complex128).ravel()
+        n = self.n = len(self.psi1)
+        self.params = {k: np.array(np.broadcast_to(params[k], (n,)),
+                                   dtype=np.complex128 if k.startswith('Gamma') else float)
+                       for k in PARAM_KEYS}
+        self._off = np.zeros((len(OFFSET_KEYS), n))
+        self.offsets = {k: self._off[j] for j, k in enumerate(OFFSET_KEYS)}   # row views
+        self.names = list(names) if names is not None else [f'agent{i}' for i in range(n)]
+        self.t = 0.0
+        self._expiry = []      # heap of (t_end, seq, agent index, effect)
+        self._seq = 0
+        self._coef = None      # cached effective coefficients (invalidated by rituals)
+        self.set_coupling(K)
+
+    @classmethod
+    def from_agents(cls, agents, K=0.0):
+        """Stack ComplexAgent objects (state, params and pending ritual effects) into one population."""
+        pop = cls([a.psi1 for a in agents], [a.psi2 for a in agents],
+                  {k: [a.params[k] for a in agents] for k in PARAM_KEYS}, K=K,
+                  names=[a.name for a in agents])
+        for i, a in enumerate(agents):
+            for t_end, eff in a.active_effects:
+                pop._apply(i, t_end, eff)
+        return pop
+
+    def set_coupling(self, K):
+        if np.isscalar(K):
+            self.K, self._deg = None, float(K)
+        else:
+            if K.shape != (self.n, self.n):
+                raise ValueError(f"Coupling matrix has shape {K.shape}, expected {(self.n, self.n)}")
+            self.K = K
+            self._deg = np.asarray(K.sum(axis=1), dtype=float).ravel()
+
+    def index(self, who) -> int:
+        return who if isinstance(who, (int, np.integer)) else self.names.index(who)
+
+    # ------------------------------
+    # Rituals
+    # ------------------------------
+    def ritual(self, name: str, who, duration: float=8.0, t: float=None):
+        """Apply ritual `name` to agent `who` (index or name) from t (default: now) for `duration` seconds."""
+        eff = RITUAL_EFFECTS.get(name.upper())
+        if eff is not None:
+            self._apply(self.index(who), (self.t if t is None else t) + duration, eff)
+
+    def _apply(self, i, t_end, eff):
+        for k, v in eff.items():
+            self.offsets[k][i] += v
+        heapq.heappush(self._expiry, (t_end, self._seq, i, eff))
+        self._seq += 1
+        self._coef = None
+
+    def _expire(self, t):
+        # same rule as ComplexAgent: an effect is active while t <= t_end
+        while self._expiry and self._expiry[0][0] < t:
+            _, _, i, eff = heapq.heappop(self._expiry)
+            for k, v in eff.items():
+                self.offsets[k][i] -= v
+            self._coef = None
+
+    def shift(self, agents, keys, values):
+        """Add parameter offsets: offsets[OFFSET_KEYS[keys[m]]][agents[m]] += values[m] (see Timeline)."""
+        np.add.at(self._off, (keys, agents), values)
+        self._coef = None
+
+    def effective_params(self) -> dict:
+        return {k: (self.params[k] + self.offsets[k]) if k in self.offsets else self.params[k] for k in PARAM_KEYS}
+
+    def _coefficients(self):
+        if self._coef is None:
+            p = self.effective_params()
+            self._coef = (p['sigma1'] + 1j*p['omega1'], p['kappa1'] + 1j*p['eta1'], p['Gamma1'],
+                          p['sigma2'] + 1j*p['omega2'], p['kappa2'] + 1j*p['eta2'], p['Gamma2'])
+        return self._coef
+
+    # ------------------------------
+    # Dynamics
+    # ------------------------------
+    def coupling(self, psi):
+        """sum_j K[i, j]*(psi_j - psi_i) for every agent i."""
+        if self.K is None:
+            # all-to-all, K per pair: K*(sum_j psi_j - n*psi_i)
+            return self._deg*(psi.sum() - self.n*psi) if self._deg else np.zeros_like(psi)
+        return self.K @ psi - self._deg*psi
+
+    def step(self, dt: float, Delta):
+        """Advance every agent by dt. Delta: stress per agent (N,) or one value for all."""
+        self._expire(self.t)
+        lin1, nl1, G1, lin2, nl2, G2 = self._coefficients()
+        D = np.asarray(Delta, dtype=float)
+        p1, p2 = self.psi1, self.psi2
+        d1 = lin1*p1 - nl1*(p1.real**2 + p1.imag**2)*p1 + G1*D + self.coupling(p1)
+        d2 = lin2*p2 - nl2*(p2.real**2 + p2.imag**2)*p2 + G2*(D*0.6) + 0.5*self.coupling(p2)
+        self.psi1 = p1 + dt*d1
+        self.psi2 = p2 + dt*d2
+        self.t += dt
+
+    # Readouts
+    def valence(self):
+        return np.tanh(1.0*self.psi1.real + 0.6*self.psi2.real - 0.8*self.psi1.imag)
+
+    def kuramoto(self):
+        """Kuramoto order parameter of the psi1 phases."""
+        return np.abs(np.exp(1j*np.angle(self.psi1)).mean())
+
+# ------------------------------
+# Schedule compiler
+# ------------------------------
+@dataclass
+class Timeline:
+    """
+    A schedule compiled onto the step grid t_k = k*dt.
+      Delta        : (n_steps,) summed stress amplitude at every step
+      change_*     : parameter-offset change points sorted by step; from step
+                     change_step[m] on, agent change_agent[m] has
+                     OFFSET_KEYS[change_key[m]] shifted by change_value[m]
+      bounds       : change points of step k are [bounds[k], bounds[k+1])
+      rituals      : (start step, agent, name, duration) for every ritual
+    """
+    dt: float
+    n_steps: int
+    Delta: np.ndarray
+    change_step: np.ndarray
+    change_agent: np.ndarray
+    change_key: np.ndarray
+    change_value: np.ndarray
+    bounds: np.ndarray
+    rituals: list
+
+    def changes(self):
+        """(step, agents, keys, values) for every step with at least one change point, in order."""
+        b = self.bounds
+        for k in np.flatnonzero(b[1:] > b[:-1]).tolist():
+            s, e = b[k], b[k+1]
+            yield k, self.change_agent[s:e], self.change_key[s:e], self.change_value[s:e]
+
+    def ritual_starts(self) -> dict:
+        """step -> [(agent, name, duration)]."""
+        out = {}
+        for k, agent, name, duration in self.rituals:
+            out.setdefault(k, []).append((agent, name, duration))
+        return out
+
+    def offsets(self, key: str, n_agents: int) -> np.ndarray:
+        """Materialize the (n_steps, n_agents) offset of one parameter."""
+        sel = self.change_key == OFFSET_KEYS.index(key)
+        out = np.zeros((self.n_steps + 1, n_agents))
+        np.add.at(out, (self.change_step[sel], self.change_agent[sel]), self.change_value[sel])
+        return np.cumsum(out, axis=0)[:-1]
+
+
+def compile_schedule(schedule, n_steps: int, dt: float, agents=('self', 'other')) -> Timeline:
+    """
+    Compile schedule events ({'t0','t1','type': 'stress'|'ritual', ...}) into a Timeline.
+    Every event time snaps to the first grid step at or after it (to within
+    1e-9 steps), so off-grid t0 values behave the same everywhere:
+      stress : amp is added over steps [snap(t0), snap(t1))
+      ritual : effect starts at snap(t0) and stays on while t <= t_start + (t1 - t0),
+               the same rule ComplexAgent / ComplexPopulation use for expiry
+    `agents` maps the 'who' names to agent indices (integers pass through).
+    """
+    def snap(x):
+        return min(n_steps, max(0, math.ceil(x/dt - 1e-9)))
+
+    diff = np.zeros(n_steps + 1)
+    active = np.zeros(n_steps + 1, dtype=np.int64)
+    steps, who, keys, vals, rituals = [], [], [], [], []
+    for ev in schedule:
+        if ev['type'] == 'stress':
+            k0, k1 = snap(ev['t0']), snap(ev['t1'])
+            if k1 > k0:
+                diff[k0] += ev.get('amp', 1.0); diff[k1] -= ev.get('amp', 1.0)
+                active[k0] += 1; active[k1] -= 1
+        elif ev['type'] == 'ritual':
+            eff = RITUAL_EFFECTS.get(ev['name'].upper())
+            k0 = snap(ev['t0'])
+            if eff is None or k0 >= n_steps:
+                continue
+            agent = ev.get('who', 'self')
+            agent = agent if isinstance(agent, (int, np.integer)) else agents.index(agent)
+            duration = ev['t1'] - ev['t0']
+            k1 = k0 + math.floor(duration/dt + 1e-9) + 1   # first step past the end
+            rituals.append((k0, agent, ev['name'], duration))
+            for key, v in eff.items():
+                steps.append(k0); who.append(agent); keys.append(OFFSET_KEYS.index(key)); vals.append(v)
+                if k1 < n_steps:
+                    steps.append(k1); who.append(agent); keys.append(OFFSET_KEYS.index(key)); vals.append(-v)
+
+    Delta = np.cumsum(diff)[:-1]
+    Delta[np.cumsum(active)[:-1] == 0] = 0.0    # no round-off residue between pulses
+
+    order = np.argsort(np.asarray(steps, dtype=np.int64), kind='stable')
+    change_step = np.asarray(steps, dtype=np.int64)[order]
+    rituals.sort(key=lambda r: r[0])
+    return Timeline(dt=dt, n_steps=n_steps, Delta=Delta,
+                    change_step=change_step,
+                    change_agent=np.asarray(who, dtype=np.intp)[order],
+                    change_key=np.asarray(keys, dtype=np.intp)[order],
+                    change_value=np.asarray(vals, dtype=float)[order],
+                    bounds=np.searchsorted(change_step, np.arange(n_steps + 1), side='left'),
+                    rituals=rituals)
+
 # ------------------------------
 # Simulation driver
 # ------------------------------
 
-def simulate(T=60.0, dt=0.02, K=0.15, schedule=None, headless=True, out_png='complex_dashboard_demo.png', out_csv='complex_dashboard_demo.csv'):
-    N = int(T/dt)
-    t = np.arange(N)*dt
+# default schedule: stress pulses and rituals
+DEFAULT_SCHEDULE = [
+    {'t0':10,'t1':20,'type':'stress','amp':+1.0},
+    {'t0':20,'t1':28,'type':'ritual','name':'BREATH','who':'self'},
+    {'t0':35,'t1':45,'type':'stress','amp':+0.9},
+    {'t0':45,'t1':54,'type':'ritual','name':'LABEL','who':'self'},
+]
+
+def demo_pair(K=0.15):
+    """
+    The self/other pair as an N=2 population, plus per-agent stress gains:
+    other perceives slightly attenuated stress and couples back at 0.8*K.
+    """
     me = ComplexAgent('self')
     you = ComplexAgent('other', psi1=0.15+0.05j, psi2=0.15+0.0j, omega1=1.8, omega2=1.1)
-
-    # default schedule: stress pulses and rituals
-    schedule = schedule or [
-        {'t0':10,'t1':20,'type':'stress','amp':+1.0},
-        {'t0':20,'t1':28,'type':'ritual','name':'BREATH','who':'self'},
-        {'t0':35,'t1':45,'type':'stress','amp':+0.9},
-        {'t0':45,'t1':54,'type':'ritual','name':'LABEL','who':'self'},
-    ]
-
-    # allocate
-    rec = {
-        't': t,
-        'psi1_abs_self': np.zeros(N), 'psi2_abs_self': np.zeros(N),
-        'phi1_self': np.zeros(N), 'phi2_self': np.zeros(N),
-        'V_self': np.zeros(N), 'A_self': np.zeros(N),
-        'psi1_abs_other': np.zeros(N), 'psi2_abs_other': np.zeros(N),
-        'phi1_other': np.zeros(N), 'phi2_other': np.zeros(N),
-        'V_other': np.zeros(N), 'A_other': np.zeros(N),
-        'Delta': np.zeros(N), 'R_kuramoto': np.zeros(N),
-    }
-
-    # helper for Delta
-    def Delta_at(time_s):
-        d = 0.0
-        for ev in schedule:
-            if ev['type']=='stress' and ev['t0'] <= time_s < ev['t1']:
-                d += ev.get('amp',1.0)
-        return d
+    pop = ComplexPopulation.from_agents([me, you], K=np.array([[0.0, K], [K*0.8, 0.0]]))
+    return pop, np.array([1.0, 0.7])
+
+
+def _record(t, P1, P2, Delta):
+    """Dashboard columns for a block of steps (P1 / P2: (m, 2) self / other states)."""
+    rec = {'t': t}
+    for j, tag in enumerate(('self', 'other')):
+        p1, p2 = P1[:, j], P2[:, j]
+        rec.update({
+            f'psi1_abs_{tag}': np.abs(p1), f'psi2_abs_{tag}': np.abs(p2),
+            f'phi1_{tag}': np.angle(p1), f'phi2_{tag}': np.angle(p2),
+            f'V_{tag}': np.tanh(1.0*p1.real + 0.6*p2.real - 0.8*p1.imag), f'A_{tag}': np.abs(p2),
+        })
+    rec['Delta'] = Delta
+    # Kuramoto order parameter for psi1 phases
+    rec['R_kuramoto'] = np.abs(np.exp(1j*np.angle(P1)).mean(axis=1))
+    return rec
+
+
+def simulate(T=60.0, dt=0.02, K=0.15, schedule=None, headless=True, out_png='complex_dashboard_demo.png',
+             out_csv='complex_dashboard_demo.csv', chunk=4096):
+    """
+    Headless run: saves the dashboard PNG and the per-step data. The data path's
+    extension picks the format (.csv, .npz, .parquet, anything else = raw
+    memory-mappable directory; see loveos_runio). Data streams to disk every
+    `chunk` steps and the plots read it back memory-mapped.
+    """
+    N = int(T/dt)
+    t = np.arange(N)*dt
+    schedule = schedule or DEFAULT_SCHEDULE
+    pop, gain = demo_pair(K)
+    P1 = np.empty((chunk, pop.n), dtype=np.complex128)
+    P2 = np.empty((chunk, pop.n), dtype=np.complex128)
+    tl = compile_schedule(schedule, N, dt)
+    changes = {k: ch for k, *ch in tl.changes()}
 
     # simulate
-    for i,ti in enumerate(t):
-        # apply rituals when entering their window
-        for ev in schedule:
-            if ev['type']=='ritual' and abs(ti-ev['t0'])<1e-9:  # start
-                who = me if ev.get('who','self')=='self' else you
-                who.ritual(ev['name'], t=ti, duration=(ev['t1']-ev['t0']))
-        D = Delta_at(ti)
-        me.step(dt, D, other=you, K=K)
-        you.step(dt, D*0.7, other=me, K=K*0.8)  # other perceives slightly attenuated stress
-
-        # record
-        rec['psi1_abs_self'][i] = abs(me.psi1)
-        rec['psi2_abs_self'][i] = abs(me.psi2)
-        rec['phi1_self'][i] = np.angle(me.psi1)
-        rec['phi2_self'][i] = np.angle(me.psi2)
-        rec['V_self'][i] = me.valence()
-        rec['A_self'][i] = me.A
-
-        rec['psi1_abs_other'][i] = abs(you.psi1)
-        rec['psi2_abs_other'][i] = abs(you.psi2)
-        rec['phi1_other'][i] = np.angle(you.psi1)
-        rec['phi2_other'][i] = np.angle(you.psi2)
-        rec['V_other'][i] = you.valence()
-        rec['A_other'][i] = you.A
-
-        rec['Delta'][i] = D
-        # Kuramoto order parameter for psi1 phases (two agents)
-        z = np.exp(1j*rec['phi1_self'][i]) + np.exp(1j*rec['phi1_other'][i])
-        rec['R_kuramoto'][i] = np.abs(z/2.0)
-
-    # save CSV
-    df = pd.DataFrame(rec)
-    df.to_csv(out_csv, index=False)
-
-    # plotting dashboard
-    fig = plt.figure(figsize=(12,8))
-    gs = fig.add_gridspec(2,2)
-
-    # (1) Amplitude
-    ax1 = fig.add_subplot(gs[0,0])
-    ax1.plot(t, rec['psi1_abs_self'], label='|psi1| self', color='#2ca02c')
-    ax1.plot(t, rec['psi1_abs_other'], label='|psi1| other', color='#98df8a')
-    ax1.plot(t, rec['psi2_abs_self'], label='|psi2| self', color='#1f77b4')
-    ax1.plot(t, rec['psi2_abs_other'], label='|psi2| other', color='#aec7e8')
-    ax1.set_title('Amplitude (Integration/Ego & Control/Arousal)')
-    ax1.set_ylabel('Amplitude')
-    ax1.legend(fontsize=8); ax1.grid(alpha=0.3)
-
-    # (2) Phase (wrapped)
-    ax2 = fig.add_subplot(gs[0,1])
-    ax2.plot(t, rec['phi1_self'], label='phase psi1 self', color='#d62728')
-    ax2.plot(t, rec['phi1_other'], label='phase psi1 other', color='#ff9896')
-    ax2.set_title('Phase (psi1)'); ax2.set_ylabel('rad')
-    ax2.legend(fontsize=8); ax2.grid(alpha=0.3)
-
-    # (3) Kuramoto R and Delta
-    ax3 = fig.add_subplot(gs[1,0])
-    ax3.plot(t, rec['R_kuramoto'], label='Kuramoto R (sync)', color='#bcbd22')
-    ax3.step(t, rec['Delta']/max(1.0, np.max(rec['Delta'])), where='mid', label='Delta (scaled)', color='black')
-    ax3.set_title('Synchrony & Stress'); ax3.set_ylabel('R / scaled Δ'); ax3.set_xlabel('time [s]')
-    ax3.legend(fontsize=8); ax3.grid(alpha=0.3)
-
-    # (4) Valence & Arousal (self)
-    ax4 = fig.add_subplot(gs[1,1])
-    ax4.plot(t, rec['V_self'], label='Valence self', color='#17becf')
-    ax4.plot(t, rec['A_self']/max(1e-6, np.max(rec['A_self'])), label='Arousal self (scaled)', color='#7f7f7f')
-    ax4.set_title('Valence & Arousal (self)'); ax4.set_xlabel('time [s]')
-    ax4.legend(fontsize=8); ax4.grid(alpha=0.3)
-
-    fig.suptitle('Love-OS Complex Digital Twin — Amplitude / Phase / Synchrony', fontsize=12)
-    fig.tight_layout(rect=[0,0,1,0.96])
-    fig.savefig(out_png, dpi=160)
+    with RunWriter(out_csv, attrs={'T': T, 'dt': dt, 'K': K}) as writer:
+        for c0 in range(0, N, chunk):
+            m = min(chunk, N - c0)
+            for j in range(m):
+                i = c0 + j
+                # parameter offsets that switch on / off at this step (ritual starts and ends)
+                if i in changes:
+                    pop.shift(*changes[i])
+                pop.step(dt, tl.Delta[i]*gain)
+                P1[j] = pop.psi1
+                P2[j] = pop.psi2
+            writer.write(_record(t[c0:c0 + m], P1[:m], P2[:m], tl.Delta[c0:c0 + m]))
+    rec = open_run(out_csv)
+
+    # plotting dashboard (reused Agg template; long runs are min/max-decimated)
+    render('complex', rec, out_png, dpi=160)
 
     return out_png, out_csv
 
 # ------------------------------
 # Live mode (matplotlib animation) — optional
 # ------------------------------
-
-def live_mode():
+class RingBuffer:
+    """
+    Preallocated buffer of the last `capacity` samples of `width` parallel
+    series. Every sample is written twice (at i and i + capacity), so view()
+    is always one contiguous slice, oldest -> newest, with no copying.
+    Unfilled slots hold NaN (matplotlib leaves them undrawn).
+    """
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self._buf = np.full((width, 2*capacity), np.nan)
+        self._i = 0
+
+    def extend(self, block: np.ndarray):
+        """Append a (width, m) block of samples."""
+        cap = self.capacity
+        block = block[:, -cap:]
+        idx = (self._i + np.arange(block.shape[1])) % cap
+        self._buf[:, idx] = block
+        self._buf[:, idx + cap] = block
+        self._i = (self._i + block.shape[1]) % cap
+
+    def view(self) -> np.ndarray:
+        return self._buf[:, self._i:self._i + self.capacity]
+
+
+class LiveView:
+    """
+    Scrolling dashboard over the last `window` seconds. The x axis is time
+    relative to now, so only line y-data changes per frame (blit-friendly);
+    Delta is scaled by its running maximum. Frame cost is fixed by the window,
+    not by how long the session has run.
+    """
+    SERIES = ('psi1_abs_self', 'psi1_abs_other', 'psi2_abs_self', 'psi2_abs_other',
+              'phi1_self', 'phi1_other', 'R_kuramoto', 'Delta', 'V_self', 'A_self')
+
+    def __init__(self, fig, axes, window: float, dt: float):
+        self.dt = dt
+        n = max(2, int(round(window/dt)))
+        self.buf = RingBuffer(n, len(self.SERIES))
+        self.x = (np.arange(n) - (n - 1))*dt
+        self.delta_max = 1.0      # running max (never below 1, as in the headless plot)
+
+        ax1, ax2, ax3, ax4 = axes
+        l11, = ax1.plot(self.x, self.x*np.nan, label='|psi1| self', color='#2ca02c')
+        l12, = ax1.plot(self.x, self.x*np.nan, label='|psi1| other', color='#98df8a')
+        l13, = ax1.plot(self.x, self.x*np.nan, label='|psi2| self', color='#1f77b4')
+        l14, = ax1.plot(self.x, self.x*np.nan, label='|psi2| other', color='#aec7e8')
+        ax1.set_ylim(0, 2.0); ax1.set_title('Amplitude')
+
+        l21, = ax2.plot(self.x, self.x*np.nan, label='phase psi1 self', color='#d62728')
+        l22, = ax2.plot(self.x, self.x*np.nan, label='phase psi1 other', color='#ff9896')
+        ax2.set_ylim(-np.pi, np.pi); ax2.set_title('Phase (psi1)')
+
+        l31, = ax3.plot(self.x, self.x*np.nan, label='Kuramoto R', color='#bcbd22')
+        l32, = ax3.plot(self.x, self.x*np.nan, label='Delta (scaled)', color='black')
+        ax3.set_ylim(0, 1.2); ax3.set_title('Synchrony & Stress')
+
+        l41, = ax4.plot(self.x, self.x*np.nan, label='Valence self', color='#17becf')
+        l42, = ax4.plot(self.x, self.x*np.nan, label='Arousal self (scaled)', color='#7f7f7f')
+        ax4.set_ylim(-1.1, 1.1); ax4.set_title('Valence & Arousal (self)')
+
+        for ax in axes:
+            ax.set_xlim(self.x[0], 0.0); ax.legend(fontsize=8, loc='upper left'); ax.grid(alpha=0.3)
+        for ax in (ax3, ax4):
+            ax.set_xlabel('t - now [s]')
+        self.lines = (l11, l12, l13, l14, l21, l22, l31, l32, l41, l42)
+        self.clock = ax1.text(0.98, 0.95, '', transform=ax1.transAxes, ha='right', va='top', fontsize=9)
+        self.artists = self.lines + (self.clock,)
+
+    def push(self, t: float, P1: np.ndarray, P2: np.ndarray, Delta: np.ndarray):
+        """Record m simulation steps: P1 / P2 are (m, 2) states (self, other), Delta is (m,)."""
+        phi1 = np.angle(P1)
+        block = np.stack([
+            np.abs(P1[:, 0]), np.abs(P1[:, 1]), np.abs(P2[:, 0]), np.abs(P2[:, 1]),
+            phi1[:, 0], phi1[:, 1],
+            np.abs(np.exp(1j*phi1).mean(axis=1)),
+            Delta,
+            np.tanh(1.0*P1[:, 0].real + 0.6*P2[:, 0].real - 0.8*P1[:, 0].imag),
+            np.abs(P2[:, 0])/max(1e-6, 2.0),
+        ])
+        self.buf.extend(block)
+        if len(Delta):
+            self.delta_max = max(self.delta_max, float(Delta.max()))
+        self.t = t
+
+    def draw(self):
+        """Refresh the artists from the buffers; returns them for blitting."""
+        view = self.buf.view()
+        for j, line in enumerate(self.lines):
+            y = view[j]/self.delta_max if self.SERIES[j] == 'Delta' else view[j]
+            line.set_ydata(y)
+        self.clock.set_text(f't = {self.t:6.2f} s')
+        return self.artists
+
+
+def live_mode(T=60.0, dt=0.02, K=0.15, schedule=None, window=20.0, steps_per_frame=5, interval=20, blit=True):
+    """
+    Live dashboard. Every frame (every `interval` ms) advances the simulation
+    `steps_per_frame` steps and redraws only the line data of a fixed-size
+    scrolling window, so frame time stays flat over a long session.
+    """
     import matplotlib.animation as animation
 
-    T, dt = 60.0, 0.02
     N = int(T/dt)
-    t = np.arange(N)*dt
-    me = ComplexAgent('self')
-    you = ComplexAgent('other', psi1=0.15+0.05j, psi2=0.15+0.0j, omega1=1.8, omega2=1.1)
-    schedule = [
-        {'t0':10,'t1':20,'type':'stress','amp':+1.0},
-        {'t0':20,'t1':28,'type':'ritual','name':'BREATH','who':'self'},
-        {'t0':35,'t1':45,'type':'stress','amp':+0.9},
-        {'t0':45,'t1':54,'type':'ritual','name':'LABEL','who':'self'},
-    ]
-
-    def Delta_at(ts):
-        d=0.0
-        for ev in schedule:
-            if ev['type']=='stress' and ev['t0']<=ts<ev['t1']:
-                d+=ev.get('amp',1.0)
-        return d
+    pop, gain = demo_pair(K)
+    # compiled once: per-step Delta and the ritual on/off change points
+    tl = compile_schedule(schedule or DEFAULT_SCHEDULE, N, dt)
+    changes = {k: ch for k, *ch in tl.changes()}
 
     fig, axes = plt.subplots(2,2, figsize=(12,8))
-    ax1, ax2, ax3, ax4 = axes[0,0], axes[0,1], axes[1,0], axes[1,1]
-
-    # Prepare lines
-    l11, = ax1.plot([], [], label='|psi1| self', color='#2ca02c')
-    l12, = ax1.plot([], [], label='|psi1| other', color='#98df8a')
-    l13, = ax1.plot([], [], label='|psi2| self', color='#1f77b4')
-    l14, = ax1.plot([], [], label='|psi2| other', color='#aec7e8')
-    ax1.set_xlim(0, T); ax1.set_ylim(0, 2.0); ax1.set_title('Amplitude'); ax1.legend(fontsize=8); ax1.grid(alpha=0.3)
-
-    l21, = ax2.plot([], [], label='phase psi1 self', color='#d62728')
-    l22, = ax2.plot([], [], label='phase psi1 other', color='#ff9896')
-    ax2.set_xlim(0, T); ax2.set_ylim(-np.pi, np.pi); ax2.set_title('Phase (psi1)'); ax2.legend(fontsize=8); ax2.grid(alpha=0.3)
-
-    l31, = ax3.plot([], [], label='Kuramoto R', color='#bcbd22')
-    l32, = ax3.plot([], [], label='Delta (scaled)', color='black')
-    ax3.set_xlim(0, T); ax3.set_ylim(0, 1.2); ax3.set_title('Synchrony & Stress'); ax3.legend(fontsize=8); ax3.grid(alpha=0.3)
-
-    l41, = ax4.plot([], [], label='Valence self', color='#17becf')
-    l42, = ax4.plot([], [], label='Arousal self (scaled)', color='#7f7f7f')
-    ax4.set_xlim(0, T); ax4.set_ylim(-1.1, 1.1); ax4.set_title('Valence & Arousal (self)'); ax4.legend(fontsize=8); ax4.grid(alpha=0.3)
+    view = LiveView(fig, axes.ravel(), window, dt)
+    P1 = np.empty((steps_per_frame, pop.n), dtype=np.complex128)
+    P2 = np.empty((steps_per_frame, pop.n), dtype=np.complex128)
 
-    # Buffers
-    y11=[]; y12=[]; y13=[]; y14=[]
-    y21=[]; y22=[]
-    y31=[]; y32=[]
-    y41=[]; y42=[]
-
-    # schedule rituals at t0
-    ev_seen=set()
+    def init():
+        return view.artists
 
     def animate(frame):
-        ts = frame*dt
-        for ev in schedule:
-            if ev['type']=='ritual' and ev['t0']<=ts<ev['t0']+dt and (id(ev) not in ev_seen):
-                who = me if ev.get('who','self')=='self' else you
-                who.ritual(ev['name'], t=ts, duration=(ev['t1']-ev['t0']))
-                ev_seen.add(id(ev))
-        D = Delta_at(ts)
-        me.step(dt, D, other=you, K=0.15)
-        you.step(dt, D*0.7, other=me, K=0.12)
-
-        # append buffers
-        y11.append(abs(me.psi1)); y12.append(abs(you.psi1)); y13.append(abs(me.psi2)); y14.append(abs(you.psi2))
-        y21.append(np.angle(me.psi1)); y22.append(np.angle(you.psi1))
-        Rkur = np.abs((np.exp(1j*y21[-1]) + np.exp(1j*y22[-1]))/2.0)
-        y31.append(Rkur); y32.append(D)
-        V = np.tanh(1.0*me.psi1.real + 0.6*me.psi2.real - 0.8*me.psi1.imag)
-        A = abs(me.psi2); y41.append(V); y42.append(A/max(1e-6, 2.0))
-
-        X = np.arange(len(y11))*dt
-        l11.set_data(X, y11); l12.set_data(X, y12); l13.set_data(X, y13); l14.set_data(X, y14)
-        l21.set_data(X, y21); l22.set_data(X, y22)
-        l31.set_data(X, y31); l32.set_data(X, np.array(y32)/max(1.0, np.max(y32)))
-        l41.set_data(X, y41); l42.set_data(X, np.array(y42))
-        return l11,l12,l13,l14,l21,l22,l31,l32,l41,l42
-
-    ani = animation.FuncAnimation(fig, animate, frames=N, interval=20, blit=False, repeat=False)
+        k0 = frame*steps_per_frame
+        m = min(steps_per_frame, N - k0)
+        for j in range(m):
+            k = k0 + j
+            if k in changes:
+                pop.shift(*changes[k])
+            pop.step(dt, tl.Delta[k]*gain)
+            P1[j] = pop.psi1
+            P2[j] = pop.psi2
+        view.push((k0 + m)*dt, P1[:m], P2[:m], tl.Delta[k0:k0 + m])
+        return view.draw()
+
+    frames = -(-N // steps_per_frame)
+    ani = animation.FuncAnimation(fig, animate, frames=frames, init_func=init, interval=interval,
+                                  blit=blit, repeat=False)
     fig.tight_layout()
     plt.show()
+    return ani
+
+# ------------------------------
+# Benchmark
+# ------------------------------
+
+def bench(n_agents=5000, steps=1000, dt=0.02, degree=10, seed=0):
+    """Agent-steps/sec of a ComplexPopulation with a random sparse coupling graph."""
+    import time
+    from scipy import sparse
+    rng = np.random.default_rng(seed)
+    K = sparse.random(n_agents, n_agents, density=min(1.0, degree/n_agents), random_state=seed, format='csr') * (0.15/degree)
+    K.setdiag(0.0); K.eliminate_zeros()
+    base = ComplexAgent().params
+    params = {k: v*(1.0 + 0.1*rng.standard_normal(n_agents)) for k, v in base.items()}
+    pop = ComplexPopulation(0.2 + 0.1j + 0.05*rng.standard_normal(n_agents), np.full(n_agents, 0.2+0.0j), params, K=K)
+    for i in rng.choice(n_agents, size=n_agents//10, replace=False):
+        pop.ritual('BREATH', int(i), duration=rng.uniform(1.0, 10.0))
+    t0 = time.perf_counter()
+    for k in range(steps):
+        pop.step(dt, 1.0 if 200 <= k < 600 else 0.0)
+    elapsed = time.perf_counter() - t0
+    print(f"{n_agents:,} agents x {steps:,} steps in {elapsed:.2f}s -> {n_agents*steps/elapsed:,.0f} agent-steps/s"
+          f" (Kuramoto R = {pop.kuramoto():.3f})")
 
 # ------------------------------
 # Main
@@ -328,9 +645,13 @@ def live_mode():
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('--live', action='store_true', help='Run interactive matplotlib animation window')
+    ap.add_argument('--bench', type=int, metavar='N', help='Benchmark a population of N coupled agents')
+    ap.add_argument('--steps-per-frame', type=int, default=5, help='Simulation steps per rendered frame (live mode)')
     args = ap.parse_args()
-    if args.live:
-        live_mode()
+    if args.bench:
+        bench(args.bench)
+    elif args.live:
+        live_mode(steps_per_frame=args.steps_per_frame)
     else:
         png, csv = simulate()
         print('Saved:', png, csv)
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Love-OS Dynamics DSL Parser
+Enables defining internal states via simple commands.
+
+Scripts compile once into an immutable, hashable `Plan`; results are cached
+per plan (in memory, optionally on disk), and batches of plans that differ
+only in tau / alpha / r_int run together as one vectorized sweep.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Iterable, Optional, Sequence, Union
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from loveos_dynamics import CoherenceAccumulator, ShameModel, stimulus_from_spec
+from loveos_sweep import sweep
+
+DEFAULTS = dict(
+    tau=0.3, alpha=0.2, r_int=0.05, T=6.0, dt=0.001, use_delay=True,
+    stim=('PULSE', (1.0, 0.2, 2.0))
+)
+
+# -----------------------------
+# Compile: script -> Plan
+# -----------------------------
+@dataclass(frozen=True)
+class Plan:
+    """Fully resolved simulation configuration of one DSL script."""
+    tau: float
+    alpha: float
+    r_int: float
+    T: float
+    dt: float
+    use_delay: bool
+    stim: Tuple[str, Tuple[float, ...]]
+
+    @property
+    def key(self) -> str:
+        """Stable content hash (used as the disk-cache file name)."""
+        return hashlib.sha256(repr(tuple(asdict(self).values())).encode()).hexdigest()[:32]
+
+    def model(self) -> ShameModel:
+        return ShameModel(tau=self.tau, alpha=self.alpha, r_int=self.r_int)
+
+    def stimulus(self):
+        return stimulus_from_spec(self.stim)
+
+
+def compile_script(lines: Iterable[str]) -> Plan:
+    """Parse a DSL script into a Plan. Identical scripts are parsed only once."""
+    return _compile(tuple(lines))
+
+@lru_cache(maxsize=1024)
+def _compile(lines: Tuple[str, ...]) -> Plan:
+    cfg = DEFAULTS.copy()
+
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        toks = line.split()
+        cmd = toks[0].upper()
+
+        # Command Parsing
+        if cmd == 'SC' and toks[1].upper() == 'ON':
+            # Enter Superconductivity State
+            cfg['tau'] = 0.0
+            cfg['alpha'] = 1e-6
+            cfg['r_int'] = 1e-6
+            cfg['use_delay'] = False
+        elif cmd == 'SC' and toks[1].upper() == 'OFF':
+            # Return to Normal State
+            cfg['tau'] = DEFAULTS['tau']
+            cfg['alpha'] = DEFAULTS['alpha']
+            cfg['r_int'] = DEFAULTS['r_int']
+            cfg['use_delay'] = True
+        elif cmd == 'TAU':
+            cfg['tau'] = float(toks[1])
+        elif cmd == 'ALPHA':
+            cfg['alpha'] = float(toks[1])
+        elif cmd == 'RINT':
+            cfg['r_int'] = float(toks[1])
+        elif cmd == 'T':
+            cfg['T'] = float(toks[1])
+        elif cmd == 'DT':
+            cfg['dt'] = float(toks[1])
+        elif cmd == 'DELAY':
+            cfg['use_delay'] = toks[1].lower() == 'on'
+
+        # Stimulus Configuration
+        elif cmd == 'PULSE':
+            cfg['stim'] = ('PULSE', tuple(map(float, toks[1:4])))
+        elif cmd == 'SINE':
+            cfg['stim'] = ('SINE', tuple(map(float, toks[1:3])))
+        elif cmd == 'IMPULSE':
+            cfg['stim'] = ('IMPULSE', tuple(map(float, toks[1:3])))
+        else:
+            raise ValueError(f"Unknown Command: {line}")
+
+    if cfg['stim'][0] not in ('PULSE', 'SINE', 'IMPULSE'):
+        raise ValueError(f"Unknown Stimulus: {cfg['stim'][0]}")
+    return Plan(**cfg)
+
+# -----------------------------
+# Result cache
+# -----------------------------
+class ResultCache:
+    """
+    LRU cache of plan results, optionally backed by a directory of .npz files
+    so replays survive restarts. Cached arrays are read-only. Thread-safe:
+    the in-memory LRU is guarded by a lock, disk files are replaced atomically.
+    """
+    def __init__(self, maxsize: int = 256, directory: Optional[str] = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._mem: "OrderedDict[Tuple[Plan, bool], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, plan: Plan, with_data: bool = True) -> Optional[Dict[str, Any]]:
+        # A full result also answers a summary request
+        with self._lock:
+            for k in ((plan, True),) if with_data else ((plan, False), (plan, True)):
+                res = self._mem.get(k)
+                if res is not None:
+                    self._mem.move_to_end(k)
+                    return res
+        if self.directory:
+            res = self._load(plan, with_data)
+            if res is not None:
+                self._remember((plan, 'data' in res), res)
+                return res
+        return None
+
+    def put(self, plan: Plan, result: Dict[str, Any]):
+        self._remember((plan, 'data' in result), result)
+        if self.directory:
+            self._save(plan, result)
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+
+    def _remember(self, k, result):
+        with self._lock:
+            self._mem[k] = result
+            self._mem.move_to_end(k)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    def _path(self, plan: Plan, with_data: bool) -> str:
+        return os.path.join(self.directory, f"{plan.key}{'' if with_data else '.summary'}.npz")
+
+    def _save(self, plan: Plan, result: Dict[str, Any]):
+        arrays = {'S': result['S'], 'coherence': result['coherence'], 'is_sc': result['is_sc']}
+        if 'data' in result:
+            arrays.update({f"data_{k}": v for k, v in result['data'].items()})
+        path = self._path(plan, 'data' in result)
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp.npz"   # unique per writer
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def _load(self, plan: Plan, with_data: bool) -> Optional[Dict[str, Any]]:
+        for full in (True,) if with_data else (False, True):
+            path = self._path(plan, full)
+            if os.path.exists(path):
+                with np.load(path) as z:
+                    res = {"S": float(z['S']), "coherence": float(z['coherence']), "is_sc": bool(z['is_sc'])}
+                    if full:
+                        res["data"] = {k[5:]: _frozen(z[k]) for k in z.files if k.startswith('data_')}
+                return res
+        return None
+
+
+def _frozen(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+def _copy_result(result: Dict[str, Any], as_arrays: bool = False) -> Dict[str, Any]:
+    """
+    Caller-owned copy of a cached result: trajectories as fresh lists, or with
+    as_arrays the shared read-only arrays in a new dict.
+    """
+    out = dict(result)
+    if 'data' in out:
+        out['data'] = {k: v if as_arrays else v.tolist() for k, v in out['data'].items()}
+    return out
+
+DEFAULT_CACHE = ResultCache()
+
+# -----------------------------
+# Execute
+# -----------------------------
+def run_plan(plan: Plan, cache: Optional[ResultCache] = DEFAULT_CACHE, with_data: bool = True,
+             as_arrays: bool = False) -> Dict[str, Any]:
+    """
+    Simulate one plan (or return the cached result). `data` holds plain lists;
+    as_arrays=True returns the cached read-only NumPy arrays instead (no copy).
+    """
+    if cache is not None:
+        hit = cache.get(plan, with_data)
+        if hit is not None:
+            return _copy_result(hit, as_arrays)
+
+    model = plan.model()
+    if with_data:
+        acc = CoherenceAccumulator()
+        T, I, A, s, S = model.simulate_array(T=plan.T, dt=plan.dt, stimulus=plan.stimulus(),
+                                             use_delay=plan.use_delay, accumulator=acc)
+        result = {
+            "S": S,
+            "coherence": float(acc.value()),
+            "is_sc": model.is_superconductive(),
+            "data": {"T": _frozen(T), "I": _frozen(I), "A": _frozen(A), "s": _frozen(s)}
+        }
+    else:
+        S, coh = model.simulate_array(T=plan.T, dt=plan.dt, stimulus=plan.stimulus(),
+                                      use_delay=plan.use_delay, store=False)
+        result = {"S": S, "coherence": float(coh), "is_sc": model.is_superconductive()}
+
+    if cache is not None:
+        cache.put(plan, result)
+    return _copy_result(result, as_arrays)
+
+
+def parse_and_run(lines: List[str], cache: Optional[ResultCache] = DEFAULT_CACHE,
+                  as_arrays: bool = False) -> Dict[str, Any]:
+    """
+    Compile and execute a script. Returns S, coherence, is_sc and the trajectory
+    data (T, I, A, s as lists; NumPy arrays with as_arrays=True).
+    """
+    return run_plan(compile_script(lines), cache=cache, as_arrays=as_arrays)
+
+
+def run_batch(items: Sequence[Union[Plan, Sequence[str]]], cache: Optional[ResultCache] = DEFAULT_CACHE,
+              processes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Execute many plans (or scripts). Plans sharing T / dt / stimulus / delay mode
+    are integrated together as one vectorized sweep over their tau / alpha / r_int.
+    Returns summary results (S, coherence, is_sc) in input order.
+    """
+    plans = [it if isinstance(it, Plan) else compile_script(it) for it in items]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(plans)
+
+    groups: Dict[Tuple, List[int]] = {}
+    for idx, plan in enumerate(plans):
+        hit = cache.get(plan, with_data=False) if cache is not None else None
+        if hit is not None:
+            results[idx] = {k: hit[k] for k in ("S", "coherence", "is_sc")}
+        else:
+            groups.setdefault((plan.T, plan.dt, plan.stim, plan.use_delay), []).append(idx)
+
+    for (T, dt, stim, use_delay), idxs in groups.items():
+        uniq = list(dict.fromkeys(plans[i] for i in idxs))
+        res = sweep([p.tau for p in uniq], [p.alpha for p in uniq], [p.r_int for p in uniq],
+                    T=T, dt=dt, stimulus=stim, use_delay=use_delay, grid=False, processes=processes)
+        by_plan = {}
+        for p, S, coh in zip(uniq, res.S.tolist(), res.coherence.tolist()):
+            by_plan[p] = {"S": S, "coherence": coh, "is_sc": p.model().is_superconductive()}
+            if cache is not None:
+                cache.put(p, by_plan[p])
+        for i in idxs:
+            results[i] = dict(by_plan[plans[i]])
+
+    return results
@@ -1,4 +1,3 @@
-```python
 # -*- coding: utf-8 -*-
 """
 Love-OS Dynamics Engine
@@ -8,36 +7,265 @@ This module simulates the dynamic relationship between:
 - I(t): Impulse (Internal Signal)
 - A(t): Action (External Output)
 - S:    Shame (Hysteresis Loss)
+
+Usage:
+  python loveos_dynamics.py     # quick test, streaming report, simulate vs simulate_array timing
 """
 
 from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Tuple, List, Optional
+from typing import Callable, Iterator, Tuple, List, Optional, Union
 import math
 
+import numpy as np
+
 Array = List[float]
 
 # -----------------------------
 # Stimulus Functions (F(t))
 # -----------------------------
-def pulse_train(amp: float = 1.0, width: float = 0.2, period: float = 2.0) -> Callable[[float], float]:
+# Every stimulus is callable on a float and on a NumPy time array. The model
+# paths (simulate, simulate_array, stream, sweep) all sample the time grid,
+# passing its step dt (needed by Impulse on grids of a single point).
+# Stimuli compose with + and *, e.g. 0.5 * sine_stim() + pulse_train().
+
+class Stimulus:
+    """Base class: implement `at` (scalar) and `sample` (array, with the grid step dt if known)."""
+
+    def __call__(self, t):
+        if isinstance(t, np.ndarray):
+            return self.sample(t)
+        return self.at(t)
+
+    def at(self, t: float) -> float:
+        return float(self.sample(np.array([t], dtype=float))[0])
+
+    def sample(self, t: np.ndarray, dt: Optional[float] = None) -> np.ndarray:
+        raise NotImplementedError
+
+    def __add__(self, other):
+        return Sum(self, as_stimulus(other))
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        return Product(self, as_stimulus(other))
+    __rmul__ = __mul__
+
+
+class Constant(Stimulus):
+    def __init__(self, value: float):
+        self.value = float(value)
+    def at(self, t):
+        return self.value
+    def sample(self, t, dt=None):
+        return np.full(t.shape, self.value)
+
+
+class Pulse(Stimulus):
+    """Square wave pulse train."""
+    def __init__(self, amp: float = 1.0, width: float = 0.2, period: float = 2.0):
+        self.amp, self.width, self.period = amp, width, period
+    def at(self, t):
+        return self.amp if (t % self.period) < self.width else 0.0
+    def sample(self, t, dt=None):
+        return np.where((t % self.period) < self.width, self.amp, 0.0)
+
+
+class Sine(Stimulus):
+    """Sinusoidal stimulus."""
+    def __init__(self, amp: float = 1.0, freq: float = 0.5):
+        self.amp, self.freq = amp, freq
+    def at(self, t):
+        return self.amp * math.sin(2 * math.pi * self.freq * t)
+    def sample(self, t, dt=None):
+        return self.amp * np.sin(2 * math.pi * self.freq * t)
+
+
+class Impulse(Stimulus):
+    """
+    Single impulse (Dirac delta approximation).
+    On a time grid of step dt it fires on exactly one sample: the point k with
+    t_k - dt/2 <= at < t_k + dt/2. Off-grid scalar calls use |t - at| < eps.
+    """
+    def __init__(self, at: float = 1.0, amp: float = 1.0, eps: float = 1e-3):
+        self.t0, self.amp, self.eps = at, amp, eps
+    def at(self, t):
+        return self.amp if abs(t - self.t0) < self.eps else 0.0
+    def sample(self, t, dt=None):
+        out = np.zeros(t.shape)
+        if dt is None:
+            if len(t) < 2:
+                raise ValueError("Impulse.sample needs dt on a grid of fewer than 2 points")
+            dt = t[1] - t[0]
+        half = 0.5 * dt
+        out[(t - half <= self.t0) & (self.t0 < t + half)] = self.amp
+        return out
+
+
+class Sum(Stimulus):
+    def __init__(self, *terms: Stimulus):
+        self.terms = terms
+    def at(self, t):
+        return sum(term.at(t) for term in self.terms)
+    def sample(self, t, dt=None):
+        out = np.zeros(t.shape)
+        for term in self.terms:
+            out += term.sample(t, dt)
+        return out
+
+
+class Product(Stimulus):
+    def __init__(self, *factors: Stimulus):
+        self.factors = factors
+    def at(self, t):
+        out = 1.0
+        for f in self.factors:
+            out *= f.at(t)
+        return out
+    def sample(self, t, dt=None):
+        out = np.ones(t.shape)
+        for f in self.factors:
+            out *= f.sample(t, dt)
+        return out
+
+
+class Piecewise(Stimulus):
+    """
+    Schedule of stimuli: segments [(t0, t1, stim), ...] active on t0 <= t < t1.
+    Overlapping segments add up; `default` drives everything else.
+    """
+    def __init__(self, segments, default: Optional[Stimulus] = None):
+        self.segments = [(float(t0), float(t1), as_stimulus(st)) for t0, t1, st in segments]
+        self.default = as_stimulus(default) if default is not None else Constant(0.0)
+    def at(self, t):
+        active = [st.at(t) for t0, t1, st in self.segments if t0 <= t < t1]
+        return sum(active) if active else self.default.at(t)
+    def sample(self, t, dt=None):
+        out = np.zeros(t.shape)
+        covered = np.zeros(t.shape, dtype=bool)
+        for t0, t1, st in self.segments:
+            m = (t0 <= t) & (t < t1)
+            if m.any():
+                out[m] += st.sample(t[m], dt)
+                covered |= m
+        if not covered.all():
+            out[~covered] = self.default.sample(t[~covered], dt)
+        return out
+
+
+class Sampled(Stimulus):
+    """
+    Waveform given at arbitrary points (times, values).
+    mode='linear' interpolates, mode='hold' is zero-order hold; outside the
+    samples the first/last value is held (or the series repeats if `loop`).
+    """
+    def __init__(self, times, values, mode: str = 'linear', loop: bool = False):
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        if self.times.shape != self.values.shape or self.times.ndim != 1:
+            raise ValueError("times and values must be 1-D arrays of equal length")
+        if mode not in ('linear', 'hold'):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode, self.loop = mode, loop
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "Sampled":
+        """Load a recorded waveform: .npy with shape (N, 2) or a two-column CSV (t, value)."""
+        if path.endswith('.npy'):
+            data = np.load(path)
+        else:
+            data = np.loadtxt(path, delimiter=',', ndmin=2, comments='#')
+            if not np.isfinite(data[0]).all():
+                data = data[1:]
+        return cls(data[:, 0], data[:, 1], **kwargs)
+
+    def _wrap(self, t):
+        if not self.loop:
+            return t
+        t0, span = self.times[0], self.times[-1] - self.times[0]
+        return t0 + (t - t0) % span if span > 0 else t
+
+    def at(self, t):
+        return float(self.sample(np.array([t], dtype=float))[0])
+
+    def sample(self, t, dt=None):
+        t = self._wrap(t)
+        if self.mode == 'linear':
+            return np.interp(t, self.times, self.values)
+        idx = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times) - 1)
+        return self.values[idx]
+
+
+class Recorded(Sampled):
+    """Uniformly sampled recording (e.g. a sensor trace) at `rate` Hz starting at t0."""
+    def __init__(self, values, rate: float, t0: float = 0.0, mode: str = 'linear', loop: bool = False):
+        values = np.asarray(values, dtype=float)
+        super().__init__(t0 + np.arange(len(values)) / rate, values, mode=mode, loop=loop)
+
+
+class FunctionStimulus(Stimulus):
+    """Adapter for plain scalar closures F(t) -> float."""
+    def __init__(self, fn: Callable[[float], float]):
+        self.fn = fn
+    def at(self, t):
+        return self.fn(t)
+    def sample(self, t, dt=None):
+        # Array-aware callables get one call; scalar-only ones are evaluated per point
+        try:
+            F = np.asarray(self.fn(t), dtype=float)
+            if F.shape == t.shape:
+                return F
+        except (TypeError, ValueError):
+            pass
+        return np.fromiter((self.fn(x) for x in t.tolist()), dtype=float, count=len(t))
+
+
+def pulse_train(amp: float = 1.0, width: float = 0.2, period: float = 2.0) -> Pulse:
     """Square wave pulse train."""
-    def F(t: float) -> float:
-        tt = (t % period)
-        return amp if tt < width else 0.0
-    return F
+    return Pulse(amp, width, period)
 
-def sine_stim(amp: float = 1.0, freq: float = 0.5) -> Callable[[float], float]:
+def sine_stim(amp: float = 1.0, freq: float = 0.5) -> Sine:
     """Sinusoidal stimulus."""
-    def F(t: float) -> float:
-        return amp * math.sin(2 * math.pi * freq * t)
-    return F
+    return Sine(amp, freq)
 
-def impulse(at: float = 1.0, amp: float = 1.0, eps: float = 1e-3) -> Callable[[float], float]:
+def impulse(at: float = 1.0, amp: float = 1.0, eps: float = 1e-3) -> Impulse:
     """Single impulse (Dirac delta approximation)."""
-    def F(t: float) -> float:
-        return amp if abs(t - at) < eps else 0.0
-    return F
+    return Impulse(at, amp, eps)
+
+STIMULI = {'PULSE': pulse_train, 'SINE': sine_stim, 'IMPULSE': impulse}
+
+def stimulus_from_spec(spec) -> Stimulus:
+    """Build a stimulus from a DSL-style spec such as ('PULSE', (1.0, 0.2, 2.0))."""
+    kind, params = spec
+    try:
+        return STIMULI[kind.upper()](*params)
+    except KeyError:
+        raise ValueError(f"Unknown Stimulus: {kind}") from None
+
+def as_stimulus(obj) -> Stimulus:
+    """Coerce a Stimulus, number, DSL spec tuple or scalar closure into a Stimulus."""
+    if isinstance(obj, Stimulus):
+        return obj
+    if isinstance(obj, (int, float)):
+        return Constant(obj)
+    if isinstance(obj, tuple):
+        return stimulus_from_spec(obj)
+    if callable(obj):
+        return FunctionStimulus(obj)
+    raise TypeError(f"Not a stimulus: {obj!r}")
+
+def sample_stimulus(stimulus, t: np.ndarray, dt: Optional[float] = None) -> np.ndarray:
+    """Evaluate any stimulus (see as_stimulus) over a whole time grid of step dt in one call."""
+    return np.asarray(as_stimulus(stimulus).sample(t, dt), dtype=float)
+
+def time_grid(T: float, dt: float) -> np.ndarray:
+    """The simulate() time axis: n+1 points accumulated as t += dt (bit-identical to the list path)."""
+    n = int(T / dt)
+    t = np.zeros(n + 1)
+    np.cumsum(np.full(n, dt), out=t[1:])
+    return t
+
+_BLOCK = 4096   # samples per block for streaming runs
 
 # -----------------------------
 # The Shame Model
@@ -66,16 +294,21 @@ class ShameModel:
         T: float = 10.0,
         dt: float = 0.001,
         stimulus: Optional[Callable[[float], float]] = None,
-        use_delay: bool = True
+        use_delay: bool = True,
+        accumulator: Optional["CoherenceAccumulator"] = None
     ) -> Tuple[Array, Array, Array, Array, float]:
         """
         Run the simulation.
         Returns: time, I, A, s(instant), S(total)
+        accumulator: CoherenceAccumulator (or WindowedCoherence) fed with (I, A)
+                     every _BLOCK steps while the run progresses
         """
         if stimulus is None:
             stimulus = pulse_train()
 
         n = int(T / dt)
+        # Stimulus sampled on the time grid, as in simulate_array (an impulse hits exactly one step)
+        F_grid = sample_stimulus(stimulus, time_grid(T, dt), dt).tolist()
         time: Array = [0.0] * (n + 1)
         I: Array = [0.0] * (n + 1)
         A: Array = [0.0] * (n + 1)
@@ -87,18 +320,22 @@ class ShameModel:
 
         # Initial Conditions
         t, i, a, S_acc = 0.0, 0.0, 0.0, 0.0
+        fed, feed_at = 0, (_BLOCK - 1 if accumulator is not None else -1)
 
         for k in range(n + 1):
             time[k] = t
             I[k] = i
             A[k] = a
+            if k == feed_at:
+                accumulator.update_many(np.array(I[fed:k + 1]), np.array(A[fed:k + 1]))
+                fed, feed_at = k + 1, feed_at + _BLOCK
             
             # Calculate Instantaneous Shame (Physics: Deviation)
             s[k] = abs(i - a)
             S_acc += s[k] * dt
 
             # Apply Stimulus
-            F = stimulus(t)
+            F = F_grid[k]
 
             # --- Impulse Dynamics (Inner World) ---
             # dI/dt = Input - Damping - Internal_Conflict
@@ -127,8 +364,141 @@ class ShameModel:
             i, a = i_next, a_next
             t += dt
 
+        if accumulator is not None and fed <= n:
+            accumulator.update_many(np.array(I[fed:]), np.array(A[fed:]))
         return time, I, A, s, S_acc
 
+    def simulate_array(
+        self,
+        T: float = 10.0,
+        dt: float = 0.001,
+        stimulus: Optional[Callable[[float], float]] = None,
+        use_delay: bool = True,
+        store: bool = True,
+        accumulator: Optional["CoherenceAccumulator"] = None
+    ) -> Union[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float], Tuple[float, float]]:
+        """
+        Array-backed simulate(): same dynamics (bit for bit), NumPy in and out.
+        The stimulus is sampled over the whole grid up front, the tau-delay
+        line is read as a shifted slice of the I history instead of a deque,
+        and s / S are computed per block with array operations.
+
+        store=True  -> (time, I, A, s, S) as NumPy arrays + total shame;
+                       `accumulator` is fed block by block as in simulate()
+        store=False -> (S, coherence) only; the run streams through a
+                       CoherenceAccumulator in fixed-size blocks
+        """
+        if stimulus is None:
+            stimulus = pulse_train()
+
+        time = time_grid(T, dt)
+        F = sample_stimulus(stimulus, time, dt)
+        st = _ShameState(self, dt, use_delay)
+
+        if store:
+            n1 = len(time)
+            I = np.empty(n1); A = np.empty(n1); s = np.empty(n1)
+            for b0 in range(0, n1, _BLOCK):
+                b1 = b0 + _BLOCK
+                nb = self._advance(st, F[b0:b1].tolist(), I[b0:b1], A[b0:b1], s[b0:b1])
+                if accumulator is not None:
+                    accumulator.update_many(I[b0:b0 + nb], A[b0:b0 + nb])
+            return time, I, A, s, st.S
+
+        acc = CoherenceAccumulator()
+        bI = np.empty(_BLOCK); bA = np.empty(_BLOCK); bs = np.empty(_BLOCK)
+        for b0 in range(0, len(F), _BLOCK):
+            nb = self._advance(st, F[b0:b0 + _BLOCK].tolist(), bI, bA, bs)
+            acc.update_many(bI[:nb], bA[:nb])
+        return st.S, acc.value()
+
+    def stream(
+        self,
+        dt: float = 0.001,
+        stimulus: Optional[Callable[[float], float]] = None,
+        use_delay: bool = True,
+        T: Optional[float] = None,
+        window: Optional[float] = None,
+        every: int = _BLOCK
+    ) -> Iterator["StreamReport"]:
+        """
+        Run for T seconds (or forever if T is None) in O(1) memory.
+        Yields a StreamReport every `every` steps with total S and coherence
+        so far, plus S / coherence over the last `window` seconds if given.
+        """
+        if stimulus is None:
+            stimulus = pulse_train()
+        n_total = None if T is None else int(T / dt) + 1
+
+        st = _ShameState(self, dt, use_delay)
+        acc = CoherenceAccumulator()
+        win = WindowedCoherence(window, dt) if window else None
+        bI = np.empty(every); bA = np.empty(every); bs = np.empty(every)
+        steps = np.full(every, dt)
+        t_next = 0.0
+        done = 0
+        while n_total is None or done < n_total:
+            nb = every if n_total is None else min(every, n_total - done)
+            # Block time grid, accumulated as t += dt like simulate()
+            steps[0] = t_next
+            t = np.cumsum(steps[:nb])
+            steps[0] = dt
+            t_next = float(t[-1]) + dt
+            self._advance(st, sample_stimulus(stimulus, t, dt).tolist(), bI, bA, bs)
+            acc.update_many(bI[:nb], bA[:nb])
+            if win is not None:
+                win.update_many(bI[:nb], bA[:nb])
+            done += nb
+            yield StreamReport(
+                t=float(t[-1]), S=st.S, coherence=acc.value(),
+                S_window=win.S() if win else None,
+                coherence_window=win.value() if win else None)
+
+    def _advance(self, st: "_ShameState", F: Array, I: np.ndarray, A: np.ndarray, s: np.ndarray) -> int:
+        """
+        Integrate len(F) steps from state `st`, writing I/A/s into the given arrays.
+        Only the I/A recurrence runs per step, on Python floats; s and S follow
+        from the block with array operations.
+        """
+        dt, alpha, r_int, tau_eff = st.dt, self.alpha, self.r_int, st.tau_eff
+        i, a = st.i, st.a
+        n = len(F)
+        # hist[j] = I from delay_steps - 1 steps before step j, i.e. what the
+        # deque in simulate() returns: the tail of the previous block, then this block
+        hist = st.tail
+        A_blk = []
+        push_i, push_a = hist.append, A_blk.append
+
+        if st.delayed:
+            for j, Fk in enumerate(F):
+                push_i(i); push_a(a)
+                d = i - a
+                # --- Impulse Dynamics: r_int * sign * |d| == r_int * d outside the 1e-12 dead band
+                c = r_int * d if (d >= 1e-12 or d <= -1e-12) else 0.0
+                i_next = i + dt * (Fk - alpha * i - c)
+                # --- Action Dynamics: tracks I(t - tau)
+                a = a + dt * ((hist[j] - a) / tau_eff)
+                i = i_next
+        else:
+            for Fk in F:
+                push_i(i); push_a(a)
+                d = i - a
+                c = r_int * d if (d >= 1e-12 or d <= -1e-12) else 0.0
+                i, a = i + dt * (Fk - alpha * i - c), a + dt * (d / tau_eff)
+
+        lag = len(hist) - n
+        I[:n] = hist[lag:]
+        A[:n] = A_blk
+        st.tail = hist[n:]
+        np.abs(np.subtract(I[:n], A[:n], out=s[:n]), out=s[:n])
+        # S += s * dt step by step: accumulate is sequential, so S matches simulate() exactly
+        acc = np.empty(n + 1)
+        acc[0] = st.S
+        np.multiply(s[:n], dt, out=acc[1:])
+        st.S = float(np.add.accumulate(acc)[-1])
+        st.i, st.a, st.k = i, a, st.k + n
+        return n
+
     @staticmethod
     def coherence(I: Array, A: Array) -> float:
         """
@@ -144,90 +514,138 @@ class ShameModel:
         denA = math.sqrt(sum((a - meanA) ** 2 for a in A)) + 1e-12
         return num / (denI * denA)
 
+class _ShameState:
+    """Integrator state carried between blocks (the delay line is the last delay_steps - 1 values of I)."""
+    def __init__(self, model: "ShameModel", dt: float, use_delay: bool):
+        self.dt = dt
+        self.delayed = use_delay and model.tau > 0.0
+        self.delay_steps = max(1, int(model.tau / dt)) if use_delay else 1
+        self.tau_eff = model.tau if self.delayed else (max(model.tau, dt) if model.tau > 0.0 else dt)
+        self.tail = [0.0] * (self.delay_steps - 1) if self.delayed else []
+        self.i, self.a, self.S, self.k = 0.0, 0.0, 0.0, 0
+
+
+@dataclass
+class StreamReport:
+    """Progress report from ShameModel.stream()."""
+    t: float
+    S: float
+    coherence: float
+    S_window: Optional[float] = None
+    coherence_window: Optional[float] = None
+
+
+class CoherenceAccumulator:
+    """
+    Streaming Pearson coherence of (I, A) using Welford running moments.
+    Matches ShameModel.coherence() without storing the series; simulate()
+    and simulate_array() update one as they go (accumulator=...).
+    `update` also works element-wise on NumPy arrays (one column per run).
+    """
+    def __init__(self, shape=()):
+        z = (lambda: np.zeros(shape)) if shape else (lambda: 0.0)
+        self.n = 0
+        self.mI, self.mA = z(), z()
+        self.cII, self.cAA, self.cIA = z(), z(), z()
+
+    def update(self, i, a):
+        """Add one sample (or one sample per column)."""
+        self.n += 1
+        dI = i - self.mI; self.mI += dI / self.n
+        dA = a - self.mA; self.mA += dA / self.n
+        self.cII += dI * (i - self.mI)
+        self.cAA += dA * (a - self.mA)
+        self.cIA += dI * (a - self.mA)
+
+    def update_many(self, I: np.ndarray, A: np.ndarray):
+        """Merge a block of samples (along axis 0) using the pairwise (Chan) update."""
+        nb = len(I)
+        if nb == 0:
+            return
+        mI_b, mA_b = I.mean(axis=0), A.mean(axis=0)
+        dI, dA = I - mI_b, A - mA_b
+        cII_b, cAA_b, cIA_b = (dI * dI).sum(axis=0), (dA * dA).sum(axis=0), (dI * dA).sum(axis=0)
+        n = self.n + nb
+        f = self.n * nb / n
+        eI, eA = mI_b - self.mI, mA_b - self.mA
+        self.cII = self.cII + cII_b + eI * eI * f
+        self.cAA = self.cAA + cAA_b + eA * eA * f
+        self.cIA = self.cIA + cIA_b + eI * eA * f
+        self.mI = self.mI + eI * nb / n
+        self.mA = self.mA + eA * nb / n
+        self.n = n
+
+    def value(self):
+        """Current coherence (-1.0 to 1.0); 0.0 before any sample."""
+        if self.n == 0:
+            return 0.0
+        return self.cIA / ((np.sqrt(self.cII) + 1e-12) * (np.sqrt(self.cAA) + 1e-12))
+
+
+class WindowedCoherence:
+    """
+    Coherence and shame over the last `window` seconds of a stream.
+    Only the window itself is kept (two ring buffers of window/dt samples);
+    statistics are computed from the ring on demand.
+    """
+    def __init__(self, window: float, dt: float):
+        self.dt = dt
+        self.size = max(2, int(round(window / dt)))
+        self.I = np.zeros(self.size)
+        self.A = np.zeros(self.size)
+        self.head = 0      # next write position
+        self.count = 0     # valid samples (<= size)
+
+    def update(self, i: float, a: float):
+        self.I[self.head] = i
+        self.A[self.head] = a
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def update_many(self, I: np.ndarray, A: np.ndarray):
+        """Push a block of samples; only the newest `size` can survive."""
+        I, A = I[-self.size:], A[-self.size:]
+        nb = len(I)
+        idx = (self.head + np.arange(nb)) % self.size
+        self.I[idx] = I
+        self.A[idx] = A
+        self.head = (self.head + nb) % self.size
+        self.count = min(self.count + nb, self.size)
+
+    def _view(self):
+        if self.count < self.size:
+            return self.I[:self.count], self.A[:self.count]
+        return self.I, self.A
+
+    def value(self) -> float:
+        I, A = self._view()
+        if len(I) == 0:
+            return 0.0
+        dI, dA = I - I.mean(), A - A.mean()
+        num = float(np.dot(dI, dA))
+        return num / ((math.sqrt(float(np.dot(dI, dI))) + 1e-12) * (math.sqrt(float(np.dot(dA, dA))) + 1e-12))
+
+    def S(self) -> float:
+        """Shame accumulated inside the window."""
+        I, A = self._view()
+        return float(np.abs(I - A).sum() * self.dt)
+
+
 if __name__ == "__main__":
     # Quick Test
     model = ShameModel(tau=0.4, alpha=0.25, r_int=0.05)
-    T, I, A, s, S = model.simulate(T=6.0, dt=0.001, stimulus=pulse_train())
-    print(f"Total Shame (S) = {S:.6f}, Coherence = {model.coherence(I, A):.3f}")
-ファイル名: loveos_dsl.py (Layer 2: DSL Parser)
-
-Python
-# -*- coding: utf-8 -*-
-"""
-Love-OS Dynamics DSL Parser
-Enables defining internal states via simple commands.
-"""
+    acc = CoherenceAccumulator()
+    T, I, A, s, S = model.simulate(T=6.0, dt=0.001, stimulus=pulse_train(), accumulator=acc)
+    print(f"Total Shame (S) = {S:.6f}, Coherence = {acc.value():.3f} (two-pass: {model.coherence(I, A):.3f})")
+    S_arr, coh_arr = model.simulate_array(T=6.0, dt=0.001, stimulus=pulse_train(), store=False)
+    print(f"[array, summary] S = {S_arr:.6f}, Coherence = {coh_arr:.3f}")
+    for rep in model.stream(T=60.0, window=5.0, every=10_000):
+        print(f"[stream] t={rep.t:5.1f}s S={rep.S:.4f} coh={rep.coherence:.3f} | last 5s: S={rep.S_window:.4f} coh={rep.coherence_window:.3f}")
 
-from typing import List, Tuple, Dict, Any
-import re
-from loveos_dynamics import ShameModel, pulse_train, sine_stim, impulse
-
-DEFAULTS = dict(
-    tau=0.3, alpha=0.2, r_int=0.05, T=6.0, dt=0.001, use_delay=True,
-    stim=('PULSE', (1.0, 0.2, 2.0))
-)
-
-def parse_and_run(lines: List[str]) -> Dict[str, Any]:
-    cfg = DEFAULTS.copy()
-    
-    for raw in lines:
-        line = raw.strip()
-        if not line or line.startswith('#'):
-            continue
-
-        toks = re.split(r'\s+', line)
-        cmd = toks[0].upper()
-
-        # Command Parsing
-        if cmd == 'SC' and toks[1].upper() == 'ON':
-            # Enter Superconductivity State
-            cfg['tau'] = 0.0
-            cfg['alpha'] = 1e-6
-            cfg['r_int'] = 1e-6
-            cfg['use_delay'] = False
-        elif cmd == 'SC' and toks[1].upper() == 'OFF':
-            # Return to Normal State
-            cfg['tau'] = DEFAULTS['tau']
-            cfg['alpha'] = DEFAULTS['alpha']
-            cfg['r_int'] = DEFAULTS['r_int']
-            cfg['use_delay'] = True
-        elif cmd == 'TAU':
-            cfg['tau'] = float(toks[1])
-        elif cmd == 'ALPHA':
-            cfg['alpha'] = float(toks[1])
-        elif cmd == 'RINT':
-            cfg['r_int'] = float(toks[1])
-        elif cmd == 'T':
-            cfg['T'] = float(toks[1])
-        elif cmd == 'DT':
-            cfg['dt'] = float(toks[1])
-        elif cmd == 'DELAY':
-            cfg['use_delay'] = toks[1].lower() == 'on'
-        
-        # Stimulus Configuration
-        elif cmd == 'PULSE':
-            cfg['stim'] = ('PULSE', tuple(map(float, toks[1:4])))
-        elif cmd == 'SINE':
-            cfg['stim'] = ('SINE', tuple(map(float, toks[1:3])))
-        elif cmd == 'IMPULSE':
-            cfg['stim'] = ('IMPULSE', tuple(map(float, toks[1:3])))
-        else:
-            raise ValueError(f"Unknown Command: {line}")
-
-    # Build Stimulus
-    stim_kind, params = cfg['stim']
-    if stim_kind == 'PULSE':   stim = pulse_train(*params)
-    elif stim_kind == 'SINE':  stim = sine_stim(*params)
-    elif stim_kind == 'IMPULSE': stim = impulse(*params)
-    else: raise ValueError(f"Unknown Stimulus: {stim_kind}")
-
-    # Execute Simulation
-    model = ShameModel(tau=cfg['tau'], alpha=cfg['alpha'], r_int=cfg['r_int'])
-    T, I, A, s, S = model.simulate(T=cfg['T'], dt=cfg['dt'], stimulus=stim, use_delay=cfg['use_delay'])
-    
-    return {
-        "S": S,
-        "coherence": ShameModel.coherence(I, A),
-        "is_sc": model.is_superconductive(),
-        "data": {"T": T, "I": I, "A": A, "s": s}
-    }
+    # Benchmark: list-based simulate vs the array path (best of 5, identical results)
+    import timeit
+    for T_run in (10.0, 60.0):
+        t_list = min(timeit.repeat(lambda: model.simulate(T=T_run, dt=0.001), number=1, repeat=5))
+        t_arr = min(timeit.repeat(lambda: model.simulate_array(T=T_run, dt=0.001), number=1, repeat=5))
+        print(f"[bench] T={T_run:4.0f}s dt=0.001: simulate {t_list*1e3:6.2f} ms | simulate_array {t_arr*1e3:6.2f} ms "
+              f"({t_list / t_arr:.1f}x)")
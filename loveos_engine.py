@@ -0,0 +1,112 @@
+"""
+Love-OS RLEC Engine
+-------------------
+The single R/L/E/C kernel shared by every front-end:
+
+  - core.LoveOS_Physics          (NumPy state, clip ±2)
+  - loveos_llm_bridge.LoveOSState (scalar state, clip -2..3)
+  - loveos_schools.RLEC           (dataclass state, clip -2..3)
+
+Each front-end owns an `RLECEngine` configured with its clip bounds and
+ritual dictionary, and delegates all stepping / observation to it.
+Rituals use the unified Right-Brain DSL format:
+
+    {'BREATH': {'uL': 0.0, 'uC': +0.2, 'uE': -0.3, 'd_scale': 0.6}, ...}
+
+Usage:
+  python -m pytest tests/test_engine_parity.py   # adapters vs the original update loops
+"""
+
+import math
+
+import numpy as np
+
+from loveos_integrators import PARAM_KEYS, euler_batch, get_integrator, param_tuple
+
+NO_RITUAL = {'uL': 0.0, 'uC': 0.0, 'uE': 0.0, 'd_scale': 1.0}
+
+
+class RLECEngine:
+    """
+    Stateless R/L/E/C stepper. State lives in the caller; the engine only
+    knows the clip bounds and how ritual names map to inputs.
+    """
+    def __init__(self, lo: float, hi: float, rituals: dict):
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.rituals = dict(rituals)
+        # Ritual code 0 is always "no ritual"; the rest follow dict order
+        self.names = (None,) + tuple(self.rituals)
+        self.codes = {name: i for i, name in enumerate(self.names)}
+        self.table = np.array([[NO_RITUAL['uL'], NO_RITUAL['uC'], NO_RITUAL['uE'], NO_RITUAL['d_scale']]] +
+                              [[r['uL'], r['uC'], r['uE'], r['d_scale']] for r in self.rituals.values()],
+                              dtype=float)
+
+    def ritual(self, name) -> dict:
+        """Ritual inputs for `name`; None / unknown names act as no ritual."""
+        return self.rituals.get(name, NO_RITUAL)
+
+    def ritual_codes(self, names, n: int) -> np.ndarray:
+        """Map ritual names (or integer codes) to an (n,) array of ritual codes."""
+        if names is None:
+            return np.zeros(n, dtype=np.intp)
+        arr = np.asarray(names)
+        if arr.dtype.kind in 'iu':
+            return np.broadcast_to(arr, (n,)).astype(np.intp)
+        return np.array([self.codes.get(r, 0) for r in names], dtype=np.intp)
+
+    # ------------------------------
+    # Scalar path
+    # ------------------------------
+    def turn(self, z, params, delta, ritual=None, dt=0.5, steps=5, integrator='fused', u=None):
+        """
+        Advance one state (R, L, E, C) by one conversation turn.
+        `ritual` names an entry of the ritual table (scales Δ and sets u);
+        alternatively pass raw inputs `u=(uL, uC, uE)` with an already-scaled Δ.
+        """
+        if u is None:
+            eff = self.ritual(ritual)
+            delta = delta * eff['d_scale']
+            u = (eff['uL'], eff['uC'], eff['uE'])
+        step_fn = get_integrator(integrator)
+        return step_fn(tuple(z), param_tuple(params), delta, u, dt, steps, self.lo, self.hi)
+
+    @staticmethod
+    def observe(R, L, E, C):
+        """Map state to (Valence, Arousal)."""
+        val = math.tanh(1.0*(-R) + 0.8*L - 1.0*E + 0.7*C)
+        aro = math.log1p(math.exp(0.5*abs(R) + 0.5*E))
+        return val, aro
+
+    # ------------------------------
+    # Batch path
+    # ------------------------------
+    def turn_batch(self, Z, K, deltas, codes=None, dt=0.5, steps=5):
+        """
+        Advance N states in place by one turn (vectorized Euler).
+          Z      : (N, 4) state array
+          K      : params as a dict of (N,) arrays (or scalars)
+          deltas : (N,) raw Δ
+          codes  : (N,) ritual codes (see ritual_codes), None = no ritual
+        """
+        n = len(Z)
+        u = self.table[np.zeros(n, dtype=np.intp) if codes is None else codes]
+        eff_delta = np.broadcast_to(np.asarray(deltas, dtype=float), (n,)) * u[:, 3]
+        K = tuple(np.broadcast_to(np.asarray(K[k], dtype=float), (n,)) for k in PARAM_KEYS)
+        return euler_batch(Z, K, eff_delta, u[:, :3], dt, steps, self.lo, self.hi)
+
+    @staticmethod
+    def observe_batch(Z):
+        """Vectorized observe: (valence, arousal) arrays."""
+        R, L, E, C = Z.T
+        val = np.tanh(1.0*(-R) + 0.8*L - 1.0*E + 0.7*C)
+        aro = np.log1p(np.exp(0.5*np.abs(R) + 0.5*E))
+        return val, aro
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import pytest
+    # Parity of every adapter with its original Euler loop lives in the test suite
+    sys.exit(pytest.main(['-q', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'test_engine_parity.py')]))
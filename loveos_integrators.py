@@ -0,0 +1,320 @@
+"""
+Love-OS Integrators
+-------------------
+Pluggable time integrators for the R/L/E/C emotion ODE:
+
+    dR = aR*Δ - bR*L*R - gR*C*R
+    dL = aL*C - bL*E*R - dL*L + uL
+    dE = aE*|Δ| - bE*L - dE*E + uE
+    dC = -aC*R + bC*L - dC*C + uC
+
+Every integrator advances ONE conversation turn of physical length `dt`
+and shares the signature
+
+    integrator(z, k, delta, u, dt, steps, lo, hi) -> (R, L, E, C)
+
+  z     : (R, L, E, C) floats
+  k     : parameter tuple in PARAM_KEYS order (see param_tuple)
+  delta : effective Δ for this turn (ritual scaling already applied)
+  u     : ritual inputs (uL, uC, uE)
+  steps : micro-steps per turn (initial step hint for adaptive schemes)
+  lo/hi : state clip bounds (anti-explosion safety, applied per micro-step)
+
+Available: 'euler' (reference loop), 'fused' (same Euler result, no
+per-substep object creation; the fast path), 'rk4', 'rk45' (adaptive
+Dormand–Prince: error-controlled accuracy, not speed).
+
+Usage:
+  python loveos_integrators.py      # turns/sec benchmark
+"""
+
+import math
+import time
+from operator import attrgetter, itemgetter
+
+PARAM_KEYS = ('aR', 'bR', 'gR', 'aL', 'bL', 'dL', 'aE', 'bE', 'dE', 'aC', 'bC', 'dC')
+_get_items = itemgetter(*PARAM_KEYS)
+_get_attrs = attrgetter(*PARAM_KEYS)
+
+
+def param_tuple(p):
+    """Flatten a params dict (core.py) or dataclass (LoveOSParams / Params) into PARAM_KEYS order."""
+    if isinstance(p, dict):
+        return _get_items(p)
+    return _get_attrs(p)
+
+
+def rlec_rhs(R, L, E, C, k, delta, uL, uC, uE):
+    """The Motion Equations of Emotion. Works on floats and NumPy arrays alike."""
+    aR, bR, gR, aL, bL, dL, aE, bE, dE, aC, bC, dC = k
+    dR_ = aR*delta - bR*L*R - gR*C*R
+    dL_ = aL*C - bL*E*R - dL*L + uL
+    dE_ = aE*abs(delta) - bE*L - dE*E + uE
+    dC_ = -aC*R + bC*L - dC*C + uC
+    return dR_, dL_, dE_, dC_
+
+
+def _clamp(x, lo, hi):
+    return max(lo, min(hi, x))
+
+# ------------------------------
+# Fixed-step schemes
+# ------------------------------
+
+def euler(z, k, delta, u, dt, steps, lo, hi):
+    """Reference explicit Euler: `steps` micro-steps of dt/steps, clipped after each."""
+    R, L, E, C = z
+    uL, uC, uE = u
+    h = dt / steps
+    for _ in range(steps):
+        dR_, dL_, dE_, dC_ = rlec_rhs(R, L, E, C, k, delta, uL, uC, uE)
+        R = _clamp(R + h*dR_, lo, hi)
+        L = _clamp(L + h*dL_, lo, hi)
+        E = _clamp(E + h*dE_, lo, hi)
+        C = _clamp(C + h*dC_, lo, hi)
+    return R, L, E, C
+
+
+def fused(z, k, delta, u, dt, steps, lo, hi):
+    """
+    Fused Euler kernel: bit-identical to `euler`, but the step size and the
+    Δ-dependent drive terms are hoisted out of the loop, and the RHS and clip
+    are inlined so no tuples or function calls are created per micro-step.
+    """
+    R, L, E, C = z
+    uL, uC, uE = u
+    aR, bR, gR, aL, bL, dL, aE, bE, dE, aC, bC, dC = k
+    h = dt / steps
+    drive_R = aR*delta
+    drive_E = aE*abs(delta)
+    nC = -aC
+    for _ in range(steps):
+        dR_ = drive_R - bR*L*R - gR*C*R
+        dL_ = aL*C - bL*E*R - dL*L + uL
+        dE_ = drive_E - bE*L - dE*E + uE
+        dC_ = nC*R + bC*L - dC*C + uC
+        R = R + h*dR_
+        L = L + h*dL_
+        E = E + h*dE_
+        C = C + h*dC_
+        R = lo if R < lo else (hi if R > hi else R)
+        L = lo if L < lo else (hi if L > hi else L)
+        E = lo if E < lo else (hi if E > hi else E)
+        C = lo if C < lo else (hi if C > hi else C)
+    return R, L, E, C
+
+
+def rk4(z, k, delta, u, dt, steps, lo, hi):
+    """Classical 4th-order Runge–Kutta with `steps` micro-steps per turn."""
+    R, L, E, C = z
+    uL, uC, uE = u
+    h = dt / steps
+    for _ in range(steps):
+        k1 = rlec_rhs(R, L, E, C, k, delta, uL, uC, uE)
+        k2 = rlec_rhs(R + 0.5*h*k1[0], L + 0.5*h*k1[1], E + 0.5*h*k1[2], C + 0.5*h*k1[3], k, delta, uL, uC, uE)
+        k3 = rlec_rhs(R + 0.5*h*k2[0], L + 0.5*h*k2[1], E + 0.5*h*k2[2], C + 0.5*h*k2[3], k, delta, uL, uC, uE)
+        k4 = rlec_rhs(R + h*k3[0], L + h*k3[1], E + h*k3[2], C + h*k3[3], k, delta, uL, uC, uE)
+        R = _clamp(R + h/6.0*(k1[0] + 2*k2[0] + 2*k3[0] + k4[0]), lo, hi)
+        L = _clamp(L + h/6.0*(k1[1] + 2*k2[1] + 2*k3[1] + k4[1]), lo, hi)
+        E = _clamp(E + h/6.0*(k1[2] + 2*k2[2] + 2*k3[2] + k4[2]), lo, hi)
+        C = _clamp(C + h/6.0*(k1[3] + 2*k2[3] + 2*k3[3] + k4[3]), lo, hi)
+    return R, L, E, C
+
+def euler_batch(Z, K, delta, U, dt, steps, lo, hi):
+    """
+    Vectorized fixed-step Euler for N independent states, updated in place.
+      Z     : (N, 4) float array (R, L, E, C columns)
+      K     : 12 parameter arrays of shape (N,), PARAM_KEYS order
+      delta : (N,) effective Δ
+      U     : (N, 3) ritual inputs (uL, uC, uE)
+    Row i matches `fused` / `euler` on the same inputs bit-for-bit.
+    """
+    aR, bR, gR, aL, bL, dL, aE, bE, dE, aC, bC, dC = K
+    uL, uC, uE = U[:, 0], U[:, 1], U[:, 2]
+    R, L, E, C = Z[:, 0], Z[:, 1], Z[:, 2], Z[:, 3]   # views into Z
+    dZ = Z.copy()
+    h = dt / steps
+
+    # Δ-dependent terms are constant over the turn
+    drive_R = aR*delta
+    drive_E = aE*abs(delta)
+
+    for _ in range(steps):
+        dZ[:, 0] = drive_R - bR*L*R - gR*C*R
+        dZ[:, 1] = aL*C - bL*E*R - dL*L + uL
+        dZ[:, 2] = drive_E - bE*L - dE*E + uE
+        dZ[:, 3] = -aC*R + bC*L - dC*C + uC
+
+        dZ *= h
+        Z += dZ
+        Z.clip(lo, hi, out=Z)
+    return Z
+
+
+# ------------------------------
+# Adaptive scheme
+# ------------------------------
+
+# Dormand–Prince 5(4) tableau (b5 = last row of A; E = b5 - b4, the embedded error weights)
+_A21 = 1/5
+_A31, _A32 = 3/40, 9/40
+_A41, _A42, _A43 = 44/45, -56/15, 32/9
+_A51, _A52, _A53, _A54 = 19372/6561, -25360/2187, 64448/6561, -212/729
+_A61, _A62, _A63, _A64, _A65 = 9017/3168, -355/33, 46732/5247, 49/176, -5103/18656
+_B1, _B3, _B4, _B5, _B6 = 35/384, 500/1113, 125/192, -2187/6784, 11/84
+_E1, _E3, _E4, _E5, _E6, _E7 = (35/384 - 5179/57600, 500/1113 - 7571/16695, 125/192 - 393/640,
+                                -2187/6784 + 92097/339200, 11/84 - 187/2100, -1/40)
+
+
+class RK45:
+    """
+    Adaptive Dormand–Prince integrator, for when the turn must meet rtol/atol
+    rather than a fixed step count. It is not a speed option: with the stock
+    parameters and default tolerances a turn takes ~3-4 steps of 6 RHS
+    evaluations, several times the cost of the fused Euler path.
+    `steps` only seeds the very first step size (dt/steps); afterwards the
+    step carries over between turns and grows or shrinks with the local
+    error estimate. The carried step is the controller's last proposal that
+    was not cut short by the end of the turn. It is per instance: give every
+    state its own RK45 (get_integrator('rk45') returns a fresh one).
+    Raises RuntimeError if max_steps attempts do not cover the turn.
+    """
+    def __init__(self, rtol: float = 1e-4, atol: float = 1e-7, max_steps: int = 10_000):
+        self.rtol = rtol
+        self.atol = atol
+        self.max_steps = max_steps
+        self.h_hint = None     # step size carried across turns
+        self.last_nsteps = 0   # accepted steps in the most recent turn
+
+    def __call__(self, z, k, delta, u, dt, steps, lo, hi):
+        uL, uC, uE = u
+        aR, bR, gR, aL, bL, dL, aE, bE, dE, aC, bC, dC = k
+        drive_R = aR*delta
+        drive_E = aE*abs(delta)
+        rtol, atol = self.rtol, self.atol
+
+        def f(R, L, E, C):
+            return (drive_R - bR*L*R - gR*C*R, aL*C - bL*E*R - dL*L + uL,
+                    drive_E - bE*L - dE*E + uE, -aC*R + bC*L - dC*C + uC)
+
+        R, L, E, C = z
+        r1, l1, e1, c1 = f(R, L, E, C)
+        t = 0.0
+        h = self.h_hint or dt / max(1, steps)
+        carry = h
+        nsteps = 0
+        for _ in range(self.max_steps):
+            if t >= dt:
+                break
+            truncated = h > dt - t
+            ht = dt - t if truncated else h
+            a = ht*_A21
+            r2, l2, e2, c2 = f(R + a*r1, L + a*l1, E + a*e1, C + a*c1)
+            r3, l3, e3, c3 = f(R + ht*(_A31*r1 + _A32*r2), L + ht*(_A31*l1 + _A32*l2),
+                               E + ht*(_A31*e1 + _A32*e2), C + ht*(_A31*c1 + _A32*c2))
+            r4, l4, e4, c4 = f(R + ht*(_A41*r1 + _A42*r2 + _A43*r3), L + ht*(_A41*l1 + _A42*l2 + _A43*l3),
+                               E + ht*(_A41*e1 + _A42*e2 + _A43*e3), C + ht*(_A41*c1 + _A42*c2 + _A43*c3))
+            r5, l5, e5, c5 = f(R + ht*(_A51*r1 + _A52*r2 + _A53*r3 + _A54*r4),
+                               L + ht*(_A51*l1 + _A52*l2 + _A53*l3 + _A54*l4),
+                               E + ht*(_A51*e1 + _A52*e2 + _A53*e3 + _A54*e4),
+                               C + ht*(_A51*c1 + _A52*c2 + _A53*c3 + _A54*c4))
+            r6, l6, e6, c6 = f(R + ht*(_A61*r1 + _A62*r2 + _A63*r3 + _A64*r4 + _A65*r5),
+                               L + ht*(_A61*l1 + _A62*l2 + _A63*l3 + _A64*l4 + _A65*l5),
+                               E + ht*(_A61*e1 + _A62*e2 + _A63*e3 + _A64*e4 + _A65*e5),
+                               C + ht*(_A61*c1 + _A62*c2 + _A63*c3 + _A64*c4 + _A65*c5))
+            R5 = R + ht*(_B1*r1 + _B3*r3 + _B4*r4 + _B5*r5 + _B6*r6)
+            L5 = L + ht*(_B1*l1 + _B3*l3 + _B4*l4 + _B5*l5 + _B6*l6)
+            E5 = E + ht*(_B1*e1 + _B3*e3 + _B4*e4 + _B5*e5 + _B6*e6)
+            C5 = C + ht*(_B1*c1 + _B3*c3 + _B4*c4 + _B5*c5 + _B6*c6)
+            r7, l7, e7, c7 = f(R5, L5, E5, C5)      # FSAL: first stage of the next step
+            # embedded 4th-order error, scaled per component
+            err = max(
+                abs(ht*(_E1*r1 + _E3*r3 + _E4*r4 + _E5*r5 + _E6*r6 + _E7*r7)) / (atol + rtol*max(abs(R), abs(R5))),
+                abs(ht*(_E1*l1 + _E3*l3 + _E4*l4 + _E5*l5 + _E6*l6 + _E7*l7)) / (atol + rtol*max(abs(L), abs(L5))),
+                abs(ht*(_E1*e1 + _E3*e3 + _E4*e4 + _E5*e5 + _E6*e6 + _E7*e7)) / (atol + rtol*max(abs(E), abs(E5))),
+                abs(ht*(_E1*c1 + _E3*c3 + _E4*c4 + _E5*c5 + _E6*c6 + _E7*c7)) / (atol + rtol*max(abs(C), abs(C5))))
+            # standard step-size controller (order 5, safety 0.9)
+            h_new = ht * (min(5.0, max(0.2, 0.9 * err ** -0.2)) if err > 0.0 else 5.0)
+            if err <= 1.0:
+                t = dt if truncated else t + ht
+                nsteps += 1
+                R = lo if R5 < lo else (hi if R5 > hi else R5)
+                L = lo if L5 < lo else (hi if L5 > hi else L5)
+                E = lo if E5 < lo else (hi if E5 > hi else E5)
+                C = lo if C5 < lo else (hi if C5 > hi else C5)
+                if R == R5 and L == L5 and E == E5 and C == C5:
+                    r1, l1, e1, c1 = r7, l7, e7, c7
+                else:
+                    r1, l1, e1, c1 = f(R, L, E, C)
+            # a step cut short to land on the end of the turn does not shrink the carried step
+            carry = max(h, h_new) if truncated and err <= 1.0 else h_new
+            h = h_new
+        self.h_hint = carry
+        self.last_nsteps = nsteps
+        if t < dt:
+            raise RuntimeError(f"RK45: max_steps={self.max_steps} exhausted at t={t:.6g} of dt={dt:.6g} "
+                               f"(step size {h:.3g}); loosen rtol/atol or raise max_steps")
+        return R, L, E, C
+
+
+INTEGRATORS = {
+    'euler': euler,
+    'fused': fused,
+    'rk4': rk4,
+    'rk45': RK45,     # stateful: a class, instantiated per get_integrator() call
+}
+
+
+def get_integrator(spec):
+    """Resolve an integrator name (see INTEGRATORS) or pass a callable through."""
+    if isinstance(spec, type):
+        return spec()
+    if callable(spec):
+        return spec
+    try:
+        fn = INTEGRATORS[spec]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown integrator: {spec!r} (choose from {sorted(INTEGRATORS)})") from None
+    return fn() if isinstance(fn, type) else fn
+
+
+def bind_integrator(owner, spec):
+    """
+    The integrator `owner` (a state adapter) should use for `spec`: resolved
+    once and kept on the owner, so stateful integrators (RK45) are never
+    shared between states. Re-resolved when the owner's spec changes, and
+    for copies (copy.copy shares the attribute, so the binding is keyed by
+    the owner's identity).
+    """
+    bound = owner.__dict__.get('_integrator_bound')
+    if bound is None or bound[0] != id(owner) or bound[1] != spec:
+        bound = owner.__dict__['_integrator_bound'] = (id(owner), spec, get_integrator(spec))
+    return bound[2]
+
+# ------------------------------
+# Benchmark
+# ------------------------------
+
+def benchmark(turns: int = 20_000, dt: float = 0.5, steps: int = 5):
+    """Turns/sec for each integrator on a fixed pseudo-random Δ / ritual sequence."""
+    k = (1.2, 0.8, 0.6, 0.4, 0.3, 0.05, 0.8, 0.5, 0.1, 0.5, 0.6, 0.1)
+    deltas = [1.5 * math.sin(0.37 * i) for i in range(turns)]
+    rituals = [(0.0, 0.2, -0.3) if i % 7 == 0 else (0.0, 0.0, 0.0) for i in range(turns)]
+    results = {}
+    for name in INTEGRATORS:
+        fn = get_integrator(name)
+        z = (0.1, 0.5, 0.2, 0.5)
+        t0 = time.perf_counter()
+        for d, u in zip(deltas, rituals):
+            z = fn(z, k, d, u, dt, steps, -2.0, 3.0)
+        results[name] = (turns / (time.perf_counter() - t0), z)
+    return results
+
+
+if __name__ == "__main__":
+    print("--- Love-OS Integrator Benchmark (turns/sec) ---")
+    ref = None
+    for name, (rate, z) in benchmark().items():
+        ref = ref or z
+        drift = max(abs(a - b) for a, b in zip(z, ref))
+        print(f"{name:>6}: {rate:>12,.0f} turns/s   |z - z_euler| = {drift:.2e}")
@@ -0,0 +1,190 @@
+"""
+Love-OS Lexicon Matcher
+-----------------------
+Multi-pattern term matching for the perception layers (SimplePerception,
+LoveOS_Agent). A Lexicon holds named term categories ('neg', 'pos', '!',
+...) compiled once into an Aho–Corasick automaton over characters, so a
+message is scored in one left-to-right pass however many terms there are.
+Matching is by substring, exactly like `term in text`, which also covers
+Japanese text without word boundaries; overlapping terms all count.
+
+Transitions are resolved lazily: a (state, char) pair walks the failure
+links the first time it is seen and is then a single dict lookup, so the
+automaton turns into a DFA over the characters that actually occur.
+
+Identical term sets share one compiled automaton (see compile_lexicon).
+
+Usage:
+  python loveos_lexicon.py      # ~40k-term EN/JA lexicon vs `w in t` on long messages
+"""
+
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Tuple
+import hashlib
+
+
+def read_terms(path: str) -> List[str]:
+    """One term per line (UTF-8); blank lines and lines starting with '#' are skipped."""
+    with open(path, encoding='utf-8') as f:
+        return [s for s in (line.strip() for line in f) if s and not s.startswith('#')]
+
+
+class Automaton:
+    """Aho–Corasick automaton over a list of (non-empty) patterns."""
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        goto = [{}]
+        out: List[list] = [[]]
+        for pid, p in enumerate(self.patterns):
+            s = 0
+            for ch in p:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = goto[s][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                s = nxt
+            out[s].append(pid)
+
+        # Failure links (BFS); outputs are merged along them once, here
+        fail = [0]*len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in goto[s].items():
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f][ch] if ch in goto[f] and goto[f][ch] != nxt else 0
+                out[nxt].extend(out[fail[nxt]])
+                queue.append(nxt)
+
+        self._trie = goto
+        self._delta = [dict(g) for g in goto]    # grows into the DFA as (state, char) pairs are seen
+        self._fail = fail
+        self.out = [tuple(o) for o in out]
+
+    def __len__(self):
+        return len(self._trie)
+
+    def _resolve(self, s: int, ch: str) -> int:
+        f = s
+        while f and ch not in self._trie[f]:
+            f = self._fail[f]
+        nxt = self._trie[f].get(ch, 0)
+        self._delta[s][ch] = nxt
+        return nxt
+
+    def findall(self, text: str) -> List[int]:
+        """Pattern ids of every occurrence in text (in order of match end)."""
+        delta, out, resolve = self._delta, self.out, self._resolve
+        hits = []
+        s = 0
+        for ch in text:
+            nxt = delta[s].get(ch)
+            s = resolve(s, ch) if nxt is None else nxt
+            if out[s]:
+                hits.extend(out[s])
+        return hits
+
+
+class Hits:
+    """Result of one scan: occurrence counts per term, grouped by category."""
+    __slots__ = ('terms',)
+
+    def __init__(self, terms: Dict[str, Dict[str, int]]):
+        self.terms = terms          # category -> {term: occurrences}
+
+    def distinct(self, category: str) -> int:
+        """Number of different terms of `category` present (the `sum(w in t for w in words)` score)."""
+        return len(self.terms.get(category, ()))
+
+    def count(self, category: str) -> int:
+        """Total occurrences of the category's terms (overlaps included)."""
+        return sum(self.terms.get(category, {}).values())
+
+    def __repr__(self):
+        return f"Hits({self.terms!r})"
+
+
+class Lexicon:
+    """
+    Named term categories matched in one pass. A term may belong to several
+    categories. Terms are lowercased when `lower` is set (scan() then expects
+    lowercased text, as the callers' `text.lower()` provides).
+    """
+    def __init__(self, categories: Dict[str, Iterable[str]], lower: bool = True):
+        cats: Dict[str, List[str]] = {}
+        for cat, terms in categories.items():
+            for t in terms:
+                t = t.lower() if lower else t
+                if t:
+                    cats.setdefault(t, [])
+                    if cat not in cats[t]:
+                        cats[t].append(cat)
+        self.categories = tuple(categories)
+        self.terms = tuple(cats)
+        self._cats: Tuple[Tuple[str, ...], ...] = tuple(tuple(c) for c in cats.values())
+        self.automaton = Automaton(self.terms)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def scan(self, text: str) -> Hits:
+        terms = self.terms
+        per: Dict[str, Dict[str, int]] = {}
+        for pid, n in Counter(self.automaton.findall(text)).items():
+            for cat in self._cats[pid]:
+                per.setdefault(cat, {})[terms[pid]] = n
+        return Hits(per)
+
+
+_COMPILED: Dict[str, Lexicon] = {}
+
+
+def compile_lexicon(categories: Dict[str, Iterable[str]], lower: bool = True) -> Lexicon:
+    """Lexicon for these categories, shared with every caller that asks for the same term sets."""
+    frozen = {cat: sorted(set(terms)) for cat, terms in categories.items()}
+    h = hashlib.sha256(repr((sorted(frozen.items()), lower)).encode('utf-8')).hexdigest()
+    lex = _COMPILED.get(h)
+    if lex is None:
+        lex = _COMPILED[h] = Lexicon(frozen, lower=lower)
+    return lex
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(0)
+    latin = 'abcdefghijklmnopqrstuvwxyz'
+    kana = [chr(c) for c in range(0x3041, 0x3097)] + list('嫌好最悪遅速使助感謝怒悲喜楽愛')
+
+    def words(alphabet, n, lo, hi):
+        return list({''.join(rng.choice(alphabet) for _ in range(rng.randint(lo, hi))) for _ in range(n)})
+
+    neg = words(latin, 10000, 5, 10) + words(kana, 10000, 2, 5) + ['stupid', 'バカ', '使えない']
+    pos = words(latin, 10000, 5, 10) + words(kana, 10000, 2, 5) + ['thanks', 'ありがとう', '好き']
+    filler = [w for w in ('the', 'system', 'is', 'so', 'and', 'but', 'です', 'ます', 'が', 'は', 'の') for _ in range(3)]
+    messages = [' '.join(rng.choice(filler + ['stupid', 'バカ', 'thanks', '好き', '!', rng.choice(neg), rng.choice(pos)])
+                         for _ in range(n)) for n in (50, 500, 2000)]
+
+    t0 = time.perf_counter()
+    lex = Lexicon({'neg': neg, 'pos': pos, '!': ['!']})
+    t_build = time.perf_counter() - t0
+    print(f"lexicon: {len(lex):,} terms, {len(lex.automaton):,} automaton states, built in {t_build:.2f}s")
+
+    for msg in messages:
+        t = msg.lower()
+        reps = 5
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            naive = (sum(1 for w in neg if w in t), sum(1 for w in pos if w in t), t.count('!'))
+        t_naive = (time.perf_counter() - t0)/reps
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            h = lex.scan(t)
+            fast = (h.distinct('neg'), h.distinct('pos'), h.count('!'))
+        t_fast = (time.perf_counter() - t0)/reps
+        print(f"  {len(t):6,} chars: `w in t` {t_naive*1e3:8.2f} ms | automaton {t_fast*1e3:6.2f} ms "
+              f"| x{t_naive/t_fast:6.1f} | same scores: {naive == fast} {fast}")
@@ -1,8 +1,18 @@
+import logging
+import os
 import time
-import math
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from itertools import islice
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from loveos_engine import RLECEngine
+from loveos_integrators import PARAM_KEYS, bind_integrator, param_tuple
+from loveos_lexicon import compile_lexicon, read_terms
 
 # ==========================================
 # 0) Utilities & Core Physics (Love-OS Kernel)
@@ -19,47 +29,34 @@ class LoveOSParams:
     aE: float = 0.8; bE: float = 0.5; dE: float = 0.1
     aC: float = 0.5; bC: float = 0.6; dC: float = 0.1
 
+# [DSL: Ritual Logic] Right-Brain Intervention inputs
+RITUALS = {
+    'BREATH': {'uL': 0.0, 'uC': +0.3, 'uE': -0.5, 'd_scale': 0.5},  # Deep Breath
+    'LABEL':  {'uL': +0.4, 'uC': 0.0, 'uE': 0.0, 'd_scale': 0.8},  # Affect Labeling
+    'ACCEPT': {'uL': +0.2, 'uC': 0.0, 'uE': -0.3, 'd_scale': 1.0},  # Radical Acceptance
+}
+ENGINE = RLECEngine(-2.0, 3.0, RITUALS)
+
+log = logging.getLogger('loveos.agent')
+
 class LoveOSState:
     """Neural ODE State Container"""
-    def __init__(self, dt=0.5, steps=5, init=(0.1,0.5,0.2,0.5), params: LoveOSParams=None):
+    def __init__(self, dt=0.5, steps=5, init=(0.1,0.5,0.2,0.5), params: LoveOSParams=None, integrator='fused'):
         self.R, self.L, self.E, self.C = init
         self.dt = dt
         self.steps = steps
         self.p = params or LoveOSParams()
+        self.integrator = integrator  # 'fused' | 'euler' | 'rk4' | 'rk45' | callable
 
     def step_from_delta(self, delta: float, ritual: Optional[str]=None):
-        # Ritual inputs (Right-Brain Intervention)
-        uL, uC, uE = 0.0, 0.0, 0.0
-        
-        # [DSL: Ritual Logic]
-        if ritual == 'BREATH': 
-            uE = -0.5; uC = +0.3; delta *= 0.5 # Deep Breath
-        elif ritual == 'LABEL': 
-            uL = +0.4; delta *= 0.8            # Affect Labeling
-        elif ritual == 'ACCEPT': 
-            uL = +0.2; uE = -0.3               # Radical Acceptance
-
-        # Euler Integration (Micro-steps for smooth dynamics)
-        for _ in range(self.steps):
-            R, L, E, C = self.R, self.L, self.E, self.C
-            p = self.p
-            
-            # The Motion Equations of Emotion
-            dR = p.aR*delta - p.bR*L*R - p.gR*C*R
-            dL = p.aL*C - p.bL*E*R - p.dL*L + uL
-            dE = p.aE*abs(delta) - p.bE*L - p.dE*E + uE
-            dC = -p.aC*R + p.bC*L - p.dC*C + uC
-
-            self.R = clamp(self.R + (self.dt/self.steps)*dR, -2.0, 3.0)
-            self.L = clamp(self.L + (self.dt/self.steps)*dL, -2.0, 3.0)
-            self.E = clamp(self.E + (self.dt/self.steps)*dE, -2.0, 3.0)
-            self.C = clamp(self.C + (self.dt/self.steps)*dC, -2.0, 3.0)
+        # Ritual inputs + Time Integration (Euler micro-steps by default, clipped to [-2, 3])
+        self.R, self.L, self.E, self.C = ENGINE.turn(
+            (self.R, self.L, self.E, self.C), self.p, delta, ritual,
+            dt=self.dt, steps=self.steps, integrator=bind_integrator(self, self.integrator))
             
     def get_observation(self):
         """Map state to Valence/Arousal"""
-        val = math.tanh(1.0*(-self.R) + 0.8*self.L - 1.0*self.E + 0.7*self.C)
-        aro = math.log1p(math.exp(0.5*abs(self.R) + 0.5*self.E))
-        return val, aro
+        return ENGINE.observe(self.R, self.L, self.E, self.C)
 
 # ==========================================
 # 1) Perception Layer (Simple Estimator)
@@ -69,11 +66,24 @@ class SimplePerception:
         # Bilingual simple lexicon
         self.neg_words = {'stupid','useless','hate','bad','angry','slow','バカ','ダメ','嫌い','最悪','遅い','使えない'}
         self.pos_words = {'love','thanks','great','good','happy','fast','好き','ありがとう','最高','助かる','早い'}
+        self.load_lexicon()
+
+    def load_lexicon(self, neg_words=None, pos_words=None):
+        """
+        Add terms (iterables, or paths of one-term-per-line files) and recompile
+        the matcher. Call this after editing neg_words / pos_words directly.
+        """
+        for words, extra in ((self.neg_words, neg_words), (self.pos_words, pos_words)):
+            if extra is not None:
+                words.update(read_terms(extra) if isinstance(extra, str) else extra)
+        self.lexicon = compile_lexicon({'neg': self.neg_words, 'pos': self.pos_words, '!': ['!']})
         
     def estimate_VA(self, text: str) -> Tuple[float, float]:
         t = text.lower()
-        neg_score = sum(1 for w in self.neg_words if w in t)
-        pos_score = sum(1 for w in self.pos_words if w in t)
+        # One pass over t: distinct neg / pos terms present, and the '!' count
+        hits = self.lexicon.scan(t)
+        neg_score = hits.distinct('neg')
+        pos_score = hits.distinct('pos')
         
         # Valence estimation
         valence = 0.0
@@ -81,11 +91,85 @@ class SimplePerception:
         elif pos_score > neg_score: valence = 0.3 + (0.2 * pos_score)
         
         # Arousal estimation (based on intensity)
-        exclam = t.count('!')
+        exclam = hits.count('!')
         arousal = 0.2 + (0.3 * (neg_score + pos_score)) + (0.2 * exclam)
         
         return clamp(valence, -1.0, 1.0), clamp(arousal, 0.0, 2.0)
 
+    def counts(self, texts) -> np.ndarray:
+        """(n, 3) int array: distinct neg terms, distinct pos terms and '!' count per text."""
+        out = []
+        for text in texts:
+            hits = self.lexicon.scan(text.lower())
+            out.append((hits.distinct('neg'), hits.distinct('pos'), hits.count('!')))
+        return np.array(out, dtype=np.int64).reshape(-1, 3)
+
+    def estimate_VA_batch(self, texts: Union[str, os.PathLike, Iterable[str]], processes: int = None,
+                          chunk_size: int = 10000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score many messages: a list, any iterable / generator, or the path of a
+        UTF-8 file with one message per line. Input is consumed in chunks of
+        `chunk_size` (never held in memory at once); with `processes`, chunks are
+        scored by a process pool. Returns (V, A) arrays equal to estimate_VA per text.
+        """
+        chunks = _chunks(_iter_texts(texts), chunk_size)
+        if processes:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(self.neg_words, self.pos_words)) as pool:
+                parts = list(_imap_bounded(pool, _worker_counts, chunks, window=2*processes))
+        else:
+            parts = [self.counts(c) for c in chunks]
+        C = np.concatenate(parts) if parts else np.zeros((0, 3), dtype=np.int64)
+        return va_from_counts(C[:, 0], C[:, 1], C[:, 2])
+
+
+def va_from_counts(neg, pos, exclam) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized SimplePerception valence / arousal formulas."""
+    valence = np.where(neg > pos, -0.5 - (0.2 * neg), np.where(pos > neg, 0.3 + (0.2 * pos), 0.0))
+    arousal = 0.2 + (0.3 * (neg + pos)) + (0.2 * exclam)
+    return np.clip(valence, -1.0, 1.0), np.clip(arousal, 0.0, 2.0)
+
+
+def _iter_texts(texts):
+    if isinstance(texts, (str, os.PathLike)):
+        with open(texts, encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip('\n')
+    else:
+        yield from texts
+
+
+def _chunks(it, size):
+    it = iter(it)
+    while True:
+        block = list(islice(it, size))
+        if not block:
+            return
+        yield block
+
+
+def _imap_bounded(pool, fn, items, window):
+    """pool.map that keeps at most `window` chunks in flight (Executor.map would read all input first)."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+_WORKER = None
+
+def _init_worker(neg_words, pos_words):
+    global _WORKER
+    _WORKER = SimplePerception()
+    _WORKER.neg_words, _WORKER.pos_words = set(neg_words), set(pos_words)
+    _WORKER.load_lexicon()
+
+def _worker_counts(texts):
+    return _WORKER.counts(texts)
+
 # ==========================================
 # 2) LLM Bridge (System Prompt Generator)
 # ==========================================
@@ -157,15 +241,15 @@ You must adjust your tone based on your internal state AND the user's estimated
 # 3) Dual-Core Agent (The Orchestrator)
 # ==========================================
 class DualCoreAgent:
-    def __init__(self):
-        self.perception = SimplePerception()
+    def __init__(self, perception=None, log: Union[logging.Logger, None] = log):
+        self.perception = perception or SimplePerception()
+        # dashboard sink: a Logger (INFO records, built only when enabled), any callable, or None
+        self.log = log
         # Two Hearts: One for AI, One for User Simulation
         self.agent_state = LoveOSState(init=(0.1, 0.5, 0.1, 0.6)) 
         self.user_model = LoveOSState(init=(0.5, 0.3, 0.5, 0.3)) 
         
     def chat_step(self, user_text: str):
-        print(f"\n>>> User: {user_text}")
-        
         # 1. Perceive User's Emotion
         uV, uA = self.perception.estimate_VA(user_text)
         
@@ -194,23 +278,108 @@ class DualCoreAgent:
         # 7. Generate Response
         reply = LLMBridge.mock_completion(sys_prompt, user_text)
         
-        # --- Dashboard Log ---
-        print(f"   [User Est  ] R:{self.user_model.R:.2f} E:{self.user_model.E:.2f} (Stress Level)")
-        print(f"   [AI State  ] R:{self.agent_state.R:.2f} E:{self.agent_state.E:.2f} L:{self.agent_state.L:.2f}")
-        if ritual: 
-            print(f"   [AI Action ] *** RITUAL TRIGGERED: {ritual} ***")
-        else:
-            print(f"   [AI Action ] (No ritual needed)")
-            
-        # Extract instruction for display
-        inst = sys_prompt.strip().split('[Response Policy]')[1].strip().replace('\n', ' | ')
-        print(f"   [LLM Inst  ] {inst[:100]}...") 
-        print(f">>> AI: {reply}")
+        # --- Dashboard Log (one record per turn) ---
+        emit = self.log
+        if isinstance(emit, logging.Logger):
+            emit = emit.info if emit.isEnabledFor(logging.INFO) else None
+        if emit is not None:
+            # Extract instruction for display
+            inst = sys_prompt.strip().split('[Response Policy]')[1].strip().replace('\n', ' | ')
+            emit("\n".join([
+                f"\n>>> User: {user_text}",
+                f"   [User Est  ] R:{self.user_model.R:.2f} E:{self.user_model.E:.2f} (Stress Level)",
+                f"   [AI State  ] R:{self.agent_state.R:.2f} E:{self.agent_state.E:.2f} L:{self.agent_state.L:.2f}",
+                f"   [AI Action ] *** RITUAL TRIGGERED: {ritual} ***" if ritual else "   [AI Action ] (No ritual needed)",
+                f"   [LLM Inst  ] {inst[:100]}...",
+                f">>> AI: {reply}"]))
+        return reply
 
 # ==========================================
-# 4) Demo Run
+# 4) Archive Replay (batched)
 # ==========================================
+def replay_VA(V, A, sessions=None, init=(0.1, 0.5, 0.2, 0.5), params: LoveOSParams = None,
+              auto_ritual=True, dt=0.5, steps=5):
+    """
+    Backfill R/L/E/C histories from per-message (V, A), e.g. from estimate_VA_batch.
+    Each message is one ContextBridge turn: Δ = 0.8*A - 0.6*V, and with auto_ritual
+    BREATH when E > 0.8, else LABEL when R > 0.8 (auto_ritual=False: plain
+    step_from_delta, the DualCoreAgent user model).
+      sessions : per-message conversation id (messages of a session in order);
+                 None = the whole archive is one conversation
+    All sessions advance together: turn k of every session is one vectorized
+    step. Returns a dict of per-message arrays aligned with the input:
+    R, L, E, C (state after the message), Delta and Ritual (None = no ritual).
+    """
+    V = np.asarray(V, dtype=float)
+    A = np.asarray(A, dtype=float)
+    n = len(V)
+    sid = np.zeros(n, dtype=np.int64) if sessions is None else np.unique(np.asarray(sessions), return_inverse=True)[1].ravel()
+    K = dict(zip(PARAM_KEYS, param_tuple(params or LoveOSParams())))
+
+    # Sessions ordered longest first: the ones still running at turn k are a prefix of the state array
+    lengths = np.bincount(sid)
+    rank = np.empty(len(lengths), dtype=np.int64)
+    rank[np.argsort(-lengths, kind='stable')] = np.arange(len(lengths))
+    row = rank[sid]
+    order = np.lexsort((np.arange(n), row))                 # messages by session rank, then arrival
+    start = np.concatenate(([0], np.cumsum(np.sort(lengths)[::-1])))
+    turn = np.arange(n) - start[row[order]]                 # turn index of each message in `order`
+    by_turn = order[np.argsort(turn, kind='stable')]        # turn 0 of every session, then turn 1, ...
+    active = np.bincount(turn)                              # sessions still running at each turn
+
+    Z = np.tile(np.asarray(init, dtype=float), (len(lengths), 1))
+    out = np.empty((n, 4))
+    delta = 0.8*A - 0.6*V
+    codes = np.zeros(n, dtype=np.intp)
+    breath, label = ENGINE.codes['BREATH'], ENGINE.codes['LABEL']
+    pos = 0
+    for m in active.tolist():
+        idx = by_turn[pos:pos + m]
+        z = Z[:m]
+        if auto_ritual:
+            codes[idx] = np.where(z[:, 2] > 0.8, breath, np.where(z[:, 0] > 0.8, label, 0))
+        ENGINE.turn_batch(z, K, delta[idx], codes[idx], dt=dt, steps=steps)
+        out[idx] = z
+        pos += m
+
+    return {'R': out[:, 0], 'L': out[:, 1], 'E': out[:, 2], 'C': out[:, 3], 'Delta': delta,
+            'Ritual': np.array(ENGINE.names, dtype=object)[codes]}
+
+# ==========================================
+# 5) Demo Run
+# ==========================================
+def bench_archive(n=1_000_000, n_sessions=10_000, processes=None, seed=0):
+    """Score and replay a synthetic n-message archive; prints the timings."""
+    rng = random.Random(seed)
+    base = ["Hello, I need some help.", "Why are you so slow? This is useless!", "Answer faster next time!",
+            "I'm sorry, I'm just stressed out.", "Thank you for understanding.", "バカ！使えない", "ありがとう、助かる"]
+    texts = (rng.choice(base) for _ in range(n))
+    t0 = time.perf_counter()
+    V, A = SimplePerception().estimate_VA_batch(texts, processes=processes)
+    t_score = time.perf_counter() - t0
+    sessions = np.random.default_rng(seed).integers(0, n_sessions, n)
+    t0 = time.perf_counter()
+    res = replay_VA(V, A, sessions=sessions)
+    t_replay = time.perf_counter() - t0
+    print(f"{n:,} messages / {n_sessions:,} sessions: scoring {t_score:.1f}s, replay {t_replay:.1f}s, "
+          f"rituals {np.count_nonzero(res['Ritual'] != None):,}")
+
+
 if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--bench', type=int, default=0, help='score + replay a synthetic archive of N messages')
+    ap.add_argument('--processes', type=int, default=None)
+    args = ap.parse_args()
+    if args.bench:
+        bench_archive(args.bench, processes=args.processes)
+        raise SystemExit
+
+    # Dashboard records go through a queue listener thread, off the turn path
+    import sys
+    from loveos_async_bridge import nonblocking_logging
+    listener = nonblocking_logging(log, logging.StreamHandler(sys.stdout))
+    log.setLevel(logging.INFO)
     bot = DualCoreAgent()
     
     # Simulation Scenario
@@ -226,3 +395,4 @@ if __name__ == "__main__":
     for line in dialogue:
         bot.chat_step(line)
         time.sleep(1.5) # Wait to feel the time
+    listener.stop()
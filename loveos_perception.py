@@ -0,0 +1,330 @@
+"""
+Love-OS Perception Backends
+---------------------------
+Pluggable (Valence, Arousal) scorers for the agents, all with the
+SimplePerception interface `estimate_VA(text) -> (V, A)`:
+
+  LexiconBackend : the compiled lexicon (SimplePerception); fast, always available
+  SklearnBackend : local scikit-learn model (char n-gram hashing + ridge regression)
+  LLMBackend     : HTTP scorer, POST {"text": ...} -> {"valence": V, "arousal": A};
+                   StandInScorer serves that protocol locally for development
+
+PerceptionService wraps a backend for use inside the turn loop:
+  - LRU cache keyed by a content hash of the text (a greeting is scored once)
+  - coalescing: identical texts in flight share one backend request
+  - never blocks by default: a cache miss gets the lexicon score at once
+    while the backend request runs in the background and fills the cache
+    for the next time. `timeout` > 0 opts into waiting up to that long
+    (None: wait for the backend). Backend errors fall back the same way.
+  - bounded backlog: beyond `max_inflight` pending texts, misses fall back
+    without queueing more backend work
+It is a drop-in for SimplePerception (ContextBridge, DualCoreAgent,
+LoveOS_Agent(perception=...)); estimate_VA_async serves asyncio callers.
+
+Usage:
+  python loveos_perception.py      # slow stand-in LLM behind the service: latency, fallbacks, cache hits
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import pickle
+import random
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+from loveos_llm_bridge import SimplePerception, clamp
+
+# ------------------------------
+# Backends
+# ------------------------------
+class PerceptionBackend(ABC):
+    """Scores one message as (valence in [-1, 1], arousal in [0, 2])."""
+    name = 'base'
+
+    @abstractmethod
+    def estimate_VA(self, text: str) -> Tuple[float, float]:
+        ...
+
+
+class LexiconBackend(PerceptionBackend):
+    name = 'lexicon'
+
+    def __init__(self, perception: SimplePerception = None):
+        self.perception = perception or SimplePerception()
+
+    def estimate_VA(self, text):
+        return self.perception.estimate_VA(text)
+
+
+class SklearnBackend(PerceptionBackend):
+    """
+    Local regression model: character 1-3-gram hashing features (no tokenizer,
+    so Japanese works) into a two-output ridge regression for (V, A).
+    Train with fit(), or bootstrap() from lexicon-labelled text.
+    """
+    name = 'sklearn'
+
+    def __init__(self, model=None):
+        self.model = model
+
+    @staticmethod
+    def pipeline(alpha: float = 1.0):
+        try:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            from sklearn.linear_model import Ridge
+            from sklearn.pipeline import make_pipeline
+        except ImportError as e:
+            raise ImportError("SklearnBackend needs scikit-learn (pip install scikit-learn)") from e
+        return make_pipeline(HashingVectorizer(analyzer='char_wb', ngram_range=(1, 3), n_features=2**18,
+                                               alternate_sign=False, lowercase=True),
+                             Ridge(alpha=alpha))
+
+    def fit(self, texts, V, A):
+        self.model = self.pipeline().fit(list(texts), np.column_stack([V, A]))
+        return self
+
+    @classmethod
+    def bootstrap(cls, texts: Iterable[str] = None, perception: SimplePerception = None, n: int = 5000, seed: int = 0):
+        """Fit on `texts` (default: n synthetic messages built from the lexicon) labelled by the lexicon."""
+        perception = perception or SimplePerception()
+        if texts is None:
+            rng = random.Random(seed)
+            words = sorted(perception.neg_words | perception.pos_words)
+            filler = ['the', 'this', 'is', 'so', 'you', 'are', 'really', 'です', 'ね', 'とても', 'hello', 'ok']
+            texts = [' '.join(rng.choice(words if rng.random() < 0.3 else filler) for _ in range(rng.randint(1, 8)))
+                     + '!' * rng.choice([0, 0, 0, 1, 2]) for _ in range(n)]
+        texts = list(texts)
+        V, A = perception.estimate_VA_batch(texts)
+        return cls().fit(texts, V, A)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            pickle.dump(self.model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, 'rb') as f:
+            return cls(pickle.load(f))
+
+    def estimate_VA(self, text):
+        V, A = self.model.predict([text])[0]
+        return clamp(float(V), -1.0, 1.0), clamp(float(A), 0.0, 2.0)
+
+
+class LLMBackend(PerceptionBackend):
+    """JSON-over-HTTP scorer (an LLM behind a small scoring endpoint)."""
+    name = 'llm'
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def estimate_VA(self, text):
+        req = urllib.request.Request(self.url, data=json.dumps({'text': text}).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            out = json.loads(resp.read())
+        return clamp(float(out['valence']), -1.0, 1.0), clamp(float(out['arousal']), 0.0, 2.0)
+
+
+class StandInScorer:
+    """
+    Local stand-in for the LLM endpoint: answers POST {"text"} with the lexicon
+    score after `latency` seconds (plus up to `jitter`). Runs in a daemon thread.
+    """
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        perception = SimplePerception()
+        self.requests = 0
+        lock = threading.Lock()
+        scorer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with lock:                      # one handler thread per request
+                    scorer.requests += 1
+                time.sleep(latency + random.random()*jitter)
+                V, A = perception.estimate_VA(body['text'])
+                data = json.dumps({'valence': V, 'arousal': A}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/score"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ------------------------------
+# Service: cache + coalescing + timeout fallback
+# ------------------------------
+class PerceptionService:
+    """
+    Drop-in SimplePerception over any backend (see module docstring).
+    timeout=0 (default) never waits on the backend, timeout=None always does;
+    a cache_size of 0 disables the cache.
+    At most `max_inflight` distinct texts (default 2 x workers) are queued or
+    running on the backend; further misses get the fallback score straight
+    away and are not submitted, so a slow backend never builds a backlog.
+    """
+    def __init__(self, backend: PerceptionBackend, fallback: PerceptionBackend = None,
+                 cache_size: int = 4096, timeout: Optional[float] = 0.0, workers: int = 4,
+                 max_inflight: Optional[int] = None):
+        self.backend = backend
+        self.fallback = fallback or LexiconBackend()
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.max_inflight = 2 * workers if max_inflight is None else max_inflight
+        self._cache: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"perception-{backend.name}")
+        self.stats = dict(hits=0, misses=0, coalesced=0, fallbacks=0, errors=0, shed=0)
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _lookup(self, text):
+        """
+        Cached (V, A), or the future that will produce it (shared with identical
+        requests); (None, None) if the backend is saturated.
+        """
+        k = self.key(text)
+        with self._lock:
+            va = self._cache.get(k)
+            if va is not None:
+                self._cache.move_to_end(k)
+                self.stats['hits'] += 1
+                return va, None
+            fut = self._inflight.get(k)
+            if fut is None:
+                if len(self._inflight) >= self.max_inflight:
+                    self.stats['shed'] += 1
+                    return None, None
+                fut = self._inflight[k] = self._pool.submit(self._score, k, text)
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+            return None, fut
+
+    def _score(self, k, text):
+        try:
+            va = self.backend.estimate_VA(text)
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(k, None)
+                self.stats['errors'] += 1
+            raise
+        with self._lock:
+            self._inflight.pop(k, None)
+            if self.cache_size:
+                self._cache[k] = va
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return va
+
+    def _fallback(self, text):
+        with self._lock:
+            self.stats['fallbacks'] += 1
+        return self.fallback.estimate_VA(text)
+
+    def estimate_VA(self, text: str) -> Tuple[float, float]:
+        va, fut = self._lookup(text)
+        if va is not None:
+            return va
+        if fut is None:
+            return self.fallback.estimate_VA(text)      # saturated: counted in stats['shed']
+        if self.timeout == 0 and not fut.done():
+            return self._fallback(text)                 # the backend answer lands in the cache
+        try:
+            return fut.result(timeout=self.timeout)
+        except (FutureTimeout, Exception):              # errors are counted in _score
+            return self._fallback(text)
+
+    async def estimate_VA_async(self, text: str) -> Tuple[float, float]:
+        """estimate_VA for asyncio code: any opted-in wait does not block the event loop."""
+        va, fut = self._lookup(text)
+        if va is not None:
+            return va
+        if fut is None:
+            return self.fallback.estimate_VA(text)      # saturated: counted in stats['shed']
+        if self.timeout == 0 and not fut.done():
+            return self._fallback(text)
+        try:
+            # shield: a timeout here must not cancel the shared backend request
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(fut)), self.timeout)
+        except (asyncio.TimeoutError, Exception):
+            return self._fallback(text)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor as Pool
+
+    msgs = ["Hello!", "Why are you so slow? This is useless!", "Thank you for understanding.",
+            "バカ！使えない", "Hello!", "ありがとう、助かる", "Hello!"]
+
+    with StandInScorer(latency=0.5) as server:
+        for timeout in (0.0, 0.2):
+            with PerceptionService(LLMBackend(server.url), timeout=timeout) as svc:
+                wait = "never waits (default)" if timeout == 0 else f"opts into a {timeout}s wait"
+                print(f"--- stand-in LLM (0.5s latency), service {wait} ---")
+                for rnd in range(2):
+                    t0 = time.perf_counter()
+                    for m in msgs:
+                        svc.estimate_VA(m)
+                    print(f"round {rnd}: {len(msgs)} turns in {time.perf_counter() - t0:.3f}s")
+                    time.sleep(0.6)   # let the slow answers land in the cache
+                print(f"stats: {svc.stats}")
+
+        # 50 concurrent identical greetings -> one backend request
+        with PerceptionService(LLMBackend(server.url)) as svc:
+            before = server.requests
+            with Pool(50) as pool:
+                list(pool.map(svc.estimate_VA, ["Good morning!"]*50))
+            time.sleep(0.6)
+            print(f"50 concurrent 'Good morning!' -> {server.requests - before} endpoint request(s), stats: {svc.stats}")
+
+    sk = PerceptionService(SklearnBackend.bootstrap(), timeout=None)
+    for m in ("I hate this, so slow!", "thanks, that was great", "遅い、最悪"):
+        V, A = sk.estimate_VA(m)
+        print(f"sklearn {m!r}: V={V:+.2f} A={A:.2f}")
+    sk.close()
@@ -0,0 +1,494 @@
+"""
+Love-OS Philosophy Profiles
+---------------------------
+Compiles philosophy_profiles.json into executable school specs.
+
+Each profile carries additive parameter shifts (real R/L/E/C and complex
+Stuart–Landau), a `delta_mapping` expression and ordered ritual rules:
+
+    "delta_mapping": "clamp(0.9*(0.8*A - 0.6*V), -1.5, 1.5)"
+    "rules": [{"if": "E>0.8", "do": "BREATH(60s)"}, {"if": "R>0.7 && C<0.6", ...}]
+
+Expressions are parsed once (no eval) into closures over NumPy operations,
+so the same compiled function runs on scalars or on whole batches:
+
+  numbers, names, + - * / ** and unary -, < <= > >= == !=,
+  && || ! (or and / or / not), parentheses and the functions
+  clamp, min, max, abs, tanh, exp, log, log1p, sqrt, sin, cos.
+
+Names not bound at evaluation time (context flags such as `group` or
+`conflict`) read as 0, i.e. false. The first rule whose condition holds
+picks the ritual. Ritual names without an entry in the engine's ritual
+tables (e.g. PAUSE, VALUES) are still reported but have no dynamic effect.
+
+A compiled Profile gives
+  - school_spec()          : a loveos_schools.SchoolSpec (DigitalTwin / TwinBatch / run_schools)
+  - complex_params(), complex_agent(), apply_rituals() : ComplexAgent / ComplexPopulation
+
+load_profiles() caches compiled profiles by the SHA-256 of the file, in
+memory and optionally as parsed expression trees in a cache directory.
+
+Usage:
+  python loveos_profiles.py      # compile, show each profile's first choices, time cold / cached loads
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib
+import json
+import operator
+import os
+import re
+
+import numpy as np
+
+from loveos_complex_dashboard import PARAM_KEYS as COMPLEX_KEYS, ComplexAgent, ComplexPopulation
+from loveos_schools import RC, Params, SchoolSpec, shift_params
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'philosophy_profiles.json')
+BASELINE_DELTA = 'clamp(0.8*A - 0.6*V, -1.5, 1.5)'
+DEFAULT_DURATION = 8.0     # seconds a ComplexAgent ritual lasts when the rule does not say
+
+# ------------------------------
+# Expressions: tokenize -> parse (AST of tuples) -> compile (closures)
+# ------------------------------
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)"
+                    r"|([A-Za-z_]\w*)|(\*\*|&&|\|\||<=|>=|==|!=|[-+*/()<>!,]))")
+_WORD_OPS = {'and': '&&', 'or': '||', 'not': '!'}
+
+FUNCTIONS = {
+    'clamp': (3, np.clip), 'min': (2, np.minimum), 'max': (2, np.maximum),
+    'abs': (1, np.abs), 'tanh': (1, np.tanh), 'exp': (1, np.exp), 'log': (1, np.log),
+    'log1p': (1, np.log1p), 'sqrt': (1, np.sqrt), 'sin': (1, np.sin), 'cos': (1, np.cos),
+}
+_BINARY = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv, '**': operator.pow,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne, '&&': np.logical_and, '||': np.logical_or,
+}
+
+
+def tokenize(src: str):
+    toks, pos, src = [], 0, src.rstrip()
+    while pos < len(src):
+        m = _TOKEN.match(src, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"Bad character in expression {src!r} at {pos}: {src[pos:pos + 10]!r}")
+        num, name, op = m.groups()
+        if num is not None:
+            toks.append(('num', float(num)))
+        elif name is not None:
+            toks.append(('op', _WORD_OPS[name]) if name in _WORD_OPS else ('name', name))
+        else:
+            toks.append(('op', op))
+        pos = m.end()
+    return toks
+
+
+class _Parser:
+    """Recursive descent over the token list; precedence low -> high: || && ! cmp +- */ unary **."""
+    def __init__(self, src: str):
+        self.src = src
+        self.toks = tokenize(src)
+        self.i = 0
+
+    def parse(self):
+        node = self.or_()
+        if self.i != len(self.toks):
+            self.fail(f"unexpected {self.toks[self.i][1]!r}")
+        return node
+
+    def fail(self, msg):
+        raise ValueError(f"Cannot parse {self.src!r}: {msg}")
+
+    def peek(self, *ops):
+        if self.i < len(self.toks) and self.toks[self.i][0] == 'op' and self.toks[self.i][1] in ops:
+            return self.toks[self.i][1]
+        return None
+
+    def take(self, op):
+        if not self.peek(op):
+            self.fail(f"expected {op!r}")
+        self.i += 1
+
+    def _left(self, sub, *ops):
+        node = sub()
+        while (op := self.peek(*ops)):
+            self.i += 1
+            node = ('bin', op, node, sub())
+        return node
+
+    def or_(self):
+        return self._left(self.and_, '||')
+
+    def and_(self):
+        return self._left(self.not_, '&&')
+
+    def not_(self):
+        if self.peek('!'):
+            self.i += 1
+            return ('not', self.not_())
+        return self.cmp()
+
+    def cmp(self):
+        node = self.sum()
+        if (op := self.peek('<', '<=', '>', '>=', '==', '!=')):
+            self.i += 1
+            node = ('bin', op, node, self.sum())
+        return node
+
+    def sum(self):
+        return self._left(self.prod, '+', '-')
+
+    def prod(self):
+        return self._left(self.unary, '*', '/')
+
+    def unary(self):
+        if (op := self.peek('-', '+')):
+            self.i += 1
+            node = self.unary()
+            return ('neg', node) if op == '-' else node
+        return self.power()
+
+    def power(self):
+        node = self.atom()
+        if self.peek('**'):
+            self.i += 1
+            node = ('bin', '**', node, self.unary())
+        return node
+
+    def atom(self):
+        if self.i >= len(self.toks):
+            self.fail("unexpected end")
+        kind, val = self.toks[self.i]
+        self.i += 1
+        if kind == 'num':
+            return ('num', val)
+        if kind == 'name':
+            if not self.peek('('):
+                return ('var', val)
+            if val not in FUNCTIONS:
+                self.fail(f"unknown function {val!r}")
+            self.i += 1
+            args = [] if self.peek(')') else [self.or_()]
+            while self.peek(','):
+                self.i += 1
+                args.append(self.or_())
+            self.take(')')
+            if len(args) != FUNCTIONS[val][0]:
+                self.fail(f"{val}() takes {FUNCTIONS[val][0]} arguments, got {len(args)}")
+            return ('call', val, tuple(args))
+        if val == '(':
+            node = self.or_()
+            self.take(')')
+            return node
+        self.fail(f"unexpected {val!r}")
+
+
+def parse(src: str):
+    """Expression source -> AST (nested tuples); constant subtrees are folded."""
+    return _fold(_Parser(src).parse())
+
+
+def _fold(node):
+    kind = node[0]
+    if kind == 'bin':
+        a, b = _fold(node[2]), _fold(node[3])
+        if a[0] == b[0] == 'num':
+            return ('num', float(_BINARY[node[1]](a[1], b[1])))
+        return ('bin', node[1], a, b)
+    if kind in ('neg', 'not'):
+        a = _fold(node[1])
+        if a[0] == 'num':
+            return ('num', -a[1] if kind == 'neg' else float(not a[1]))
+        return (kind, a)
+    if kind == 'call':
+        return ('call', node[1], tuple(_fold(a) for a in node[2]))
+    return node
+
+
+def names(node) -> set:
+    """Free variable names of an AST."""
+    if node[0] == 'var':
+        return {node[1]}
+    if node[0] == 'bin':
+        return names(node[2]) | names(node[3])
+    if node[0] in ('neg', 'not'):
+        return names(node[1])
+    if node[0] == 'call':
+        return set().union(*(names(a) for a in node[2]))
+    return set()
+
+
+def compile_ast(node) -> Callable[[dict], Any]:
+    """AST -> f(env). env maps names to scalars or arrays; missing names read as 0."""
+    kind = node[0]
+    if kind == 'num':
+        v = node[1]
+        return lambda env: v
+    if kind == 'var':
+        name = node[1]
+        return lambda env: env.get(name, 0.0)
+    if kind == 'neg':
+        f = compile_ast(node[1])
+        return lambda env: -f(env)
+    if kind == 'not':
+        f = compile_ast(node[1])
+        return lambda env: np.logical_not(f(env))
+    if kind == 'bin':
+        op, fa, fb = _BINARY[node[1]], compile_ast(node[2]), compile_ast(node[3])
+        return lambda env: op(fa(env), fb(env))
+    if kind == 'call':
+        fn = FUNCTIONS[node[1]][1]
+        args = [compile_ast(a) for a in node[2]]
+        if len(args) == 1:
+            f0 = args[0]
+            return lambda env: fn(f0(env))
+        return lambda env: fn(*[f(env) for f in args])
+    raise ValueError(f"Bad AST node {node!r}")
+
+
+def compile_expr(src: str) -> Callable[[dict], Any]:
+    return compile_ast(parse(src))
+
+# ------------------------------
+# Rituals named by rules
+# ------------------------------
+_ACTION = re.compile(r"^\s*([A-Za-z_]\w*)\s*(?:\((.*)\))?\s*$")
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(s|sec|secs|seconds?|m|min|mins|minutes?)\b", re.I)
+
+
+@dataclass(frozen=True)
+class Action:
+    """A rule's ritual: `BREATH(60s)` -> Action('BREATH', '60s', 60.0)."""
+    name: str
+    args: str = ''
+    duration: Optional[float] = None   # seconds, when the arguments name one
+
+    @classmethod
+    def parse(cls, src: str) -> 'Action':
+        m = _ACTION.match(src)
+        if m is None:
+            raise ValueError(f"Cannot parse ritual {src!r}")
+        name, args = m.group(1).upper(), (m.group(2) or '').strip()
+        d = _DURATION.search(args)
+        duration = None if d is None else float(d.group(1)) * (60.0 if d.group(2).lower().startswith('m') else 1.0)
+        return cls(name, args, duration)
+
+# ------------------------------
+# Profiles
+# ------------------------------
+@dataclass
+class Profile:
+    """One compiled philosophy profile (see module docstring)."""
+    id: str
+    label: str
+    real_shifts: Dict[str, float]
+    complex_shifts: Dict[str, float]
+    delta_src: str
+    delta_ast: tuple
+    rules: Tuple[Tuple[str, tuple, Action], ...]      # (condition source, condition AST, action)
+    preferred: Tuple[str, ...] = ()
+    phase: Dict[str, Any] = field(default_factory=dict)
+    summary: str = ''
+
+    def __post_init__(self):
+        self._delta = compile_ast(self.delta_ast)
+        self._conds = [compile_ast(ast) for _, ast, _ in self.rules]
+        self.actions = tuple(a for _, _, a in self.rules)
+        # rule index -> engine ritual code (unknown rituals act as none); index -1 = no rule fired
+        self._codes = np.array([RC.get(a.name, RC['NONE']) for a in self.actions] + [RC['NONE']], dtype=np.intp)
+
+    # --- Δ ---
+    def delta(self, V, A):
+        """Vectorized Δ(V, A)."""
+        return self._delta({'V': V, 'A': A})
+
+    def delta_func(self, V, A) -> float:
+        return float(self._delta({'V': V, 'A': A}))
+
+    # --- Policy ---
+    def rule_index(self, env: dict, n: int = None) -> np.ndarray:
+        """Index of the first rule whose condition holds in env (per element), -1 if none."""
+        idx = np.full(() if n is None else n, -1, dtype=np.intp)
+        for j in range(len(self._conds) - 1, -1, -1):
+            idx = np.where(self._conds[j](env), j, idx)
+        return idx
+
+    def choose(self, env: dict) -> Optional[Action]:
+        """Scalar policy over an env of plain values: the Action to run, or None."""
+        for cond, action in zip(self._conds, self.actions):
+            if cond(env):
+                return action
+        return None
+
+    def policy_func(self, z, V, A, **ctx) -> str:
+        a = self.choose({'R': z.R, 'L': z.L, 'E': z.E, 'C': z.C, 'V': V, 'A': A, **ctx})
+        return 'NONE' if a is None else a.name
+
+    def policy_v(self, Z, V, A, **ctx) -> np.ndarray:
+        env = {'R': Z[:, 0], 'L': Z[:, 1], 'E': Z[:, 2], 'C': Z[:, 3], 'V': V, 'A': A, **ctx}
+        return self._codes[self.rule_index(env, len(Z))]
+
+    # --- RLEC twin ---
+    def params(self, base: Params = None) -> Params:
+        return shift_params(base or Params(), **self.real_shifts)
+
+    def school_spec(self) -> SchoolSpec:
+        """A SchoolSpec for DigitalTwin / TwinBatch / run_schools."""
+        return SchoolSpec(self.id, self.params, self.delta_func, self.policy_func, self.delta, self.policy_v)
+
+    # --- Complex agent ---
+    def complex_params(self, **base) -> dict:
+        """ComplexAgent keyword params (its defaults, or `base`) plus this profile's complex shifts."""
+        defaults = ComplexAgent().params
+        p = {k: base.get(k, defaults[k]) for k in COMPLEX_KEYS}
+        for k, v in self.complex_shifts.items():
+            p[k] = p[k] + v
+        return p
+
+    def complex_agent(self, name='self', psi1=0.2+0.1j, psi2=0.2+0.0j, **base) -> ComplexAgent:
+        return ComplexAgent(name, psi1=psi1, psi2=psi2, **self.complex_params(**base))
+
+    def apply_rituals(self, target, V=None, A=None, t: float = None, **ctx):
+        """
+        Run the rules on a ComplexAgent or ComplexPopulation and schedule the
+        chosen rituals (for the rule's duration, else DEFAULT_DURATION). The
+        readouts psi1 = (L - R) + iE, psi2 = C + iA give R / L as the negative /
+        positive part of Re(psi1). Returns the chosen ritual name per agent.
+        """
+        psi1, psi2 = np.atleast_1d(target.psi1), np.atleast_1d(target.psi2)
+        LR = psi1.real
+        env = {'R': np.maximum(-LR, 0.0), 'L': np.maximum(LR, 0.0), 'E': psi1.imag, 'C': psi2.real,
+               'V': np.tanh(1.0*psi1.real + 0.6*psi2.real - 0.8*psi1.imag) if V is None else V,
+               'A': np.abs(psi2) if A is None else A, **ctx}
+        idx = self.rule_index(env, len(psi1))
+        chosen = []
+        for i, j in enumerate(idx.tolist()):
+            if j < 0:
+                chosen.append('NONE')
+                continue
+            action = self.actions[j]
+            dur = DEFAULT_DURATION if action.duration is None else action.duration
+            if isinstance(target, ComplexPopulation):
+                target.ritual(action.name, i, duration=dur, t=t)
+            else:
+                target.ritual(action.name, target.t if t is None else t, duration=dur)
+            chosen.append(action.name)
+        return chosen
+
+# ------------------------------
+# Loading + cache
+# ------------------------------
+_CACHE: Dict[str, Dict[str, Profile]] = {}
+
+
+def parse_document(doc: dict) -> list:
+    """JSON document -> list of Profile constructor kwargs (plain data: ASTs, no closures)."""
+    base_delta = (doc.get('baseline') or {}).get('delta_mapping') or BASELINE_DELTA
+    out = []
+    for p in doc.get('profiles', []):
+        model = p.get('model', {})
+        shifts = model.get('param_shifts', {})
+        delta_src = model.get('delta_mapping') or base_delta
+        rules = []
+        for r in p.get('ritual_policy', {}).get('rules', []):
+            rules.append((r['if'], parse(r['if']), Action.parse(r['do'])))
+        out.append(dict(
+            id=p['id'], label=p.get('label', p['id']), summary=p.get('summary', ''),
+            # "" means engine default: no shift
+            real_shifts={k: float(v) for k, v in shifts.get('real', {}).items() if v != ''},
+            complex_shifts={k: float(v) for k, v in shifts.get('complex', {}).items() if v != ''},
+            delta_src=delta_src, delta_ast=parse(delta_src), rules=tuple(rules),
+            preferred=tuple(p.get('ritual_policy', {}).get('preferred', ())),
+            phase=dict(model.get('phase', {})),
+        ))
+    return out
+
+
+def _dump_parsed(parsed: list) -> str:
+    """parse_document output -> JSON (ASTs as nested lists, actions as [name, args, duration])."""
+    return json.dumps([dict(kw, rules=[[src, ast, [a.name, a.args, a.duration]] for src, ast, a in kw['rules']])
+                       for kw in parsed])
+
+
+def _tuples(x):
+    """Nested JSON lists -> the nested tuples of an AST."""
+    return tuple(_tuples(v) for v in x) if isinstance(x, list) else x
+
+
+def _load_parsed(text: str) -> list:
+    """Inverse of _dump_parsed (plain data only: nothing in the file is executed)."""
+    out = []
+    for kw in json.loads(text):
+        kw['delta_ast'] = _tuples(kw['delta_ast'])
+        kw['rules'] = tuple((src, _tuples(ast), Action(*act)) for src, ast, act in kw['rules'])
+        kw['preferred'] = tuple(kw['preferred'])
+        out.append(kw)
+    return out
+
+
+def load_profiles(path: str = DEFAULT_PATH, cache_dir: Optional[str] = None) -> Dict[str, Profile]:
+    """
+    Compiled profiles by id. Results are cached by the file's SHA-256: in memory
+    for the process, and (with cache_dir) as parsed ASTs in JSON for later
+    processes; an unreadable cache file is ignored and rewritten.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    key = hashlib.sha256(raw).hexdigest()
+    if key in _CACHE:
+        return _CACHE[key]
+
+    parsed = None
+    cache_file = os.path.join(cache_dir, f"profiles-{key[:32]}.json") if cache_dir else None
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, encoding='utf-8') as f:
+                parsed = _load_parsed(f.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            parsed = None
+    if parsed is None:
+        parsed = parse_document(json.loads(raw))
+        if cache_file:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(_dump_parsed(parsed))
+            os.replace(tmp, cache_file)
+
+    profiles = {kw['id']: Profile(**kw) for kw in parsed}
+    _CACHE[key] = profiles
+    return profiles
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from loveos_schools import TwinBatch
+
+    profiles = load_profiles()
+    print(f"{len(profiles)} profiles: {', '.join(profiles)}")
+
+    rng = np.random.default_rng(0)
+    Z0 = rng.uniform(0, 1, (1000, 4))
+    V, A = rng.uniform(-1, 1, 1000), rng.uniform(0, 1, 1000)
+    for prof in profiles.values():
+        tb = TwinBatch(prof.school_spec(), n=1000, z0=Z0)
+        hits = prof.rule_index({'R': Z0[:, 0], 'L': Z0[:, 1], 'E': Z0[:, 2], 'C': Z0[:, 3], 'V': V, 'A': A}, 1000)
+        tb.step(V, A)
+        agent = prof.complex_agent()
+        first = prof.choose({'R': 0.8, 'L': 0.2, 'E': 0.9, 'C': 0.4, 'V': -0.5, 'A': 0.8})
+        print(f"  {prof.id:<15} Δ(-0.5, 0.8) = {prof.delta_func(-0.5, 0.8):+.3f}  "
+              f"stressed state -> {first.name if first else 'NONE':<12} "
+              f"rule hits in a 1000-twin batch: {np.count_nonzero(hits >= 0):4d}  "
+              f"omega1 = {agent.params['omega1']:.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _CACHE.clear()
+        t0 = time.perf_counter(); load_profiles(cache_dir=tmp); t_cold = time.perf_counter() - t0
+        _CACHE.clear()
+        t0 = time.perf_counter(); load_profiles(cache_dir=tmp); t_disk = time.perf_counter() - t0
+        t0 = time.perf_counter(); load_profiles(cache_dir=tmp); t_mem = time.perf_counter() - t0
+    print(f"load: cold {t_cold*1e3:.2f} ms, disk cache {t_disk*1e3:.2f} ms, memory cache {t_mem*1e3:.3f} ms")
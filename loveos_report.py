@@ -0,0 +1,337 @@
+"""
+Love-OS Report Renderer
+-----------------------
+Headless batch plotting with figure reuse. Each report type is a Template:
+its Figure, axes, artists, legend and layout are built once per process on
+the Agg canvas (no pyplot, no GUI backend), and every render only swaps new
+data into the existing artists before saving.
+
+Templates:
+  'twin'     : DigitalTwin history (R/L/E/C, Δ bars, ritual markers)
+  'complex'  : complex dashboard run (amplitude, phase, synchrony, valence)
+  'tracker'  : LoveOSTracker recent logs (levels, Delta Z bars, Lock rate)
+
+Long series are min/max-decimated to about two points per pixel column, so
+drawing cost stays constant however many samples a run has.
+
+Usage:
+  python loveos_report.py      # 200 twin reports: fresh pyplot figures vs reused templates
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+import matplotlib.dates as mdates
+
+# ------------------------------
+# Decimation
+# ------------------------------
+
+def minmax_decimate(x, y, n_buckets: int):
+    """
+    Reduce (x, y) to the min and max sample of each of `n_buckets` equal
+    index buckets, kept in x order. The envelope a rasterized line shows at
+    n_buckets pixel columns is unchanged. Short series pass through.
+    """
+    n = len(y)
+    if n <= 2*n_buckets:
+        return x, y
+    k = -(-n // n_buckets)     # bucket size, rounded up so the leftover is shorter than one bucket
+    nb = n // k
+    m = nb*k
+    blocks = y[:m].reshape(nb, k)
+    base = np.arange(nb)[:, None]*k
+    idx = np.concatenate([np.argmin(blocks, axis=1)[:, None], np.argmax(blocks, axis=1)[:, None]], axis=1) + base
+    idx.sort(axis=1)
+    idx = idx.ravel()
+    if m < n:   # leftover samples form one more (short) bucket
+        tail = y[m:]
+        idx = np.concatenate([idx, np.sort([m + int(np.argmin(tail)), m + int(np.argmax(tail))])])
+    return x[idx], y[idx]
+
+
+def _bars(x, h, width):
+    """(n, 4, 2) rectangle vertices for bars of height h centred on x."""
+    x = np.asarray(x, dtype=float); h = np.asarray(h, dtype=float)
+    v = np.empty((len(x), 4, 2))
+    v[:, 0, 0] = v[:, 1, 0] = x - width/2
+    v[:, 2, 0] = v[:, 3, 0] = x + width/2
+    v[:, 0, 1] = v[:, 3, 1] = 0.0
+    v[:, 1, 1] = v[:, 2, 1] = h
+    return v
+
+# ------------------------------
+# Templates
+# ------------------------------
+
+class Template:
+    """A figure layout built once; render() only updates artist data."""
+    size = (10, 6)
+    dpi = 100
+    png_compress = 1    # zlib level: PNG encoding is a large share of a render at the default 6
+
+    def __init__(self):
+        self.fig = Figure(figsize=self.size, dpi=self.dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.build(self.fig)
+        self.fig.tight_layout(**self.layout_kw())   # layout is computed once, not per report
+        self.fig.set_layout_engine('none')            # ...and savefig must not redo it (extra draw)
+
+    def layout_kw(self) -> dict:
+        return {}
+
+    @property
+    def width_px(self) -> int:
+        return int(self.fig.get_figwidth()*self.dpi)
+
+    def set_line(self, line, x, y):
+        x, y = minmax_decimate(np.asarray(x), np.asarray(y, dtype=float), self.width_px)
+        line.set_data(x, y)
+
+    def build(self, fig):
+        raise NotImplementedError
+
+    def update(self, data):
+        raise NotImplementedError
+
+    def render(self, data, path, dpi=None):
+        self.update(data)
+        kw = {'pil_kwargs': {'compress_level': self.png_compress}} if str(path).lower().endswith('.png') else {}
+        self.fig.savefig(path, dpi=dpi or self.dpi, **kw)
+        return path
+
+
+class TwinTemplate(Template):
+    """DigitalTwin.plot_history. data: columns Turn, R, L, E, C, Delta, Ritual and 'School'."""
+    size = (10, 6)
+    max_labels = 64
+
+    def build(self, fig):
+        ax = self.ax = fig.add_subplot(1, 1, 1)
+        self.lines = {
+            'R': ax.plot([], [], label='R (Resistance)', color='red', linewidth=2)[0],
+            'L': ax.plot([], [], label='L (Love)', color='green', linewidth=2)[0],
+            'E': ax.plot([], [], label='E (Ego)', color='purple', linewidth=2)[0],
+            'C': ax.plot([], [], label='C (Control)', color='blue', linewidth=2)[0],
+        }
+        self.bars = PolyCollection([], facecolors='gray', alpha=0.15, label='Delta (Input)')
+        ax.add_collection(self.bars)
+        # Mark rituals
+        self.marks = LineCollection([], colors='orange', linestyles=':', alpha=0.6)
+        ax.add_collection(self.marks)
+        self.labels = [ax.text(0, 2.5, '', rotation=90, fontsize=8, color='orange', ha='right', visible=False)
+                       for _ in range(self.max_labels)]
+        ax.set_ylim(-2.5, 3.5)
+        ax.set_xlabel("Time (Turns)")
+        ax.set_ylabel("Internal State (z)")
+        ax.legend(loc='upper left')
+        self.title = ax.set_title("Love-OS Dynamics: Model")
+
+    def update(self, data):
+        turns = np.asarray(data['Turn'], dtype=float)
+        for k, line in self.lines.items():
+            self.set_line(line, turns, data[k])
+        self.bars.set_verts(_bars(turns, data['Delta'], 0.8))
+        rituals = np.asarray(data['Ritual'])
+        marked = np.flatnonzero(rituals != 'NONE')
+        self.marks.set_segments([[(turns[i], -2.5), (turns[i], 3.5)] for i in marked])
+        for j, lab in enumerate(self.labels):
+            if j < len(marked):
+                i = marked[j]
+                lab.set_position((turns[i], 2.5)); lab.set_text(str(rituals[i])); lab.set_visible(True)
+            else:
+                lab.set_visible(False)
+        self.title.set_text(f"Love-OS Dynamics: {data['School']} Model")
+        if len(turns):
+            self.ax.set_xlim(turns.min() - 0.6, turns.max() + 0.6)
+
+
+class DashboardTemplate(Template):
+    """Complex dashboard (simulate). data: the per-step columns written by simulate()."""
+    size = (12, 8)
+
+    def layout_kw(self):
+        return {'rect': [0, 0, 1, 0.96]}
+
+    def build(self, fig):
+        gs = fig.add_gridspec(2, 2)
+        L = self.lines = {}
+
+        # (1) Amplitude
+        ax1 = fig.add_subplot(gs[0, 0])
+        for key, label, color in (('psi1_abs_self', '|psi1| self', '#2ca02c'), ('psi1_abs_other', '|psi1| other', '#98df8a'),
+                                  ('psi2_abs_self', '|psi2| self', '#1f77b4'), ('psi2_abs_other', '|psi2| other', '#aec7e8')):
+            L[key] = ax1.plot([], [], label=label, color=color)[0]
+        ax1.set_title('Amplitude (Integration/Ego & Control/Arousal)')
+        ax1.set_ylabel('Amplitude')
+        ax1.legend(fontsize=8); ax1.grid(alpha=0.3)
+
+        # (2) Phase (wrapped)
+        ax2 = fig.add_subplot(gs[0, 1])
+        L['phi1_self'] = ax2.plot([], [], label='phase psi1 self', color='#d62728')[0]
+        L['phi1_other'] = ax2.plot([], [], label='phase psi1 other', color='#ff9896')[0]
+        ax2.set_title('Phase (psi1)'); ax2.set_ylabel('rad')
+        ax2.legend(fontsize=8); ax2.grid(alpha=0.3)
+
+        # (3) Kuramoto R and Delta
+        ax3 = fig.add_subplot(gs[1, 0])
+        L['R_kuramoto'] = ax3.plot([], [], label='Kuramoto R (sync)', color='#bcbd22')[0]
+        L['Delta'] = ax3.plot([], [], drawstyle='steps-mid', label='Delta (scaled)', color='black')[0]
+        ax3.set_title('Synchrony & Stress'); ax3.set_ylabel('R / scaled Δ'); ax3.set_xlabel('time [s]')
+        ax3.legend(fontsize=8); ax3.grid(alpha=0.3)
+
+        # (4) Valence & Arousal (self)
+        ax4 = fig.add_subplot(gs[1, 1])
+        L['V_self'] = ax4.plot([], [], label='Valence self', color='#17becf')[0]
+        L['A_self'] = ax4.plot([], [], label='Arousal self (scaled)', color='#7f7f7f')[0]
+        ax4.set_title('Valence & Arousal (self)'); ax4.set_xlabel('time [s]')
+        ax4.legend(fontsize=8); ax4.grid(alpha=0.3)
+
+        self.axes = (ax1, ax2, ax3, ax4)
+        fig.suptitle('Love-OS Complex Digital Twin — Amplitude / Phase / Synchrony', fontsize=12)
+
+    def update(self, data):
+        t = np.asarray(data['t'])
+        for key, line in self.lines.items():
+            y = np.asarray(data[key], dtype=float)
+            if key == 'Delta':
+                y = y/max(1.0, np.max(y))
+            elif key == 'A_self':
+                y = y/max(1e-6, np.max(y))
+            self.set_line(line, t, y)
+        for ax in self.axes:
+            ax.relim(); ax.autoscale_view()
+
+
+class TrackerTemplate(Template):
+    """LoveOSTracker weekly trends. data: Datetime, R, Omega, Z_pre, Delta_Z columns and 'lock_rate' (%)."""
+    size = (10, 8)
+
+    def build(self, fig):
+        ax1 = fig.add_subplot(2, 1, 1)
+        ax2 = fig.add_subplot(2, 1, 2, sharex=ax1)
+        self.ax1, self.ax2 = ax1, ax2
+
+        # Top subplot: Trends of R, Omega, Z_pre
+        self.lines = {
+            'R': ax1.plot([], [], marker='o', label='R (Resource)', color='blue')[0],
+            'Omega': ax1.plot([], [], marker='x', label='Omega (Noise)', color='red')[0],
+            'Z_pre': ax1.plot([], [], marker='s', label='Z (Alignment)', color='green')[0],
+        }
+        ax1.set_ylabel('Level (1-5)')
+        ax1.set_title('LoveOS 6D Phase Space Dynamics')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+
+        # Bottom subplot: Delta Z (Intervention effect) and Lock state
+        self.bars = PolyCollection([], alpha=0.6, label='Delta Z (Post-MIRROR)', facecolors='red')
+        ax2.add_collection(self.bars)
+        ax2.axhline(0, color='black', linewidth=1)
+        ax2.set_ylabel('Delta Z (Target < 0)')
+        self.title = ax2.set_title('MIRROR-30 Efficacy & Lock Rate: 0.0%')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+
+        ax1.xaxis_date()
+        ax2.tick_params(axis='x', labelrotation=45)
+
+    def update(self, data):
+        x = mdates.date2num(np.asarray(data['Datetime'], dtype='datetime64[ns]').astype('datetime64[us]').astype(object))
+        for k, line in self.lines.items():
+            line.set_data(x, np.asarray(data[k], dtype=float))
+        dz = np.asarray(data['Delta_Z'], dtype=float)
+        self.bars.set_verts(_bars(x, dz, 0.8))
+        self.bars.set_facecolor(['red' if val > 0 else 'blue' for val in dz])
+        self.title.set_text(f"MIRROR-30 Efficacy & Lock Rate: {data['lock_rate']:.1f}%")
+        for ax in (self.ax1, self.ax2):
+            ax.relim(); ax.autoscale_view()
+
+
+TEMPLATES = {'twin': TwinTemplate, 'complex': DashboardTemplate, 'tracker': TrackerTemplate}
+
+# ------------------------------
+# Rendering
+# ------------------------------
+_BUILT = {}   # template name -> instance (one per process)
+
+
+def get_template(name: str) -> Template:
+    if name not in _BUILT:
+        try:
+            _BUILT[name] = TEMPLATES[name]()
+        except KeyError:
+            raise ValueError(f"Unknown report template: {name!r} (choose from {sorted(TEMPLATES)})") from None
+    return _BUILT[name]
+
+
+def render(name: str, data, path: str, dpi=None) -> str:
+    """Render one report with the (cached) template `name`."""
+    return get_template(name).render(data, path, dpi=dpi)
+
+
+def _render_job(job):
+    return render(*job)
+
+
+def render_many(jobs, processes=None, chunksize: int = 8):
+    """
+    Render (template, data, path[, dpi]) jobs. With `processes`, jobs are spread
+    over a process pool; every worker builds each template once and reuses it.
+    Returns the output paths in job order.
+    """
+    jobs = list(jobs)
+    if processes and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            return list(pool.map(_render_job, jobs, chunksize=chunksize))
+    return [_render_job(job) for job in jobs]
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    n = 200
+    rng = np.random.default_rng(0)
+    turns = np.arange(40)
+    reports = [{'Turn': turns, 'School': f'user{i}',
+                **{k: np.cumsum(rng.standard_normal(40))*0.2 for k in 'RLEC'},
+                'Delta': rng.standard_normal(40),
+                'Ritual': np.where(rng.random(40) < 0.1, 'BREATH', 'NONE')} for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for i, d in enumerate(reports):
+            fig, ax = plt.subplots(figsize=(10, 6))
+            for k in 'RLEC':
+                ax.plot(d['Turn'], d[k], linewidth=2)
+            ax.bar(d['Turn'], d['Delta'], alpha=0.15, color='gray')
+            plt.tight_layout()
+            fig.savefig(os.path.join(tmp, f'fresh{i}.png'))
+            plt.close(fig)
+        t_fresh = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        render_many(('twin', d, os.path.join(tmp, f'twin{i}.png')) for i, d in enumerate(reports))
+        t_reuse = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        render_many((('twin', d, os.path.join(tmp, f'pool{i}.png')) for i, d in enumerate(reports)),
+                    processes=os.cpu_count())
+        t_pool = time.perf_counter() - t0
+    print(f"--- {n} twin reports ---")
+    print(f"fresh figures : {t_fresh:6.2f}s")
+    print(f"reused        : {t_reuse:6.2f}s")
+    print(f"pool ({os.cpu_count()} procs): {t_pool:6.2f}s")
+
+    x = np.linspace(0, 1000, 2_000_000)
+    y = np.sin(x) + 0.1*rng.standard_normal(x.size)
+    xd, yd = minmax_decimate(x, y, 1000)
+    print(f"decimated {x.size:,} -> {xd.size:,} points, envelope kept: {yd.min() == y.min() and yd.max() == y.max()}")
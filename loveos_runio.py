@@ -0,0 +1,341 @@
+"""
+Love-OS Run I/O
+---------------
+Shared writer / reader for simulation outputs: a set of equal-length named
+columns, streamed to disk chunk by chunk while the run progresses.
+
+Formats (picked from the path extension unless given):
+
+  'raw'     : directory with one raw binary file per column plus header.json
+              (dtype, length, categories, attrs); the fastest to write and
+              memory-mappable as-is. Any path without a known extension.
+  'npz'     : NumPy .npz archive (uncompressed). Columns are spooled to disk
+              during the run and zipped at close; np.load() reads it as usual,
+              open_run() memory-maps the members in place.
+  'parquet' : one row group per chunk (needs pyarrow).
+  'csv'     : plain CSV, for compatibility with the old outputs.
+
+String columns (e.g. ritual names) are stored as int32 codes plus a list of
+categories in the binary formats; RunData decodes them on access.
+
+Usage:
+  python loveos_runio.py      # write / read timing of a 1M-row run per format
+"""
+
+import json
+import os
+import shutil
+import struct
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ('raw', 'npz', 'parquet', 'csv')
+_EXT = {'.npz': 'npz', '.parquet': 'parquet', '.csv': 'csv'}
+HEADER = 'header.json'
+
+
+def infer_format(path: str) -> str:
+    return _EXT.get(os.path.splitext(path)[1].lower(), 'raw')
+
+# ------------------------------
+# Writer
+# ------------------------------
+
+def _clear_run_dir(d: str):
+    """Create `d`, replacing it only if it is empty or a previous run (has a header.json)."""
+    if os.path.isdir(d):
+        if os.listdir(d) and not os.path.exists(os.path.join(d, HEADER)):
+            raise FileExistsError(f"{d!r} exists and is not a Love-OS run directory; not overwriting it")
+        shutil.rmtree(d)
+    elif os.path.exists(d):
+        raise FileExistsError(f"{d!r} exists and is not a directory")
+    os.makedirs(d)
+
+
+class RunWriter:
+    """
+    Streaming column writer.
+      write(chunk)  : dict of equal-length arrays (one chunk of rows)
+      append(row)   : one row dict; rows are buffered and written every `chunk_rows`
+      close()       : flush and finalize (also on leaving a `with` block)
+    Column order and dtypes are fixed by the first chunk.
+    """
+    def __init__(self, path: str, fmt: str = None, attrs: dict = None, chunk_rows: int = 4096):
+        self.path = path
+        self.fmt = fmt or infer_format(path)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown run format: {self.fmt!r} (choose from {FORMATS})")
+        self.attrs = dict(attrs or {})
+        self.chunk_rows = chunk_rows
+        self.length = 0
+        self.columns = None        # name -> dtype (codes dtype for string columns)
+        self._cats = {}            # string column -> {value: code}
+        self._rows = []
+        self._files = {}
+        self._pq = None
+        self._csv = None
+        self.closed = False
+        if self.fmt == 'raw':
+            self._dir = path
+        elif self.fmt == 'npz':
+            self._dir = path + '.spool'
+        if self.fmt in ('raw', 'npz'):
+            _clear_run_dir(self._dir)
+            self._write_header()   # marks the directory as a run, so a later run may replace it
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, row: dict):
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_rows:
+            self._flush_rows()
+
+    def _flush_rows(self):
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self.write({k: [r[k] for r in rows] for k in rows[0]})
+
+    def write(self, chunk: dict):
+        """Append one chunk of rows given as {column: values}."""
+        cols = {}
+        for k, v in chunk.items():
+            a = np.asarray(v)
+            cols[k] = a.reshape(1) if a.ndim == 0 else a
+        if self.columns is None:
+            self._start(cols)
+        n = len(next(iter(cols.values())))
+        if any(len(cols[k]) != n for k in self.columns):
+            raise ValueError("All columns of a chunk must have the same length")
+        enc = {k: self._encode(k, cols[k]) for k in self.columns}
+
+        if self.fmt in ('raw', 'npz'):
+            for k, a in enc.items():
+                self._files[k].write(np.ascontiguousarray(a).tobytes())
+        elif self.fmt == 'parquet':
+            self._write_parquet(cols)
+        else:
+            pd.DataFrame(cols).to_csv(self._csv, header=self.length == 0, index=False)
+        self.length += n
+        if self.fmt == 'raw':
+            for f in self._files.values():
+                f.flush()
+            self._write_header()   # readers can map a run that is still in progress
+
+    def _start(self, cols):
+        self.columns = {}
+        for k, a in cols.items():
+            if a.dtype.kind in 'OUS':
+                self._cats[k] = {}
+                self.columns[k] = np.dtype(np.int32)
+            else:
+                self.columns[k] = a.dtype
+        if self.fmt in ('raw', 'npz'):
+            self._names = {k: f"{i:03d}.bin" for i, k in enumerate(self.columns)}
+            self._files = {k: open(os.path.join(self._dir, self._names[k]), 'wb') for k in self.columns}
+        elif self.fmt == 'csv':
+            self._csv = open(self.path, 'w', newline='')
+
+    def _encode(self, k, a):
+        if k in self._cats:
+            cats = self._cats[k]
+            return np.fromiter((cats.setdefault(v, len(cats)) for v in a.tolist()), dtype=np.int32, count=len(a))
+        return a.astype(self.columns[k], copy=False)
+
+    def _write_parquet(self, cols):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({k: pa.array(cols[k].tolist() if k in self._cats else cols[k]) for k in self.columns})
+        if self._pq is None:
+            meta = {b'loveos_attrs': json.dumps(self.attrs).encode()}
+            self._pq = pq.ParquetWriter(self.path, table.schema.with_metadata(meta))
+        self._pq.write_table(table.replace_schema_metadata(self._pq.schema.metadata))
+
+    def _header(self) -> dict:
+        return {
+            'version': 1, 'length': self.length, 'attrs': self.attrs,
+            'columns': {k: {'dtype': dt.str, 'file': self._names[k],
+                            **({'categories': list(self._cats[k])} if k in self._cats else {})}
+                        for k, dt in (self.columns or {}).items()},
+        }
+
+    def _write_header(self):
+        tmp = os.path.join(self._dir, HEADER + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._header(), f)
+        os.replace(tmp, os.path.join(self._dir, HEADER))
+
+    def close(self):
+        if self.closed:
+            return
+        self._flush_rows()
+        self.closed = True
+        for f in self._files.values():
+            f.close()
+        if self.fmt == 'raw':
+            self._write_header()
+        elif self.fmt == 'npz':
+            self._assemble_npz()
+        elif self.fmt == 'parquet' and self._pq is not None:
+            self._pq.close()
+        elif self._csv is not None:
+            self._csv.close()
+
+    def _assemble_npz(self):
+        """Zip the spooled columns into an uncompressed .npz, streaming each one."""
+        tmp = self.path + '.tmp'
+        with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for k, dt in (self.columns or {}).items():
+                with zf.open(f"{k}.npy", 'w', force_zip64=True) as out:
+                    np.lib.format.write_array_header_2_0(
+                        out, {'descr': np.lib.format.dtype_to_descr(dt), 'fortran_order': False,
+                              'shape': (self.length,)})
+                    with open(os.path.join(self._dir, self._names[k]), 'rb') as src:
+                        shutil.copyfileobj(src, out, 1 << 20)
+                if k in self._cats:
+                    _zip_array(zf, f"{k}.categories", np.array(list(self._cats[k]), dtype=str))
+            _zip_array(zf, "__attrs__", np.array(json.dumps(self.attrs)))
+        os.replace(tmp, self.path)
+        shutil.rmtree(self._dir)
+
+
+def _zip_array(zf, name, arr):
+    with zf.open(f"{name}.npy", 'w', force_zip64=True) as out:
+        np.lib.format.write_array(out, arr, allow_pickle=False)
+
+# ------------------------------
+# Reader
+# ------------------------------
+
+class RunData:
+    """
+    A stored run. Indexing by column name returns an array: memory-mapped for
+    raw / npz (no parsing, pages load on first touch), decoded from codes for
+    string columns.
+    """
+    def __init__(self, columns: dict, categories: dict = None, attrs: dict = None):
+        self._cols = columns
+        self.categories = categories or {}
+        self.attrs = attrs or {}
+
+    def keys(self):
+        return list(self._cols)
+
+    def __contains__(self, name):
+        return name in self._cols
+
+    def __getitem__(self, name) -> np.ndarray:
+        a = self._cols[name]
+        if name in self.categories:
+            return self.categories[name][a]
+        return a
+
+    def codes(self, name) -> np.ndarray:
+        """Raw int32 codes of a string column (see .categories[name])."""
+        return self._cols[name]
+
+    def __len__(self):
+        return len(next(iter(self._cols.values()))) if self._cols else 0
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({k: self[k] for k in self._cols})
+
+
+def open_run(path: str, fmt: str = None) -> RunData:
+    """Open a run written by RunWriter (or any CSV)."""
+    fmt = fmt or infer_format(path)
+    if fmt == 'raw':
+        with open(os.path.join(path, HEADER), encoding='utf-8') as f:
+            hdr = json.load(f)
+        n = hdr['length']
+        cols, cats = {}, {}
+        for k, c in hdr['columns'].items():
+            dt = np.dtype(c['dtype'])
+            fn = os.path.join(path, c['file'])
+            # empty files cannot be mapped
+            cols[k] = np.memmap(fn, dtype=dt, mode='r', shape=(n,)) if n else np.empty(0, dtype=dt)
+            if 'categories' in c:
+                cats[k] = np.array(c['categories'], dtype=str)
+        return RunData(cols, cats, hdr.get('attrs'))
+    if fmt == 'npz':
+        return _open_npz(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, memory_map=True)
+        meta = table.schema.metadata or {}
+        attrs = json.loads(meta.get(b'loveos_attrs', b'{}'))
+        return RunData({k: table.column(k).to_numpy() for k in table.column_names}, attrs=attrs)
+    df = pd.read_csv(path, float_precision='round_trip')
+    return RunData({k: df[k].to_numpy() for k in df.columns})
+
+
+def _open_npz(path: str) -> RunData:
+    cols, cats, attrs = {}, {}, {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            name = info.filename[:-4]
+            if name == '__attrs__':
+                attrs = json.loads(str(np.load(zf.open(info.filename))))
+                continue
+            if name.endswith('.categories'):
+                cats[name[:-11]] = np.load(zf.open(info.filename))
+                continue
+            if info.compress_type != zipfile.ZIP_STORED:
+                cols[name] = np.load(zf.open(info.filename))
+                continue
+            # Stored member: map the array bytes in place
+            f.seek(info.header_offset)
+            local = f.read(30)
+            name_len, extra_len = struct.unpack('<HH', local[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            shape, fortran, dtype = (np.lib.format.read_array_header_1_0(f) if version == (1, 0)
+                                     else np.lib.format.read_array_header_2_0(f))
+            if dtype.hasobject or not np.prod(shape):
+                cols[name] = np.empty(shape, dtype=dtype)
+                continue
+            cols[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                   order='F' if fortran else 'C')
+    return RunData(cols, cats, attrs)
+
+
+def save_run(path: str, columns: dict, fmt: str = None, attrs: dict = None):
+    """Write a complete set of columns in one go."""
+    with RunWriter(path, fmt=fmt, attrs=attrs) as w:
+        w.write(columns)
+    return path
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    n, chunk = 1_000_000, 65_536
+    rng = np.random.default_rng(0)
+    cols = {'t': np.arange(n)*0.001, **{f"x{j}": rng.standard_normal(n) for j in range(8)},
+            'Ritual': np.array(['NONE', 'BREATH', 'LABEL'])[rng.integers(0, 3, n)]}
+    print(f"--- {n:,} rows x {len(cols)} columns, streamed in chunks of {chunk:,} ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, name in (('raw', 'run'), ('npz', 'run.npz'), ('parquet', 'run.parquet'), ('csv', 'run.csv')):
+            if fmt == 'parquet':
+                try:
+                    import pyarrow
+                except ImportError:
+                    print(f"{fmt:>8}: skipped (pyarrow not installed)")
+                    continue
+            path = os.path.join(tmp, name)
+            t0 = time.perf_counter()
+            with RunWriter(path) as w:
+                for s in range(0, n, chunk):
+                    w.write({k: v[s:s + chunk] for k, v in cols.items()})
+            t1 = time.perf_counter()
+            run = open_run(path)
+            x = run['x3']
+            t2 = time.perf_counter()
+            ok = np.array_equal(x, cols['x3']) and np.array_equal(run['Ritual'], cols['Ritual'])
+            print(f"{fmt:>8}: write {t1 - t0:6.2f}s  open {1e3*(t2 - t1):8.1f}ms  round-trip {'OK' if ok else 'MISMATCH'}")
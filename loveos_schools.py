@@ -1,10 +1,17 @@
-import math
 import csv
 import copy
 import random
-import matplotlib.pyplot as plt
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field, replace
 
+import numpy as np
+
+from loveos_engine import RLECEngine
+from loveos_integrators import PARAM_KEYS, bind_integrator, param_tuple
+from loveos_report import render
+from loveos_runio import save_run
+
 # ==========================================
 # 0) Core Physics (Love-OS ODE Kernel)
 # ==========================================
@@ -30,29 +37,17 @@ class RLEC:
     dt: float = 0.5
     steps: int = 5
     p: Params = field(default_factory=Params)
+    integrator: str = 'fused' # 'fused' | 'euler' | 'rk4' | 'rk45'
 
     def step(self, delta, uL=0.0, uC=0.0, uE=0.0):
-        # Euler Integration (Neural ODE approximation)
-        for _ in range(self.steps):
-            R, L, E, C = self.R, self.L, self.E, self.C
-            p = self.p
-            
-            # The Unified Equation of Emotion
-            dR = p.aR*delta - p.bR*L*R - p.gR*C*R
-            dL = p.aL*C - p.bL*E*R - p.dL*L + uL
-            dE = p.aE*abs(delta) - p.bE*L - p.dE*E + uE
-            dC = -p.aC*R + p.bC*L - p.dC*C + uC
-
-            self.R = clamp(self.R + (self.dt/self.steps)*dR, -2.0, 3.0)
-            self.L = clamp(self.L + (self.dt/self.steps)*dL, -2.0, 3.0)
-            self.E = clamp(self.E + (self.dt/self.steps)*dE, -2.0, 3.0)
-            self.C = clamp(self.C + (self.dt/self.steps)*dC, -2.0, 3.0)
+        # Time Integration (Euler micro-steps by default, clipped to [-2, 3])
+        self.R, self.L, self.E, self.C = ENGINE.turn(
+            (self.R, self.L, self.E, self.C), self.p, delta, u=(uL, uC, uE),
+            dt=self.dt, steps=self.steps, integrator=bind_integrator(self, self.integrator))
 
     def observe(self):
         """Map internal state to Valence/Arousal"""
-        val = math.tanh(1.0*(-self.R) + 0.8*self.L - 1.0*self.E + 0.7*self.C)
-        aro = math.log1p(math.exp(0.5*abs(self.R) + 0.5*self.E))
-        return val, aro
+        return ENGINE.observe(self.R, self.L, self.E, self.C)
 
 # ==========================================
 # 1) School Specifications (The Unified Ontology)
@@ -71,11 +66,21 @@ RITUALS = {
     'AUTONOMY':   {'uL':0.1,  'uC':+0.4,  'uE':0.0,   'd_scale':0.9}, # SDT
     'NONE':       {'uL':0.0,  'uC':0.0,   'uE':0.0,   'd_scale':1.0},
 }
+ENGINE = RLECEngine(-2.0, 3.0, RITUALS)
+
+# Dense form for vectorized specs: policies return integer codes, rows of
+# RITUAL_TABLE hold (uL, uC, uE, d_scale); code 0 is "no ritual".
+RC = ENGINE.codes
+RITUAL_TABLE = ENGINE.table
+RITUAL_NAMES = np.array(['NONE' if n is None else n for n in ENGINE.names], dtype=object)
 
 def delta_basic(V, A): 
     # Basic mapping from Valence/Arousal to Prediction Error (Delta)
     return clamp(0.8*A - 0.6*V, -1.5, 1.5)
 
+def delta_basic_v(V, A):
+    return np.clip(0.8*np.asarray(A) - 0.6*np.asarray(V), -1.5, 1.5)
+
 def shift_params(base: Params, **kwargs):
     new_p = replace(base)
     for k, v in kwargs.items():
@@ -83,12 +88,37 @@ def shift_params(base: Params, **kwargs):
             setattr(new_p, k, getattr(new_p, k) + v)
     return new_p
 
+# What a scalar policy sees of one batch row (policies only read z.R / z.L / z.E / z.C)
+StateView = namedtuple('StateView', 'R L E C')
+
+def vector_delta(delta_func):
+    """Adapter: apply a scalar delta map elementwise to arrays of (V, A)."""
+    def delta_v(V, A):
+        V, A = np.broadcast_arrays(np.asarray(V, dtype=float), np.asarray(A, dtype=float))
+        out = np.fromiter(map(delta_func, V.ravel().tolist(), A.ravel().tolist()), dtype=float, count=V.size)
+        return out.reshape(V.shape)
+    return delta_v
+
+def vector_policy(policy_func):
+    """Adapter: call a scalar policy per row of Z (N, 4) and return ritual codes."""
+    def policy_v(Z, V, A):
+        names = [policy_func(StateView(*z), v, a) for z, v, a in zip(Z.tolist(), V.tolist(), A.tolist())]
+        return ENGINE.ritual_codes(names, len(Z))
+    return policy_v
+
 class SchoolSpec:
-    def __init__(self, name, param_shifter, delta_func, policy_func):
+    """
+    delta_func(V, A) -> Δ and policy_func(z, V, A) -> ritual name work on one twin.
+    delta_v(V, A) -> Δ array and policy_v(Z, V, A) -> ritual code array work on a
+    batch (Z is (N, 4): R, L, E, C columns); missing ones wrap the scalar forms.
+    """
+    def __init__(self, name, param_shifter, delta_func, policy_func, delta_v=None, policy_v=None):
         self.name = name
         self.param_shifter = param_shifter
         self.delta_func = delta_func
         self.policy_func = policy_func
+        self.delta_v = delta_v or vector_delta(delta_func)
+        self.policy_v = policy_v or vector_policy(policy_func)
 
 # --- The 8 Schools of Psychology implemented as Math ---
 
@@ -97,72 +127,185 @@ class SchoolSpec:
 def cbt_p(p): return shift_params(p, bR=+0.1, aL=+0.1, bC=+0.1, dE=+0.05, aE=-0.1)
 def cbt_d(V,A): return 0.95 * delta_basic(V,A)
 def cbt_pol(z,V,A): return 'REAPPRAISE' if z.R > 0.7 else 'NONE'
+def cbt_dv(V,A): return 0.95 * delta_basic_v(V,A)
+def cbt_pv(Z,V,A): return np.where(Z[:,0] > 0.7, RC['REAPPRAISE'], RC['NONE'])
 
 # 2. ACT (Acceptance & Commitment Therapy)
 # Focus: Psychological Flexibility. Accepting Ego/R, moving with Values (C).
 def act_p(p): return shift_params(p, aL=+0.1, aC=+0.1, aE=-0.1)
 def act_d(V,A): return 0.90 * delta_basic(V,A)
 def act_pol(z,V,A): return 'ACT' if z.E > 0.8 else 'NONE'
+def act_dv(V,A): return 0.90 * delta_basic_v(V,A)
+def act_pv(Z,V,A): return np.where(Z[:,2] > 0.8, RC['ACT'], RC['NONE'])
 
 # 3. Psychodynamic (Psychoanalysis)
 # Focus: Insight. Slow dynamics. Resolving R and E deep down.
 def dyn_p(p): return shift_params(p, dL=-0.02, dE=-0.02, bE=-0.1)
 def dyn_d(V,A): return delta_basic(V,A)
 def dyn_pol(z,V,A): return 'INTERPRET' if (z.R>0.6 and z.E>0.6) else 'NONE'
+def dyn_dv(V,A): return delta_basic_v(V,A)
+def dyn_pv(Z,V,A): return np.where((Z[:,0]>0.6) & (Z[:,2]>0.6), RC['INTERPRET'], RC['NONE'])
 
 # 4. Attachment Theory
 # Focus: Secure Base. Love (L) regulates Exploration (C) and Fear (E).
 def att_p(p): return shift_params(p, bC=+0.1, bR=+0.1, aE=-0.2)
 def att_d(V,A): return 0.85 * delta_basic(V,A)
 def att_pol(z,V,A): return 'RELATEDNESS' if z.R > 0.6 else 'NONE'
+def att_dv(V,A): return 0.85 * delta_basic_v(V,A)
+def att_pv(Z,V,A): return np.where(Z[:,0] > 0.6, RC['RELATEDNESS'], RC['NONE'])
 
 # 5. Mindfulness / Compassion
 # Focus: Non-reactivity. Ego (E) suppression, high Love (L).
 def min_p(p): return shift_params(p, aE=-0.2, dE=+0.1, bE=+0.1)
 def min_d(V,A): return 0.80 * delta_basic(V,A)
 def min_pol(z,V,A): return 'BREATH' if z.E>0.6 else ('COMPASSION' if z.R>0.6 else 'NONE')
+def min_dv(V,A): return 0.80 * delta_basic_v(V,A)
+def min_pv(Z,V,A): return np.where(Z[:,2]>0.6, RC['BREATH'], np.where(Z[:,0]>0.6, RC['COMPASSION'], RC['NONE']))
 
 # 6. Behavioral / RL
 # Focus: Exposure. High Control (C), driven by Arousal.
 def beh_p(p): return shift_params(p, aC=+0.2, bC=+0.1)
 def beh_d(V,A): return 0.95 * (1.0*A - 0.4*V) 
 def beh_pol(z,V,A): return 'EXPOSURE' if z.E > 0.7 else 'NONE'
+def beh_dv(V,A): return 0.95 * (1.0*np.asarray(A) - 0.4*np.asarray(V))
+def beh_pv(Z,V,A): return np.where(Z[:,2] > 0.7, RC['EXPOSURE'], RC['NONE'])
 
 # 7. Predictive Processing
 # Focus: Error Minimization. Very sensitive to R (Prediction Error).
 def pp_p(p): return shift_params(p, aR=+0.2, bR=+0.1, aL=+0.1)
 def pp_d(V,A): return clamp(1.1*A - 0.8*V, -1.5, 1.5)
 def pp_pol(z,V,A): return 'REAPPRAISE' if z.R > 0.8 else 'NONE'
+def pp_dv(V,A): return np.clip(1.1*np.asarray(A) - 0.8*np.asarray(V), -1.5, 1.5)
+def pp_pv(Z,V,A): return np.where(Z[:,0] > 0.8, RC['REAPPRAISE'], RC['NONE'])
 
 # 8. SDT (Self-Determination Theory)
 # Focus: Autonomy/Competence (C) and Relatedness (L).
 def sdt_p(p): return shift_params(p, aC=+0.2, bC=+0.1)
 def sdt_d(V,A): return 0.90 * delta_basic(V,A)
 def sdt_pol(z,V,A): return 'AUTONOMY' if z.C < 0.5 else 'NONE'
+def sdt_dv(V,A): return 0.90 * delta_basic_v(V,A)
+def sdt_pv(Z,V,A): return np.where(Z[:,3] < 0.5, RC['AUTONOMY'], RC['NONE'])
 
 
 SCHOOLS = [
-    SchoolSpec('CBT', cbt_p, cbt_d, cbt_pol),
-    SchoolSpec('ACT', act_p, act_d, act_pol),
-    SchoolSpec('Psychodynamic', dyn_p, dyn_d, dyn_pol),
-    SchoolSpec('Attachment', att_p, att_d, att_pol),
-    SchoolSpec('Mindfulness', min_p, min_d, min_pol),
-    SchoolSpec('Behavioral_RL', beh_p, beh_d, beh_pol),
-    SchoolSpec('PredictiveProcessing', pp_p, pp_d, pp_pol),
-    SchoolSpec('SDT', sdt_p, sdt_d, sdt_pol),
+    SchoolSpec('CBT', cbt_p, cbt_d, cbt_pol, cbt_dv, cbt_pv),
+    SchoolSpec('ACT', act_p, act_d, act_pol, act_dv, act_pv),
+    SchoolSpec('Psychodynamic', dyn_p, dyn_d, dyn_pol, dyn_dv, dyn_pv),
+    SchoolSpec('Attachment', att_p, att_d, att_pol, att_dv, att_pv),
+    SchoolSpec('Mindfulness', min_p, min_d, min_pol, min_dv, min_pv),
+    SchoolSpec('Behavioral_RL', beh_p, beh_d, beh_pol, beh_dv, beh_pv),
+    SchoolSpec('PredictiveProcessing', pp_p, pp_d, pp_pol, pp_dv, pp_pv),
+    SchoolSpec('SDT', sdt_p, sdt_d, sdt_pol, sdt_dv, sdt_pv),
 ]
 
 # ==========================================
 # 2) Digital Twin Engine
 # ==========================================
 
+class TwinHistory:
+    """
+    Turn log of one twin in a growable structured array (64 bytes per turn).
+    School and Ritual are stored as small-int codes into `strings`; V_out / A_out
+    are not stored but re-derived from R, L, E, C. Values are kept at full
+    precision and rounded only on export (rows, columns(rounded=True)).
+    """
+    FIELDS = ('Turn', 'School', 'V_in', 'A_in', 'Delta', 'Ritual', 'R', 'L', 'E', 'C', 'V_out', 'A_out')
+    STRING_FIELDS = ('School', 'Ritual')
+    DERIVED_FIELDS = ('V_out', 'A_out')
+    DIGITS = {'V_in': 2, 'A_in': 2, 'Delta': 2, 'R': 3, 'L': 3, 'E': 3, 'C': 3, 'V_out': 2, 'A_out': 2}
+    DTYPE = np.dtype([('Turn', 'i4'), ('School', 'u2'), ('Ritual', 'u2')] +
+                     [(k, 'f8') for k in ('V_in', 'A_in', 'Delta', 'R', 'L', 'E', 'C')])
+
+    def __init__(self, capacity: int = 64):
+        self._data = np.empty(capacity, dtype=self.DTYPE)
+        self._n = 0
+        self.strings = []
+        self._codes = {}
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def code(self, s) -> int:
+        """Small-int code of a string (added to the string table on first use)."""
+        c = self._codes.get(s)
+        if c is None:
+            c = self._codes[s] = len(self.strings)
+            self.strings.append(s)
+        return c
+
+    def append(self, Turn, School, V_in, A_in, Delta, Ritual, R, L, E, C):
+        if self._n == len(self._data):
+            grown = np.empty(max(64, len(self._data) + len(self._data)//8), dtype=self.DTYPE)   # slack <= 12.5%
+            grown[:self._n] = self._data[:self._n]
+            self._data = grown
+        self._data[self._n] = (Turn, self.code(School), self.code(Ritual), V_in, A_in, Delta, R, L, E, C)
+        self._n += 1
+
+    def column(self, name) -> np.ndarray:
+        """
+        Zero-copy view of a stored column (string fields give their codes; see
+        decoded()). V_out / A_out are computed, so they come back as new arrays.
+        """
+        if name in self.DERIVED_FIELDS:
+            return self._observed()[self.DERIVED_FIELDS.index(name)]
+        return self._data[name][:self._n]
+
+    def _observed(self):
+        d = self._data[:self._n]
+        va = [ENGINE.observe(*z) for z in zip(d['R'].tolist(), d['L'].tolist(), d['E'].tolist(), d['C'].tolist())]
+        return np.array(va, dtype=float).reshape(-1, 2).T
+
+    def decoded(self, name) -> np.ndarray:
+        return np.array(self.strings, dtype=object)[self.column(name)] if self._n else np.empty(0, dtype=object)
+
+    def columns(self, rounded=False) -> dict:
+        """All fields as arrays (strings decoded); rounded=True applies the log precision."""
+        out = {}
+        V_out, A_out = self._observed()
+        for k in self.FIELDS:
+            if k in self.STRING_FIELDS:
+                col = self.decoded(k)
+            else:
+                col = {'V_out': V_out, 'A_out': A_out}.get(k)
+                col = self._data[k][:self._n] if col is None else col
+            if rounded and k in self.DIGITS:
+                col = np.array([round(x, self.DIGITS[k]) for x in col.tolist()])
+            out[k] = col
+        return out
+
+    def row(self, i) -> dict:
+        """One turn as the rounded log dict DigitalTwin.step returns."""
+        turn, school, ritual, V_in, A_in, delta, R, L, E, C = self._data[:self._n][i].item()
+        V_out, A_out = ENGINE.observe(R, L, E, C)
+        return {'Turn': turn, 'School': self.strings[school],
+                'V_in': round(V_in, 2), 'A_in': round(A_in, 2), 'Delta': round(delta, 2),
+                'Ritual': self.strings[ritual],
+                'R': round(R, 3), 'L': round(L, 3), 'E': round(E, 3), 'C': round(C, 3),
+                'V_out': round(V_out, 2), 'A_out': round(A_out, 2)}
+
+    def rows(self):
+        cols = self.columns(rounded=True)
+        cols = [cols[k].tolist() for k in self.FIELDS]
+        return (dict(zip(self.FIELDS, r)) for r in zip(*cols))
+
+    __getitem__ = row
+
+    def __iter__(self):
+        return self.rows()
+
+
 class DigitalTwin:
     def __init__(self, school_name='CBT'):
-        spec = next((s for s in SCHOOLS if s.name == school_name), SCHOOLS[0])
+        spec = school_name if isinstance(school_name, SchoolSpec) else \
+            next((s for s in SCHOOLS if s.name == school_name), SCHOOLS[0])
         self.spec = spec
         base_p = Params()
         self.state = RLEC(p=spec.param_shifter(base_p))
-        self.history = []
+        self.history = TwinHistory()
 
     def step(self, V, A, turn_idx=0):
         # 1. Calc Delta (School-specific perception)
@@ -170,7 +313,7 @@ class DigitalTwin:
         
         # 2. Policy (Ritual Decision)
         ritual_name = self.spec.policy_func(self.state, V, A)
-        eff = RITUALS.get(ritual_name, RITUALS['NONE'])
+        eff = ENGINE.ritual(ritual_name)
         
         # 3. Apply Intervention (Right-Brain DSL)
         eff_delta = raw_delta * eff['d_scale']
@@ -178,62 +321,156 @@ class DigitalTwin:
         # 4. ODE Step (Time Evolution)
         self.state.step(eff_delta, uL=eff['uL'], uC=eff['uC'], uE=eff['uE'])
         
-        # 5. Observe
-        V_out, A_out = self.state.observe()
-        
-        log = {
-            'Turn': turn_idx,
-            'School': self.spec.name,
-            'V_in': round(V,2), 'A_in': round(A,2), 
-            'Delta': round(eff_delta,2),
-            'Ritual': ritual_name,
-            'R': round(self.state.R,3), 'L': round(self.state.L,3),
-            'E': round(self.state.E,3), 'C': round(self.state.C,3),
-            'V_out': round(V_out,2), 'A_out': round(A_out,2)
-        }
-        self.history.append(log)
-        return log
+        # 5. Log (the observation V_out / A_out is derived from the stored state)
+        self.history.append(turn_idx, self.spec.name, V, A, eff_delta, ritual_name,
+                            self.state.R, self.state.L, self.state.E, self.state.C)
+        return self.history.row(-1)
 
     def save_csv(self, filename):
         if not self.history: return
-        keys = self.history[0].keys()
+        cols = self.history.columns(rounded=True)
         with open(filename, 'w', newline='') as f:
-            w = csv.DictWriter(f, fieldnames=keys)
-            w.writeheader()
-            w.writerows(self.history)
+            w = csv.writer(f)
+            w.writerow(TwinHistory.FIELDS)
+            w.writerows(zip(*(cols[k].tolist() for k in TwinHistory.FIELDS)))
+
+    def save(self, filename):
+        """Save the history; the extension picks the format (.csv, .npz, .parquet, else raw, see loveos_runio)."""
+        if not self.history: return
+        save_run(filename, self.history.columns(rounded=True), attrs={'school': self.spec.name})
             
     def plot_history(self, filename):
-        turns = [x['Turn'] for x in self.history]
-        Rs = [x['R'] for x in self.history]
-        Ls = [x['L'] for x in self.history]
-        Es = [x['E'] for x in self.history]
-        Cs = [x['C'] for x in self.history]
-        Deltas = [x['Delta'] for x in self.history]
-        
-        fig, ax = plt.subplots(figsize=(10,6))
-        ax.plot(turns, Rs, label='R (Resistance)', color='red', linewidth=2)
-        ax.plot(turns, Ls, label='L (Love)', color='green', linewidth=2)
-        ax.plot(turns, Es, label='E (Ego)', color='purple', linewidth=2)
-        ax.plot(turns, Cs, label='C (Control)', color='blue', linewidth=2)
-        ax.bar(turns, Deltas, alpha=0.15, color='gray', label='Delta (Input)')
-        
-        # Mark rituals
-        for x in self.history:
-            if x['Ritual'] != 'NONE':
-                ax.axvline(x['Turn'], color='orange', linestyle=':', alpha=0.6)
-                ax.text(x['Turn'], 2.5, x['Ritual'], rotation=90, fontsize=8, color='orange', ha='right')
-
-        ax.set_title(f"Love-OS Dynamics: {self.spec.name} Model")
-        ax.set_ylim(-2.5, 3.5)
-        ax.set_xlabel("Time (Turns)")
-        ax.set_ylabel("Internal State (z)")
-        ax.legend(loc='upper left')
-        plt.tight_layout()
-        plt.savefig(filename)
-        plt.close()
+        data = {k: self.history.column(k) for k in ('Turn', 'R', 'L', 'E', 'C', 'Delta')}
+        data['Ritual'] = self.history.decoded('Ritual')
+        data['School'] = self.spec.name
+        render('twin', data, filename)
+
+
+class TwinBatch:
+    """
+    N twins of one school advanced together through the school's vectorized
+    spec: one array pass per turn for Δ, the policy and the ODE step.
+    """
+    def __init__(self, school_name='CBT', n=1, z0=None):
+        spec = school_name if isinstance(school_name, SchoolSpec) else \
+            next((s for s in SCHOOLS if s.name == school_name), SCHOOLS[0])
+        self.spec = spec
+        self.K = dict(zip(PARAM_KEYS, param_tuple(spec.param_shifter(Params()))))
+        if z0 is None:
+            z = RLEC()
+            z0 = (z.R, z.L, z.E, z.C)
+        self.Z = np.array(np.broadcast_to(np.asarray(z0, dtype=float), (n, 4)))
+
+    def __len__(self):
+        return len(self.Z)
+
+    def step(self, V, A, delta=None):
+        """
+        One turn for every twin (V, A scalars or (N,) arrays; `delta` = precomputed
+        raw Δ). Returns (ritual codes, effective Δ).
+        """
+        n = len(self.Z)
+        V = np.broadcast_to(np.asarray(V, dtype=float), (n,))
+        A = np.broadcast_to(np.asarray(A, dtype=float), (n,))
+        raw = self.spec.delta_v(V, A) if delta is None else delta
+        codes = np.broadcast_to(self.spec.policy_v(self.Z, V, A), (n,))
+        ENGINE.turn_batch(self.Z, self.K, raw, codes, dt=RLEC.dt, steps=RLEC.steps)
+        return codes, raw * RITUAL_TABLE[codes, 3]
+
+    def observe(self):
+        return ENGINE.observe_batch(self.Z)
 
 # ==========================================
-# 3) Main: Run All Schools
+# 3) Batch Runner: Schools x Scenarios x Initial States
+# ==========================================
+
+RESULT_COLUMNS = ('School', 'Scenario', 'Init', 'Turn', 'V_in', 'A_in', 'Delta', 'Ritual',
+                  'R', 'L', 'E', 'C', 'V_out', 'A_out')
+
+
+def _run_block(job):
+    """
+    One school over a block of equal-length scenarios x initial states, all rows
+    stepped together. Row r = (scenario s, init i) with r = s*n_init + i.
+    """
+    spec, scen_ids, VA, Z0 = job
+    n_scen, n_turns = VA.shape[:2]
+    n_init = len(Z0)
+    n = n_scen*n_init
+    rows = np.repeat(np.arange(n_scen), n_init)
+
+    # Δ depends only on the scenario: evaluate once per (scenario, turn), shared by every initial state
+    D = np.asarray(spec.delta_v(VA[..., 0], VA[..., 1]), dtype=float)
+
+    twins = TwinBatch(spec, n)
+    twins.Z[:] = np.tile(Z0, (n_scen, 1))
+    out = {k: np.empty((n, n_turns)) for k in ('V_in', 'A_in', 'Delta', 'R', 'L', 'E', 'C', 'V_out', 'A_out')}
+    codes = np.empty((n, n_turns), dtype=np.intp)
+    for t in range(n_turns):
+        V, A = VA[rows, t, 0], VA[rows, t, 1]
+        codes[:, t], out['Delta'][:, t] = twins.step(V, A, D[rows, t])
+        out['V_in'][:, t], out['A_in'][:, t] = V, A
+        out['R'][:, t], out['L'][:, t], out['E'][:, t], out['C'][:, t] = twins.Z.T
+        out['V_out'][:, t], out['A_out'][:, t] = twins.observe()
+
+    cols = {k: v.ravel() for k, v in out.items()}
+    cols['Ritual'] = RITUAL_NAMES[codes.ravel()]
+    cols['Scenario'] = np.repeat(np.asarray(scen_ids)[rows], n_turns)
+    cols['Init'] = np.repeat(np.tile(np.arange(n_init), n_scen), n_turns)
+    cols['Turn'] = np.tile(np.arange(n_turns), n)
+    return spec.name, cols
+
+
+def run_schools(scenarios, schools=None, initial_states=None, processes=None, block_rows: int = 4096):
+    """
+    Run every school over every scenario and initial state.
+      scenarios      : list of scenarios, each a sequence of (V, A) turns
+      schools        : SchoolSpecs or school names (default: all SCHOOLS)
+      initial_states : list of RLEC / (R, L, E, C) start states (default: RLEC())
+      processes      : spread blocks over a process pool (None = in-process)
+    Rows of one school that share a scenario length are stepped as one
+    TwinBatch (in blocks of about `block_rows` rows). Returns one
+    columnar table, a dict of RESULT_COLUMNS arrays sorted by school (in the
+    order given), scenario, initial state and turn. Values are not rounded.
+    No schools, scenarios or initial states give a table with zero rows.
+    """
+    specs = [s if isinstance(s, SchoolSpec) else next(x for x in SCHOOLS if x.name == s)
+             for s in (SCHOOLS if schools is None else schools)]
+    inits = [(z.R, z.L, z.E, z.C) if isinstance(z, RLEC) else tuple(z)
+             for z in ([RLEC()] if initial_states is None else initial_states)]
+    Z0 = np.array(inits, dtype=float).reshape(-1, 4)
+    if not (specs and len(Z0) and len(scenarios)):
+        return {k: np.empty(0, dtype=object if k in ('School', 'Ritual') else
+                            np.intp if k in ('Scenario', 'Init', 'Turn') else float) for k in RESULT_COLUMNS}
+
+    by_len = {}
+    for j, sc in enumerate(scenarios):
+        by_len.setdefault(len(sc), []).append(j)
+    per_block = max(1, block_rows // len(Z0))
+    jobs = []
+    for spec in specs:
+        for n_turns, ids in by_len.items():
+            for b in range(0, len(ids), per_block):
+                chunk = ids[b:b + per_block]
+                VA = np.array([scenarios[j] for j in chunk], dtype=float).reshape(len(chunk), n_turns, 2)
+                jobs.append((spec, chunk, VA, Z0))
+
+    if processes and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_run_block, jobs))
+    else:
+        results = [_run_block(job) for job in jobs]
+
+    rank = {spec.name: i for i, spec in enumerate(specs)}
+    school_idx = np.concatenate([np.full(len(c['Turn']), rank[name]) for name, c in results])
+    table = {k: np.concatenate([c[k] for _, c in results]) for k in results[0][1]}
+    order = np.lexsort((table['Turn'], table['Init'], table['Scenario'], school_idx))
+    table = {k: v[order] for k, v in table.items()}
+    table['School'] = np.array([spec.name for spec in specs], dtype=object)[school_idx[order]]
+    return {k: table[k] for k in RESULT_COLUMNS}
+
+# ==========================================
+# 4) Main: Run All Schools
 # ==========================================
 if __name__ == "__main__":
     # Scenario: Calm -> Shock -> Stress -> Recovery
@@ -262,3 +499,25 @@ if __name__ == "__main__":
         twin.plot_history(png_name)
         print(f"  -> Saved {csv_name} & {png_name}")
     print("\nAll schools simulated. The Grand Unification is complete.")
+
+    # --- Batch comparison over synthetic scenarios ---
+    import time
+    rng = random.Random(0)
+    synthetic = [[(rng.uniform(-1, 1), rng.uniform(0, 1)) for _ in range(len(SCENARIO))] for _ in range(1000)]
+
+    t0 = time.perf_counter()
+    for school in SCHOOLS:
+        for sc in synthetic:
+            twin = DigitalTwin(school.name)
+            for i, (v, a) in enumerate(sc):
+                twin.step(v, a, turn_idx=i)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    table = run_schools(synthetic)
+    t_batch = time.perf_counter() - t0
+    last = table['Turn'] == len(SCENARIO) - 1
+    print(f"\n{len(SCHOOLS)} schools x {len(synthetic)} scenarios: twin loop {t_loop:.2f}s, run_schools {t_batch:.2f}s")
+    for name in (s.name for s in SCHOOLS):
+        sel = last & (table['School'] == name)
+        print(f"  {name:<22} final L = {table['L'][sel].mean():+.3f}  final E = {table['E'][sel].mean():+.3f}")
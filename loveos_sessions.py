@@ -0,0 +1,413 @@
+"""
+Love-OS Session Store
+---------------------
+Per-user emotional state for long-running servers: session_id -> RLEC state
+(R, L, E, C) + recent EmotionalMemory, with bounded resident memory.
+
+  SessionStore   : SQLite file, one row per session (state columns + a
+                   zlib-compressed JSON blob of the recent memory)
+  SessionManager : the resident set. States live in one (N, 4) array (the
+                   rows AsyncContextBridge steps in batch); sessions are kept
+                   in LRU order and
+                     - evicted to the store beyond `capacity` (least recently used)
+                       or after `ttl` seconds idle,
+                     - restored lazily on their next turn,
+                     - written in compact snapshots (dirty sessions only) by
+                       snapshot() / autosnapshot(); a record never overwrites
+                       a newer one (more turns) of the same session, and
+                       records whose write fails are queued for the next one.
+                   A restarted server opens the same file and carries on: each
+                   session is read back on its first new turn, no transcripts
+                   are replayed.
+
+    sessions = SessionManager(SessionStore('sessions.db'), capacity=100_000, ttl=3600)
+    bridge = AsyncContextBridge(sessions=sessions)
+    asyncio.create_task(sessions.autosnapshot(30))
+
+Usage:
+  python loveos_sessions.py                          # 100k sessions: evict, snapshot, restart, lazy restore
+  python loveos_sessions.py --sessions 1000000 --capacity 50000
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from loveos_context_bridge import EmotionalMemory
+
+
+@dataclass
+class Session:
+    session_id: str
+    row: int                                   # row of the manager's state array
+    memory: Deque[EmotionalMemory]
+    turns: int = 0
+    last_seen: float = 0.0
+    dirty: bool = True                         # changed since it was last written to the store
+    busy: int = 0                              # turns in flight (never evicted while > 0)
+    tail: Optional[asyncio.Future] = None      # completes when the latest turn has updated the state
+
+# ------------------------------
+# Disk store
+# ------------------------------
+def encode_memory(memory: Iterable[EmotionalMemory]) -> bytes:
+    rows = [[m.timestamp, m.user_input, m.ai_state['R'], m.ai_state['L'], m.ai_state['E'], m.ai_state['C'],
+             m.delta, m.ritual_triggered] for m in memory]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 1)
+
+
+def decode_memory(blob: bytes) -> List[EmotionalMemory]:
+    return [EmotionalMemory(timestamp=ts, user_input=text, ai_state={'R': R, 'L': L, 'E': E, 'C': C},
+                            delta=delta, ritual_triggered=ritual)
+            for ts, text, R, L, E, C, delta, ritual in json.loads(zlib.decompress(blob))]
+
+
+class SessionStore:
+    """
+    SQLite-backed session rows (WAL mode). Writes are serialized and may come
+    from a worker thread; reads use their own connection, so a lazy restore
+    never waits behind a snapshot being committed.
+    """
+    SCHEMA = """CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY, R REAL, L REAL, E REAL, C REAL,
+        turns INTEGER, last_seen REAL, memory BLOB) WITHOUT ROWID"""
+
+    def __init__(self, path: str = 'loveos_sessions.db'):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(self.SCHEMA)
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[tuple]:
+        """(R, L, E, C, turns, last_seen, memory_blob) or None."""
+        return self._reader.execute("SELECT R, L, E, C, turns, last_seen, memory FROM sessions WHERE id = ?",
+                                    (session_id,)).fetchone()
+
+    UPSERT = """INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET
+        R = excluded.R, L = excluded.L, E = excluded.E, C = excluded.C,
+        turns = excluded.turns, last_seen = excluded.last_seen, memory = excluded.memory
+        WHERE excluded.turns >= sessions.turns"""
+
+    def save_many(self, records: Iterable[tuple]):
+        """
+        Upsert (id, R, L, E, C, turns, last_seen, memory_blob) rows in one
+        transaction. A row never replaces one with more turns, so the newest
+        record wins whatever order overlapping writes commit in.
+        """
+        with self._lock:
+            self.db.execute("BEGIN")
+            try:
+                self.db.executemany(self.UPSERT, records)
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def __len__(self):
+        return self._reader.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+        self._reader.close()
+
+# ------------------------------
+# Resident set
+# ------------------------------
+class SessionManager:
+    """
+    LRU/TTL-bounded sessions over an optional SessionStore. Without a store
+    nothing is evicted (capacity / ttl need somewhere to put the sessions).
+    """
+    def __init__(self, store: SessionStore = None, capacity: Optional[int] = None, ttl: Optional[float] = None,
+                 init=(0.1, 0.5, 0.2, 0.5), memory_size: int = 50, write_batch: int = 4096):
+        if store is None and (capacity is not None or ttl is not None):
+            raise ValueError("capacity / ttl eviction needs a SessionStore")
+        self.store = store
+        self.capacity = capacity
+        self.ttl = ttl
+        self.init = np.asarray(init, dtype=float)
+        self.memory_size = memory_size
+        self.write_batch = write_batch
+        self.Z = np.empty((0, 4))
+        self._free: List[int] = []
+        self._resident: "OrderedDict[str, Session]" = OrderedDict()   # least recently used first
+        self._evicted: Dict[str, tuple] = {}    # write-behind: id -> (state, turns, last_seen, memory)
+        self._writing: Dict[str, tuple] = {}    # records of a snapshot still being written in a thread
+        self._snapshots_running = 0
+        self._last_sweep = time.time()
+        self.stats = dict(created=0, restored=0, evicted=0, expired=0, snapshots=0, written=0)
+
+    def __len__(self):
+        return len(self._resident)
+
+    def __contains__(self, session_id):
+        return session_id in self._resident
+
+    def __iter__(self):
+        return iter(self._resident.values())
+
+    def _row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        row = len(self._resident)
+        if row == len(self.Z):
+            Z = np.empty((max(64, 2*row), 4))
+            Z[:row] = self.Z
+            self.Z = Z
+        return row
+
+    def get(self, session_id: str) -> Session:
+        """Resident session, restored from the store or created on first use; marks it most recently used."""
+        now = time.time()
+        s = self._resident.get(session_id)
+        if s is not None:
+            self._resident.move_to_end(session_id)
+            s.last_seen = now
+            return s
+
+        row = self._row()
+        rec = self._evicted.pop(session_id, None)
+        dirty = rec is not None                  # evicted but not written yet
+        if rec is None:
+            rec = self._writing.get(session_id)
+        if rec is None and self.store is not None:
+            rec = self.store.load(session_id)
+            if rec is not None:
+                rec = (rec[:4], rec[4], rec[5], decode_memory(rec[6]))
+        if rec is None:
+            self.Z[row] = self.init
+            s = Session(session_id, row, deque(maxlen=self.memory_size), last_seen=now)
+            self.stats['created'] += 1
+        else:
+            state, turns, _, memory = rec
+            self.Z[row] = state
+            s = Session(session_id, row, deque(memory, maxlen=self.memory_size), turns, now, dirty=dirty)
+            self.stats['restored'] += 1
+        self._resident[session_id] = s
+
+        if self.ttl is not None and now - self._last_sweep > self.ttl / 10:
+            self.expire(now)
+        if self.capacity is not None and len(self._resident) > self.capacity:
+            self._shrink(self.capacity, keep=s)
+        return s
+
+    def state(self, session_id: str) -> Dict[str, float]:
+        row = self.get(session_id).row          # may grow self.Z
+        R, L, E, C = self.Z[row].tolist()
+        return {'R': R, 'L': L, 'E': E, 'C': C}
+
+    # ------------------------------
+    # Eviction
+    # ------------------------------
+    def _evict(self, s: Session):
+        del self._resident[s.session_id]
+        self._free.append(s.row)
+        if s.dirty:
+            self._evicted[s.session_id] = (tuple(self.Z[s.row].tolist()), s.turns, s.last_seen, s.memory)
+            self._writing.pop(s.session_id, None)       # superseded: restore from the newer record
+        # Not while snapshot_async is committing: the buffer is flushed after it
+        if len(self._evicted) >= self.write_batch and not self._snapshots_running:
+            self._write(self._drain(resident=False))
+
+    def _shrink(self, size: int, keep: Session = None):
+        """Evict least recently used sessions (skipping ones with turns in flight) down to `size`."""
+        excess = len(self._resident) - size
+        victims = []
+        for s in self._resident.values():
+            if len(victims) == excess:
+                break
+            if not s.busy and s is not keep:
+                victims.append(s)
+        for s in victims:
+            self._evict(s)
+        self.stats['evicted'] += len(victims)
+
+    def expire(self, now: float = None):
+        """Evict sessions idle for longer than ttl."""
+        now = time.time() if now is None else now
+        self._last_sweep = now
+        cutoff = now - self.ttl
+        victims = []
+        for s in self._resident.values():
+            if s.last_seen >= cutoff:
+                break
+            if not s.busy:
+                victims.append(s)
+        for s in victims:
+            self._evict(s)
+        self.stats['expired'] += len(victims)
+
+    # ------------------------------
+    # Snapshots
+    # ------------------------------
+    def _drain(self, resident: bool = True) -> List[tuple]:
+        """Take the write-behind buffer (and the dirty resident sessions) as raw records."""
+        recs = [(sid, *rec) for sid, rec in self._evicted.items()]
+        self._evicted = {}
+        dirty = [s for s in self._resident.values() if s.dirty] if resident else []
+        if dirty:
+            states = self.Z[np.fromiter((s.row for s in dirty), dtype=np.intp, count=len(dirty))].tolist()
+            for s, z in zip(dirty, states):
+                recs.append((s.session_id, tuple(z), s.turns, s.last_seen, tuple(s.memory)))
+                s.dirty = False
+        return recs
+
+    def _encode(self, recs: List[tuple]) -> List[tuple]:
+        return [(sid, *state, turns, last_seen, encode_memory(memory)) for sid, state, turns, last_seen, memory in recs]
+
+    def _requeue(self, recs: List[tuple]):
+        """Put records whose write failed back up for the next snapshot (newer data wins)."""
+        for sid, *rec in recs:
+            s = self._resident.get(sid)
+            if s is not None:
+                s.dirty = True                          # resident copy is this record or newer
+            elif sid not in self._evicted:
+                self._evicted[sid] = tuple(rec)
+
+    def _write(self, recs: List[tuple]):
+        try:
+            self.store.save_many(self._encode(recs))
+        except BaseException:
+            self._requeue(recs)
+            raise
+        for r in recs:
+            self._writing.pop(r[0], None)                 # committed a newer record than the one in flight
+        self.stats['written'] += len(recs)
+
+    def snapshot(self) -> int:
+        """Write every session changed since the last snapshot; returns the number of rows written."""
+        if self.store is None:
+            return 0
+        recs = self._drain()
+        self._write(recs)
+        self.stats['snapshots'] += 1
+        return len(recs)
+
+    async def snapshot_async(self, chunk: int = 128) -> int:
+        """
+        snapshot() for a running event loop: `chunk` sessions at a time are
+        encoded on the loop (short slices) and committed from a worker thread.
+        """
+        if self.store is None:
+            return 0
+        recs = self._drain()
+        mine = {r[0]: r[1:] for r in recs}
+        self._writing.update(mine)
+        self._snapshots_running += 1
+        try:
+            for i in range(0, len(recs), chunk):
+                rows = self._encode(recs[i:i + chunk])
+                try:
+                    await asyncio.to_thread(self.store.save_many, rows)
+                except BaseException:
+                    self._requeue(recs[i:])
+                    raise
+                self.stats['written'] += len(rows)
+        finally:
+            self._snapshots_running -= 1
+            for sid, rec in mine.items():
+                if self._writing.get(sid) is rec:
+                    del self._writing[sid]
+        if not self._snapshots_running and len(self._evicted) >= self.write_batch:
+            self._write(self._drain(resident=False))
+        self.stats['snapshots'] += 1
+        return len(recs)
+
+    async def autosnapshot(self, interval: float = 30.0):
+        """Background task: TTL sweep + snapshot every `interval` seconds (cancel to stop)."""
+        while True:
+            await asyncio.sleep(interval)
+            if self.ttl is not None:
+                self.expire()
+            await self.snapshot_async()
+
+    def close(self):
+        """Final snapshot, then close the store."""
+        if self.store is not None:
+            self.snapshot()
+            self.store.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import tempfile
+
+    from loveos_async_bridge import AsyncContextBridge, load_test
+    from loveos_integrators import PARAM_KEYS, param_tuple
+    from loveos_llm_bridge import ENGINE, LoveOSParams
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=100_000)
+    ap.add_argument("--capacity", type=int, default=10_000)
+    ap.add_argument("--memory", type=int, default=5, help="memory entries per synthetic session")
+    args = ap.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'loveos_sessions.db')
+
+    # 1) Bridge under load with a bounded resident set
+    async def serve():
+        mgr = SessionManager(SessionStore(path), capacity=500, ttl=60)
+        bridge = AsyncContextBridge(sessions=mgr)
+        task = asyncio.create_task(mgr.autosnapshot(0.5))
+        lat = await load_test(bridge, sessions=2000, turns=5, think=0.2)
+        task.cancel()
+        ref = {sid: mgr.state(sid) for sid in ('user-0', 'user-999', 'user-1999')}
+        mgr.close()
+        return lat, mgr, ref
+
+    lat, mgr, ref = asyncio.run(serve())
+    p50, p99 = np.percentile(lat, [50, 99]) * 1e3
+    print(f"bridge, 2,000 sessions / capacity 500: p50 {p50:.2f} ms | p99 {p99:.2f} ms | {mgr.stats}")
+    restarted = SessionManager(SessionStore(path))
+    print(f"restart: states restored exactly: {all(restarted.state(k) == v for k, v in ref.items())}")
+    restarted.close()
+    os.remove(path)
+
+    # 2) Scale: sessions touched once, then a restart that resumes a sample lazily
+    rng = np.random.default_rng(0)
+    K = dict(zip(PARAM_KEYS, param_tuple(LoveOSParams())))
+    mgr = SessionManager(SessionStore(path), capacity=args.capacity, memory_size=50)
+    t0 = time.perf_counter()
+    block = 10_000
+    for lo in range(0, args.sessions, block):
+        ss = [mgr.get(f"s{i}") for i in range(lo, min(lo + block, args.sessions))]
+        rows = np.array([s.row for s in ss])
+        z = mgr.Z[rows]
+        ENGINE.turn_batch(z, K, rng.uniform(-1, 2, len(rows)))
+        mgr.Z[rows] = z
+        for s, (R, L, E, C) in zip(ss, z.tolist()):
+            for j in range(args.memory):
+                s.memory.append(EmotionalMemory(time.time(), "Why are you so slow?", {'R': R, 'L': L, 'E': E, 'C': C},
+                                                0.8, None))
+            s.turns += 1
+            s.dirty = True
+        mgr.snapshot()
+    t_fill = time.perf_counter() - t0
+    sample = [f"s{i}" for i in rng.integers(0, args.sessions, 1000)]
+    before = {k: mgr.state(k) for k in sample}
+    mgr.close()
+    size = os.path.getsize(path) + (os.path.getsize(path + '-wal') if os.path.exists(path + '-wal') else 0)
+    print(f"{args.sessions:,} sessions x {args.memory} memories, capacity {args.capacity:,}: written in {t_fill:.1f}s, "
+          f"resident {len(mgr):,}, store {size/2**20:.1f} MiB ({size/args.sessions:.0f} B/session)")
+
+    t0 = time.perf_counter()
+    restarted = SessionManager(SessionStore(path), capacity=args.capacity)
+    t_open = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    same = all(restarted.state(k) == v for k, v in before.items())
+    t_restore = (time.perf_counter() - t0) / len(sample)
+    print(f"restart: open {t_open*1e3:.1f} ms, lazy restore {t_restore*1e6:.0f} us/session, states exact: {same}")
+    restarted.close()
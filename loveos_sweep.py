@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Love-OS Shame Sweep
+Maps total shame S and coherence over (tau, alpha, r_int) parameter grids.
+
+Every configuration is one column of a state matrix; all columns share the
+time grid and the stimulus and are integrated together, one vectorized
+update per time step. Delay lines of different lengths live in a single
+ring-buffer matrix with a per-column write index.
+
+Results agree with ShameModel.simulate_array(store=False) to floating-point
+rounding: S is the same sequential sum, bit for bit; coherence is built from
+per-step Welford updates here and from block (Chan) merges there, so the two
+differ by ~1e-15. Compare coherence against thresholds with COHERENCE_ATOL
+of slack. is_sc (ShameModel.is_superconductive) depends on the parameters
+only, so it is unaffected.
+
+Usage:
+  python loveos_sweep.py        # timing demo on a 100k-point grid
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import time
+
+import numpy as np
+
+from loveos_dynamics import CoherenceAccumulator, ShameModel, sample_stimulus, time_grid
+
+DEFAULT_STIM = ('PULSE', (1.0, 0.2, 2.0))
+# Slack for comparing sweep coherence with simulate_array / thresholds (observed gap ~1e-14)
+COHERENCE_ATOL = 1e-9
+
+
+@dataclass
+class SweepResult:
+    """Sweep output. All arrays share one shape: the grid (tau, alpha, r_int) or the flat config list."""
+    tau: np.ndarray
+    alpha: np.ndarray
+    r_int: np.ndarray
+    S: np.ndarray
+    coherence: np.ndarray
+
+    def best(self, key: str = 'S', largest: bool = False):
+        """Parameters of the extreme configuration, e.g. best('S') -> lowest shame."""
+        vals = getattr(self, key)
+        k = int(np.nanargmax(vals) if largest else np.nanargmin(vals))
+        idx = np.unravel_index(k, vals.shape)
+        return dict(tau=float(self.tau[idx]), alpha=float(self.alpha[idx]), r_int=float(self.r_int[idx]),
+                    S=float(self.S[idx]), coherence=float(self.coherence[idx]))
+
+
+def integrate_columns(tau, alpha, r_int, F, dt: float, use_delay: bool = True):
+    """
+    Integrate m ShameModel configurations side by side.
+      tau, alpha, r_int : (m,) parameter columns
+      F                 : stimulus sampled on the shared time grid, shape (n+1,)
+    Returns (S, coherence), each of shape (m,). Column j reproduces
+    ShameModel(tau[j], alpha[j], r_int[j]).simulate_array(..., store=False):
+    S exactly, coherence to floating-point rounding (see COHERENCE_ATOL).
+    """
+    tau = np.asarray(tau, dtype=float)
+    alpha = np.asarray(alpha, dtype=float)
+    r_int = np.asarray(r_int, dtype=float)
+    m = len(tau)
+
+    # Per-column delay configuration (same rules as ShameModel.simulate)
+    delayed = (tau > 0.0) & use_delay
+    if use_delay:
+        delay_steps = np.maximum(1, (tau / dt).astype(np.int64))
+    else:
+        delay_steps = np.ones(m, dtype=np.int64)
+    tau_eff = np.where(delayed, tau, np.where(tau > 0.0, np.maximum(tau, dt), dt))
+
+    # Ring-buffer matrix: column j uses slots [0, delay_steps[j]) of row j
+    width = int(delay_steps.max()) if m else 1
+    ring = np.zeros(m * width)
+    base = np.arange(m, dtype=np.int64) * width
+    pos = np.zeros(m, dtype=np.int64)
+
+    i = np.zeros(m); a = np.zeros(m); S = np.zeros(m)
+    acc = CoherenceAccumulator(shape=(m,))
+    d = np.empty(m); ad = np.empty(m); sign = np.empty(m)
+    tiny = np.empty(m, dtype=bool)
+
+    # Unstable corners of the grid (e.g. 0 < tau < dt) may diverge to inf/nan; that is a result, not an error
+    with np.errstate(over='ignore', invalid='ignore'):
+        for Fk in F.tolist():
+            np.subtract(i, a, out=d)
+            np.abs(d, out=ad)
+            S += ad * dt
+
+            acc.update(i, a)
+
+            # --- Impulse Dynamics ---
+            np.less(ad, 1e-12, out=tiny)
+            sign[:] = 0.0
+            np.divide(d, ad, out=sign, where=~tiny)
+            i_next = i + dt * (Fk - alpha * i - r_int * sign * ad)
+
+            # --- Action Dynamics (delayed columns read their ring slot) ---
+            slot = base + pos
+            target = np.where(delayed, ring[slot], i)
+            a = a + dt * ((target - a) / tau_eff)
+            ring[slot] = i_next
+            pos += 1
+            pos[pos == delay_steps] = 0
+
+            i = i_next
+
+    return S, acc.value()
+
+
+def _run_chunk(args):
+    return integrate_columns(*args)
+
+
+def sweep(tau, alpha, r_int, T: float = 6.0, dt: float = 0.001, stimulus=DEFAULT_STIM,
+          use_delay: bool = True, grid: bool = True, processes: int = None,
+          chunk_size: int = 8192) -> SweepResult:
+    """
+    Sweep ShameModel over parameter configurations.
+      grid=True  : full Cartesian grid of tau x alpha x r_int
+      grid=False : tau/alpha/r_int are zipped into one config list (broadcast)
+      stimulus   : a Stimulus, DSL spec ('PULSE', (amp, width, period)), a callable, or F sampled on the grid
+      processes  : spread chunks of `chunk_size` configs over a process pool (None = in-process)
+    """
+    if grid:
+        TA, AL, RI = np.meshgrid(np.atleast_1d(np.asarray(tau, dtype=float)),
+                                 np.atleast_1d(np.asarray(alpha, dtype=float)),
+                                 np.atleast_1d(np.asarray(r_int, dtype=float)), indexing='ij')
+    else:
+        TA, AL, RI = np.broadcast_arrays(np.atleast_1d(np.asarray(tau, dtype=float)),
+                                         np.atleast_1d(np.asarray(alpha, dtype=float)),
+                                         np.atleast_1d(np.asarray(r_int, dtype=float)))
+    shape = TA.shape
+    ta, al, ri = TA.ravel(), AL.ravel(), RI.ravel()
+
+    # Drive is shared by every column: sample it once
+    t = time_grid(T, dt)
+    if isinstance(stimulus, np.ndarray):
+        F = np.asarray(stimulus, dtype=float)
+        if F.shape != t.shape:
+            raise ValueError(f"Sampled stimulus has shape {F.shape}, expected {t.shape}")
+    else:
+        F = sample_stimulus(stimulus, t, dt)
+
+    # Group by delay length so each chunk's ring buffer stays narrow
+    order = np.argsort(ta, kind='stable')
+    chunks = [order[s:s + chunk_size] for s in range(0, len(order), chunk_size)]
+    jobs = [(ta[c], al[c], ri[c], F, dt, use_delay) for c in chunks]
+
+    S = np.empty(len(ta)); coh = np.empty(len(ta))
+    if processes and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_run_chunk, jobs))
+    else:
+        results = [_run_chunk(job) for job in jobs]
+    for c, (S_c, coh_c) in zip(chunks, results):
+        S[c] = S_c
+        coh[c] = coh_c
+
+    return SweepResult(tau=TA, alpha=AL, r_int=RI, S=S.reshape(shape), coherence=coh.reshape(shape))
+
+
+if __name__ == "__main__":
+    import os
+
+    # Spot check against the single-model path
+    res = sweep([0.0, 0.3, 0.4], [0.2, 0.25], [0.05])
+    model = ShameModel(tau=0.4, alpha=0.25, r_int=0.05)
+    S_ref, coh_ref = model.simulate_array(T=6.0, dt=0.001, store=False)
+    dcoh = res.coherence[2, 1, 0] - coh_ref
+    print(f"sweep vs simulate_array: dS = {res.S[2, 1, 0] - S_ref:.2e}, dcoh = {dcoh:.2e} "
+          f"(within COHERENCE_ATOL: {abs(dcoh) <= COHERENCE_ATOL})")
+
+    taus = np.linspace(0.0, 0.8, 50)
+    alphas = np.linspace(0.0, 1.0, 50)
+    rints = np.linspace(0.0, 0.2, 40)
+    n_cfg = taus.size * alphas.size * rints.size
+    t0 = time.perf_counter()
+    res = sweep(taus, alphas, rints, processes=os.cpu_count())
+    elapsed = time.perf_counter() - t0
+    print(f"{n_cfg:,} configs in {elapsed:.1f}s -> {n_cfg / elapsed * 60:,.0f} configs/min")
+    print("Lowest shame:", res.best('S'))
@@ -8,13 +8,19 @@ import matplotlib.pyplot as plt
 
 from datetime import datetime, timedelta
 
+from loveos_runio import open_run
+
 # 1) Load existing CSV if available; otherwise, synthesize the same structure
 
 csv_path = 'loveos_demo_21days.csv'
 
-if os.path.exists(csv_path):
+# the same data may also be stored as a binary run (see loveos_runio)
+
+data_path = next((p for p in ('loveos_demo_21days.npz', 'loveos_demo_21days.parquet', csv_path) if os.path.exists(p)), None)
+
+if data_path:
 
-    df = pd.read_csv(csv_path)
+    df = open_run(data_path).to_frame()
 
     df['date_dt'] = pd.to_datetime(df['date'])
 
@@ -1,18 +1,25 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import datetime
-import os
+
+from loveos_report import render
+from loveos_tracker_store import COLUMNS, TrackerStats, open_store
 
 class LoveOSTracker:
-    def __init__(self, csv_file="loveos_log.csv"):
+    def __init__(self, csv_file="loveos_log.csv", store=None, **store_kw):
+        """
+        csv_file : log path; the extension picks the backend (.csv, .jsonl, .parquet / .arrow segments)
+        store    : a ready LogStore (overrides csv_file)
+        store_kw : buffer_size, fsync, fsync_interval, locking (see loveos_tracker_store)
+        """
         self.csv_file = csv_file
         # Noise tolerance coefficient (Lock condition: omega <= kappa * R)
         self.kappa = 1.0  
-        self.columns = ["Date", "Time", "R", "Omega", "Z_pre", "Z_post", "Delta_Z", "Lock"]
-        
-        if not os.path.exists(self.csv_file):
-            df = pd.DataFrame(columns=self.columns)
-            df.to_csv(self.csv_file, index=False)
+        self.columns = list(COLUMNS)
+        # Append-only: logging a row no longer rewrites the whole file
+        self.store = store if store is not None else open_store(csv_file, columns=self.columns, **store_kw)
+        # Lock rate / weekly Delta_Z, updated incrementally from newly appended rows
+        self.stats = TrackerStats(window=14)
 
     def log_entry(self, r, omega, z_pre, z_post):
         """Log daily measurement data."""
@@ -31,21 +38,43 @@ class LoveOSTracker:
             "Lock": is_locked
         }
         
-        df = pd.read_csv(self.csv_file)
-        df = pd.concat([df, pd.DataFrame([new_data])], ignore_index=True)
-        df.to_csv(self.csv_file, index=False)
+        self.store.append(new_data)
         print(f"Logged: R={r}, Omega={omega}, Lock={is_locked}, Delta_Z={delta_z}")
 
-    def plot_weekly_trends(self):
-        """Visualize recent trends and the Lock Rate."""
-        df = pd.read_csv(self.csv_file)
+    def flush(self):
+        """Write any buffered entries."""
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+
+    def entries(self, start=None, end=None):
+        """Logged rows between two days (inclusive, 'YYYY-MM-DD' or date)."""
+        return self.store.read_range(start, end)
+
+    def recent(self, n=14):
+        """The latest n logs."""
+        return self.store.tail(n)
+
+    def weekly_summary(self):
+        """Entries, Lock rate and mean Delta_Z per ISO week."""
+        return self.stats.sync(self.store).weekly()
+
+    def plot_weekly_trends(self, filename=None):
+        """Visualize recent trends and the Lock Rate (saved headless to `filename` if given)."""
+        # Display the latest 14 logs (read from the end of the log, not the whole file)
+        df = self.recent(14)
         if df.empty:
             print("No data to plot.")
             return
 
         df['Datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'])
-        # Display the latest 14 logs
-        df = df.sort_values('Datetime').tail(14) 
+        df = df.sort_values('Datetime')
+        lock_rate = self.stats.sync(self.store).rolling_lock_rate() * 100
+        if filename:
+            data = {k: df[k].to_numpy() for k in ('Datetime', 'R', 'Omega', 'Z_pre', 'Delta_Z')}
+            data['lock_rate'] = lock_rate
+            return render('tracker', data, filename)
 
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
 
@@ -62,8 +91,6 @@ class LoveOSTracker:
         colors = ['red' if val > 0 else 'blue' for val in df['Delta_Z']]
         ax2.bar(df['Datetime'], df['Delta_Z'], color=colors, alpha=0.6, label='Delta Z (Post-MIRROR)')
         
-        # Calculate Lock Rate
-        lock_rate = df['Lock'].mean() * 100
         ax2.axhline(0, color='black', linewidth=1)
         ax2.set_ylabel('Delta Z (Target < 0)')
         ax2.set_title(f'MIRROR-30 Efficacy & Lock Rate: {lock_rate:.1f}%')
@@ -0,0 +1,749 @@
+"""
+Love-OS Tracker Store
+---------------------
+Append-only storage backends for LoveOSTracker logs. Appending a row costs
+O(1) regardless of how large the log has grown:
+
+  - CSVAppendStore      : plain CSV, rows appended to the end of the file
+  - JSONLStore          : one JSON object per line
+  - SegmentStore        : directory of columnar Parquet / Arrow segment files
+                          (one per flush), compacted periodically (needs pyarrow)
+
+All stores share the same knobs:
+
+  buffer_size : rows kept in memory before they are written (1 = write-through)
+  fsync       : 'always'   fsync after every write
+                'interval' fsync at most every `fsync_interval` seconds
+                'never'    leave durability to the OS
+  locking     : advisory inter-process lock (`<path>.lock`) around every write,
+                so several processes can share one log
+
+Buffered rows are written on flush(), close(), leaving a `with` block and at
+interpreter exit.
+
+Queries (tail(n), read_range(start, end), read_since(cursor)) touch only the
+relevant part of the log: line stores keep a sidecar day index of byte
+offsets, segment stores skip segments outside the requested days.
+TrackerStats keeps Lock rate / weekly Delta_Z aggregates up to date from
+read_since, without rescanning.
+
+Usage:
+  python loveos_tracker_store.py     # append-latency benchmark
+"""
+
+import atexit
+import csv
+import datetime
+import io
+import json
+import os
+import time
+import weakref
+from collections import deque
+from functools import lru_cache
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:   # Windows: no advisory locking
+    fcntl = None
+
+COLUMNS = ["Date", "Time", "R", "Omega", "Z_pre", "Z_post", "Delta_Z", "Lock"]
+DAY_COLUMN = "Date"
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+# Stores with pending rows, flushed at exit
+_OPEN = weakref.WeakSet()
+atexit.register(lambda: [s.close() for s in list(_OPEN)])
+
+
+class FileLock:
+    """Re-entrant advisory lock on a side file. No-op without fcntl."""
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+
+    def __enter__(self):
+        if fcntl is not None and self._depth == 0:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if fcntl is not None and self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class LogStore:
+    """
+    Base class: row buffering, fsync policy and locking. Subclasses implement
+    _write(rows) (called with the lock held) and read().
+    """
+    def __init__(self, path: str, columns=COLUMNS, buffer_size: int = 1,
+                 fsync: str = 'interval', fsync_interval: float = 1.0, locking: bool = True):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync!r} (choose from {FSYNC_POLICIES})")
+        self.path = path
+        self.columns = list(columns)
+        self.buffer_size = max(1, int(buffer_size))
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.lock = FileLock(self._lock_path()) if locking else _NullLock()
+        self._buf = []
+        self._last_sync = time.monotonic()
+
+    def append(self, row: dict):
+        self._buf.append(dict(row))     # callers may reuse and mutate one dict per row
+        if len(self._buf) >= self.buffer_size:
+            self.flush()
+        else:
+            _OPEN.add(self)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        if not self._buf:
+            return
+        rows, self._buf = self._buf, []
+        with self.lock:
+            self._write(rows)
+        _OPEN.discard(self)
+
+    def close(self):
+        self.flush()
+        self._close()
+        self.lock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.read())
+
+    def _lock_path(self) -> str:
+        return self.path + '.lock'
+
+    def _should_sync(self) -> bool:
+        if self.fsync == 'always':
+            return True
+        if self.fsync == 'interval' and time.monotonic() - self._last_sync >= self.fsync_interval:
+            return True
+        return False
+
+    def _synced(self):
+        self._last_sync = time.monotonic()
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def read(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    # Generic (full-scan) queries; backends override them with indexed reads
+    def read_range(self, start=None, end=None) -> pd.DataFrame:
+        df = self.read()
+        lo, hi = _day(start), _day(end)
+        mask = pd.Series(True, index=df.index)
+        if lo is not None:
+            mask &= df[DAY_COLUMN].astype(str) >= lo
+        if hi is not None:
+            mask &= df[DAY_COLUMN].astype(str) <= hi
+        return df[mask].reset_index(drop=True)
+
+    def tail(self, n: int) -> pd.DataFrame:
+        return self.read().tail(n).reset_index(drop=True)
+
+    def read_since(self, cursor=None):
+        df = self.read()
+        return df.iloc[cursor or 0:].reset_index(drop=True), len(df)
+
+
+class _NullLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def close(self):
+        pass
+
+# ------------------------------
+# Line-oriented stores
+# ------------------------------
+
+class _LineStore(LogStore):
+    """
+    Keeps one O_APPEND handle open; a flush is a single write() of all buffered
+    lines. A sidecar day index (`<path>.idx`, one "day,byte offset" line per
+    run of same-day rows) is appended alongside, so range reads seek straight
+    to the relevant bytes instead of parsing the whole log. `<path>.idx.end`
+    holds the log size the index covers, written after each flush; if the
+    log is longer (a crash between the data and the index write) the index
+    is extended over the unindexed tail on open and before range reads.
+    """
+    header = None
+
+    def __init__(self, path: str, **kw):
+        super().__init__(path, **kw)
+        self.index_path = path + '.idx'
+        self.end_path = self.index_path + '.end'
+        self._fh = None
+        self._end_fd = None
+        self._idx_state = (-1, None)   # (index file size, last indexed day)
+        with self.lock:
+            self._open()
+            self._sync_index()
+
+    def _open(self):
+        if self._fh is None:
+            self._fh = open(self.path, 'a', encoding='utf-8', newline='')
+            if self.header is not None and os.fstat(self._fh.fileno()).st_size == 0:
+                self._fh.write(self.header())
+                self._fh.flush()
+
+    def _write(self, rows):
+        self._open()
+        offset = os.fstat(self._fh.fileno()).st_size
+        # another process may have truncated the file: re-check the header
+        head = self.header() if self.header is not None and offset == 0 else ''
+        lines = self._encode(rows)
+        data = head + ''.join(lines)
+        self._fh.write(data)
+        self._fh.flush()
+        self._index_lines(rows, lines, offset + len(head.encode('utf-8')))
+        self._set_indexed_end(offset + len(data.encode('utf-8')))
+        if self._should_sync():
+            os.fsync(self._fh.fileno())
+            self._synced()
+
+    def _close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._end_fd is not None:
+            os.close(self._end_fd)
+            self._end_fd = None
+
+    def _encode(self, rows):
+        """One encoded line (with newline) per row."""
+        raise NotImplementedError
+
+    def _decode(self, data: bytes) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def _line_day(self, line: bytes) -> str:
+        raise NotImplementedError
+
+    def _data_start(self) -> int:
+        """Byte offset of the first row."""
+        return 0
+
+    # ------------------------------
+    # Day index
+    # ------------------------------
+    def _last_indexed_day(self):
+        size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        if size != self._idx_state[0]:
+            last = None
+            if size:
+                with open(self.index_path, 'rb') as f:
+                    f.seek(max(0, size - 64))
+                    last = f.read().splitlines()[-1].split(b',')[0].decode()
+            self._idx_state = (size, last)
+        return self._idx_state[1]
+
+    def _index_lines(self, rows, lines, offset):
+        last = self._last_indexed_day()
+        entries = []
+        for row, line in zip(rows, lines):
+            day = str(row.get(DAY_COLUMN))
+            if day != last:
+                entries.append(f"{day},{offset}\n")
+                last = day
+            offset += len(line.encode('utf-8'))
+        if entries:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(entries))
+            self._idx_state = (os.path.getsize(self.index_path), last)
+
+    def _indexed_end(self):
+        """Log size covered by the index, or None if unknown (no or damaged .end file)."""
+        try:
+            with open(self.end_path, 'rb') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _set_indexed_end(self, end: int):
+        if self._end_fd is None:
+            self._end_fd = os.open(self.end_path, os.O_RDWR | os.O_CREAT, 0o644)
+        os.pwrite(self._end_fd, b'%20d' % end, 0)      # fixed width: overwrites in place
+
+    def _sync_index(self):
+        """Make the index cover the whole log (call with the lock held)."""
+        end = self._indexed_end()
+        size = os.path.getsize(self.path)
+        if end == size:
+            return
+        if end is None or end > size or end < self._data_start():
+            self.build_index()
+        else:
+            self._extend_index(end)
+
+    def _extend_index(self, end: int):
+        """Index the rows after byte `end`, dropping any entries that point past it."""
+        entries = [(d, o) for d, o in self.index() if o < end]
+        self._scan_index([f"{d},{o}\n" for d, o in entries], entries[-1][0] if entries else None, end)
+
+    def build_index(self):
+        """(Re)build the day index with one scan of the log (e.g. for logs written before it existed)."""
+        with self.lock:
+            self._scan_index([], None, self._data_start())
+
+    def _scan_index(self, entries, last, offset):
+        with self.lock:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if line.strip():
+                        day = self._line_day(line)
+                        if day != last:
+                            entries.append(f"{day},{offset}\n")
+                            last = day
+                    offset += len(line)
+            tmp = self.index_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(''.join(entries))
+            os.replace(tmp, self.index_path)
+            self._idx_state = (-1, None)
+            self._set_indexed_end(offset)
+
+    def index(self):
+        """[(day, byte offset)] for each run of same-day rows, in file order."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding='utf-8') as f:
+            return [(d, int(o)) for d, o in (line.rstrip('\n').split(',') for line in f if line.strip())]
+
+    # ------------------------------
+    # Queries
+    # ------------------------------
+    def read_range(self, start=None, end=None) -> pd.DataFrame:
+        """Rows whose day lies in [start, end] (inclusive; None = open). Reads only the matching byte runs."""
+        lo, hi = _day(start), _day(end)
+        self.flush()
+        with self.lock:
+            self._sync_index()
+            entries = self.index()
+            size = os.path.getsize(self.path)
+            runs = []
+            for (day, s), nxt in zip(entries, entries[1:] + [(None, size)]):
+                if (lo is None or day >= lo) and (hi is None or day <= hi):
+                    if runs and runs[-1][1] == s:
+                        runs[-1][1] = nxt[1]
+                    else:
+                        runs.append([s, nxt[1]])
+            chunks = []
+            with open(self.path, 'rb') as f:
+                for s, e in runs:
+                    f.seek(s)
+                    chunks.append(f.read(e - s))
+        return self._decode(b''.join(chunks))
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """The last n rows, read backwards from the end of the file."""
+        self.flush()
+        with self.lock:
+            start = self._data_start()
+            with open(self.path, 'rb') as f:
+                pos = f.seek(0, os.SEEK_END)
+                data = b''
+                while pos > start and data.count(b'\n') <= n:
+                    step = min(1 << 16, pos - start)
+                    pos -= step
+                    f.seek(pos)
+                    data = f.read(step) + data
+        lines = data.splitlines(keepends=True)
+        return self._decode(b''.join(lines[-n:] if n > 0 else []))
+
+    def read_since(self, cursor=None):
+        """Rows appended after `cursor` (None = from the start) and the new cursor (a byte offset)."""
+        self.flush()
+        with self.lock:
+            start = self._data_start() if cursor is None else cursor
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                data = f.read()
+        data = data[:data.rfind(b'\n') + 1]
+        return self._decode(data), start + len(data)
+
+
+class CSVAppendStore(_LineStore):
+    """CSV log, compatible with files written by the original pandas round-trip."""
+    def header(self):
+        return ','.join(self.columns) + '\n'
+
+    def _encode(self, rows):
+        out = io.StringIO()
+        w = csv.writer(out, lineterminator='\n')
+        cols = self.columns
+        lines = []
+        for row in rows:
+            w.writerow([row.get(c, '') for c in cols])
+            lines.append(out.getvalue())
+            out.seek(0)
+            out.truncate()
+        return lines
+
+    def _data_start(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'rb') as f:
+            return len(f.readline())
+
+    def _file_header(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.readline() or self.header().encode('utf-8')
+
+    def _line_day(self, line):
+        return line.split(b',', 1)[0].decode('utf-8')
+
+    def _decode(self, data):
+        if not data.strip():
+            return pd.DataFrame(columns=self.columns)
+        return pd.read_csv(io.BytesIO(self._file_header() + data))
+
+    def read(self) -> pd.DataFrame:
+        self.flush()
+        with self.lock:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                return pd.DataFrame(columns=self.columns)
+            return pd.read_csv(self.path)
+
+
+class JSONLStore(_LineStore):
+    """One JSON object per line."""
+    def _encode(self, rows):
+        return [json.dumps(row, default=_json_default) + '\n' for row in rows]
+
+    def _line_day(self, line):
+        return str(json.loads(line).get(DAY_COLUMN))
+
+    def _decode(self, data):
+        records = [json.loads(line) for line in data.splitlines() if line.strip()]
+        return pd.DataFrame.from_records(records, columns=self.columns)
+
+    def read(self) -> pd.DataFrame:
+        self.flush()
+        with self.lock:
+            if not os.path.exists(self.path):
+                return pd.DataFrame(columns=self.columns)
+            with open(self.path, 'rb') as f:
+                return self._decode(f.read())
+
+
+def _json_default(v):
+    # NumPy scalars (e.g. np.bool_ from an array comparison)
+    if hasattr(v, 'item'):
+        return v.item()
+    raise TypeError(f"Object of type {type(v).__name__} is not JSON serializable")
+
+
+def _day(x):
+    """'YYYY-MM-DD' for a date / datetime / string (None passes through)."""
+    if x is None:
+        return None
+    if hasattr(x, 'strftime'):
+        return x.strftime('%Y-%m-%d')
+    return str(x)
+
+# ------------------------------
+# Columnar segments
+# ------------------------------
+
+class SegmentStore(LogStore):
+    """
+    Directory of immutable columnar segments. Each flush writes one new
+    segment (so use buffer_size >> 1); once `compact_every` segments have
+    piled up they are merged into one. Segment names sort in write order.
+    Per-segment day range and row count are cached, so range / tail reads
+    open only the segments they need.
+      fmt : 'parquet' or 'arrow' (Arrow IPC / Feather v2)
+    """
+    def __init__(self, path: str, fmt: str = 'parquet', compact_every: int = 64, buffer_size: int = 1024, **kw):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("SegmentStore requires pyarrow (pip install pyarrow)") from None
+        if fmt not in ('parquet', 'arrow'):
+            raise ValueError(f"Unknown segment format: {fmt!r}")
+        os.makedirs(path, exist_ok=True)
+        super().__init__(path, buffer_size=buffer_size, **kw)
+        self.fmt = fmt
+        self.compact_every = compact_every
+        self._pa = pyarrow
+        self._seq = 0
+        self._info = {}   # segment path -> (first day, last day, rows)
+
+    def _lock_path(self):
+        return os.path.join(self.path, '.lock')
+
+    def segments(self):
+        ext = '.' + self.fmt
+        return sorted(os.path.join(self.path, n) for n in os.listdir(self.path) if n.endswith(ext))
+
+    def _write(self, rows):
+        table = self._pa.Table.from_pylist([{c: r.get(c) for c in self.columns} for r in rows])
+        self._seq += 1
+        name = f"seg-{time.time_ns():020d}-{os.getpid()}-{self._seq:06d}.{self.fmt}"
+        self._write_table(table, os.path.join(self.path, name))
+        if len(self.segments()) >= self.compact_every:
+            self.compact()
+
+    def _write_table(self, table, path):
+        tmp = path + '.tmp'
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, tmp)
+        if self._should_sync():
+            fd = os.open(tmp, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._synced()
+        os.replace(tmp, path)
+
+    def _read_table(self, path, columns=None):
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.read_table(path, columns=columns)
+        import pyarrow.feather as feather
+        return feather.read_table(path, columns=columns)
+
+    def _segment_info(self, seg):
+        if seg not in self._info:
+            days = self._read_table(seg, columns=[DAY_COLUMN]).column(0).to_pylist()
+            self._info[seg] = (min(days), max(days), len(days)) if days else (None, None, 0)
+        return self._info[seg]
+
+    def _concat(self, tables) -> pd.DataFrame:
+        if not tables:
+            return pd.DataFrame(columns=self.columns)
+        return self._pa.concat_tables(tables).to_pandas()
+
+    def compact(self):
+        """Merge all segments into one (named after the newest, so order is kept)."""
+        with self.lock:
+            segs = self.segments()
+            if len(segs) < 2:
+                return
+            table = self._pa.concat_tables([self._read_table(s) for s in segs])
+            root, ext = os.path.splitext(segs[-1])
+            self._write_table(table, root + 'c' + ext)
+            for s in segs:
+                os.remove(s)
+                self._info.pop(s, None)
+
+    def read(self) -> pd.DataFrame:
+        self.flush()
+        with self.lock:
+            return self._concat([self._read_table(s) for s in self.segments()])
+
+    def read_range(self, start=None, end=None) -> pd.DataFrame:
+        """Rows whose day lies in [start, end] (inclusive); segments outside the range are skipped."""
+        lo, hi = _day(start), _day(end)
+        self.flush()
+        with self.lock:
+            tables = []
+            for seg in self.segments():
+                first, last, n = self._segment_info(seg)
+                if n and (lo is None or last >= lo) and (hi is None or first <= hi):
+                    tables.append(self._read_table(seg))
+        df = self._concat(tables)
+        mask = pd.Series(True, index=df.index)
+        if lo is not None:
+            mask &= df[DAY_COLUMN] >= lo
+        if hi is not None:
+            mask &= df[DAY_COLUMN] <= hi
+        return df[mask].reset_index(drop=True)
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """The last n rows, opening segments newest-first until enough are collected."""
+        self.flush()
+        with self.lock:
+            tables, got = [], 0
+            for seg in reversed(self.segments()):
+                if got >= n:
+                    break
+                t = self._read_table(seg)
+                tables.insert(0, t)
+                got += t.num_rows
+        df = self._concat(tables)
+        return df.iloc[max(0, len(df) - n):].reset_index(drop=True)
+
+    def read_since(self, cursor=None):
+        """Rows appended after `cursor` (None = from the start) and the new cursor (a row count)."""
+        self.flush()
+        start = cursor or 0
+        with self.lock:
+            tables, seen = [], 0
+            for seg in self.segments():
+                n = self._segment_info(seg)[2]
+                if seen + n > start:
+                    tables.append(self._read_table(seg).slice(max(0, start - seen)))
+                seen += n
+        return self._concat(tables), max(seen, start)
+
+# ------------------------------
+# Incremental aggregates
+# ------------------------------
+
+class TrackerStats:
+    """
+    Running aggregates over a tracker log: rolling Lock rate over the last
+    `window` entries, and per-ISO-week entry count, Lock rate and mean Delta_Z.
+    sync(store) folds in only the rows appended since the previous call (by
+    this or any other process), so nothing is recomputed from scratch.
+    """
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.n = 0
+        self.locks = 0
+        self._recent = deque(maxlen=window)
+        self._recent_locks = 0
+        self._weeks = {}       # 'YYYY-Www' -> [entries, locks, sum Delta_Z]
+        self.cursor = None
+
+    def sync(self, store: LogStore) -> "TrackerStats":
+        df, self.cursor = store.read_since(self.cursor)
+        if len(df):
+            self.add_frame(df)
+        return self
+
+    def add(self, row: dict):
+        lock = bool(row['Lock'])
+        self.n += 1
+        self.locks += lock
+        if len(self._recent) == self.window:
+            self._recent_locks -= self._recent[0]
+        self._recent.append(lock)
+        self._recent_locks += lock
+        w = self._weeks.setdefault(_iso_week(str(row[DAY_COLUMN])), [0, 0, 0.0])
+        w[0] += 1
+        w[1] += lock
+        w[2] += float(row['Delta_Z'])
+
+    def add_frame(self, df: pd.DataFrame):
+        """Vectorized add for a block of rows (in append order)."""
+        lock = df['Lock'].astype(bool)
+        self.n += len(df)
+        self.locks += int(lock.sum())
+        for v in lock.iloc[-self.window:].tolist():
+            if len(self._recent) == self.window:
+                self._recent_locks -= self._recent[0]
+            self._recent.append(v)
+            self._recent_locks += v
+        weeks = df[DAY_COLUMN].astype(str).map(_iso_week)
+        g = pd.DataFrame({'week': weeks, 'lock': lock, 'dz': df['Delta_Z'].astype(float)}).groupby('week', sort=False)
+        for week, n, locks, dz in zip(g.size().index, g.size().tolist(), g['lock'].sum().tolist(), g['dz'].sum().tolist()):
+            w = self._weeks.setdefault(week, [0, 0, 0.0])
+            w[0] += n
+            w[1] += int(locks)
+            w[2] += dz
+
+    def rolling_lock_rate(self) -> float:
+        """Lock rate over the last `window` entries (nan when empty)."""
+        return self._recent_locks / len(self._recent) if self._recent else float('nan')
+
+    def lock_rate(self) -> float:
+        return self.locks / self.n if self.n else float('nan')
+
+    def weekly(self) -> pd.DataFrame:
+        """Per ISO week: entries, lock_rate, mean_delta_z."""
+        weeks = sorted(self._weeks)
+        rows = [self._weeks[w] for w in weeks]
+        return pd.DataFrame({'entries': [r[0] for r in rows],
+                             'lock_rate': [r[1] / r[0] for r in rows],
+                             'mean_delta_z': [r[2] / r[0] for r in rows]},
+                            index=pd.Index(weeks, name='week'))
+
+
+@lru_cache(maxsize=4096)
+def _iso_week(day: str) -> str:
+    y, w, _ = datetime.date.fromisoformat(day).isocalendar()
+    return f"{y}-W{w:02d}"
+
+# ------------------------------
+# Factory
+# ------------------------------
+
+def open_store(path: str, **kw) -> LogStore:
+    """Pick a backend from the path: *.csv, *.jsonl, or a directory / *.parquet / *.arrow for segments."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.jsonl':
+        return JSONLStore(path, **kw)
+    if ext in ('.parquet', '.arrow'):
+        return SegmentStore(path, fmt=ext[1:], **kw)
+    if os.path.isdir(path):
+        return SegmentStore(path, **kw)
+    return CSVAppendStore(path, **kw)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    rows = 200_000
+    block = 20_000
+    row = {"Date": "2025-01-01", "Time": "12:00:00", "R": 4.0, "Omega": 2.0,
+           "Z_pre": 3.0, "Z_post": 2.0, "Delta_Z": -1.0, "Lock": True}
+    print("--- Tracker append latency (µs/row) by log size ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, path, kw in (("csv", "log.csv", {}), ("jsonl", "log.jsonl", {}),
+                               ("csv buffered", "buf.csv", {"buffer_size": 256})):
+            with open_store(os.path.join(tmp, path), fsync='never', **kw) as store:
+                lat = []
+                for b in range(rows // block):
+                    t0 = time.perf_counter()
+                    for k in range(block):
+                        row["Date"] = str(datetime.date(2025, 1, 1) + datetime.timedelta(days=(b * block + k) // 500))
+                        store.append(row)
+                    lat.append((time.perf_counter() - t0) / block * 1e6)
+                n = len(store)
+            print(f"{name:>13}: first {lat[0]:6.2f}  last {lat[-1]:6.2f}   ({n:,} rows)")
+
+        print("--- Queries on the 200k-row CSV log (ms) ---")
+        store = open_store(os.path.join(tmp, "log.csv"))
+        stats = TrackerStats()
+        for label, fn in (("full read", store.read),
+                          ("tail(14)", lambda: store.tail(14)),
+                          ("one day", lambda: store.read_range("2025-03-01", "2025-03-01")),
+                          ("stats bootstrap", lambda: stats.sync(store)),
+                          ("stats after +1 row", lambda: (store.append(row), stats.sync(store)))):
+            t0 = time.perf_counter()
+            fn()
+            print(f"{label:>18}: {(time.perf_counter() - t0) * 1e3:8.2f}")
+        print(stats.weekly().tail(3))
+        store.close()
@@ -0,0 +1,248 @@
+"""
+Parity of the shared RLEC kernel with the original per-front-end update loops.
+
+The reference functions below are the Euler loops as they stood before the
+front-ends were routed through loveos_engine.RLECEngine; fixed-seed turn
+sequences are replayed through both and the states compared after every turn.
+"""
+
+import asyncio
+import math
+import random
+
+import numpy as np
+import pytest
+
+import core
+import loveos_llm_bridge
+import loveos_schools
+from core import LoveOS_Physics, LoveOS_PhysicsBatch
+from loveos_async_bridge import AsyncContextBridge
+from loveos_context_bridge import ContextBridge
+from loveos_llm_bridge import LoveOSParams
+from loveos_schools import SCHOOLS, DigitalTwin, Params, TwinBatch
+
+TOL = dict(rtol=1e-12, atol=1e-12)
+TURNS = 300
+TEXTS = ["Hi, how are you?", "You are terrible at this!", "Why are you so slow? This is useless!",
+         "Wait, I'm sorry, I didn't mean that.", "Thank you for understanding.", "バカ！使えない",
+         "ありがとう、助かる", "Can you explain that again?", "I hate this!!!", "great, thanks!"]
+
+# ------------------------------
+# Reference loops (original implementations)
+# ------------------------------
+def ref_core_step(z, params, delta_val, ritual_type, dt=0.5, steps_per_turn=5):
+    """core.LoveOS_Physics.step"""
+    uL, uC, uE = 0.0, 0.0, 0.0
+    eff_delta = float(delta_val)
+    if ritual_type == 'BREATH':
+        uE = -0.3
+        uC = +0.2
+        eff_delta *= 0.6
+    elif ritual_type == 'LABEL':
+        uL = +0.3
+        eff_delta *= 0.8
+    z = np.array(z, dtype=float)
+    for _ in range(steps_per_turn):
+        R, L, E, C = z
+        p = params
+        dR = p['aR'] * eff_delta - p['bR'] * L * R - p['gR'] * C * R
+        dL = p['aL'] * C - p['bL'] * E * R - p['dL'] * L + uL
+        dE = p['aE'] * abs(eff_delta) - p['bE'] * L - p['dE'] * E + uE
+        dC = -p['aC'] * R + p['bC'] * L - p['dC'] * C + uC
+        z += np.array([dR, dL, dE, dC]) * (dt / steps_per_turn)
+        z = np.clip(z, -2.0, 2.0)
+    return z
+
+
+def _clamp(x, lo, hi):
+    return max(lo, min(hi, x))
+
+
+def ref_rlec_loop(z, p, delta, uL, uC, uE, dt=0.5, steps=5):
+    """Euler loop shared by loveos_llm_bridge.LoveOSState and loveos_schools.RLEC (clip -2..3)"""
+    R, L, E, C = z
+    for _ in range(steps):
+        dR = p.aR*delta - p.bR*L*R - p.gR*C*R
+        dL = p.aL*C - p.bL*E*R - p.dL*L + uL
+        dE = p.aE*abs(delta) - p.bE*L - p.dE*E + uE
+        dC = -p.aC*R + p.bC*L - p.dC*C + uC
+        R, L, E, C = (_clamp(R + (dt/steps)*dR, -2.0, 3.0), _clamp(L + (dt/steps)*dL, -2.0, 3.0),
+                      _clamp(E + (dt/steps)*dE, -2.0, 3.0), _clamp(C + (dt/steps)*dC, -2.0, 3.0))
+    return R, L, E, C
+
+
+def ref_bridge_step(z, p, delta, ritual):
+    """loveos_llm_bridge.LoveOSState.step_from_delta"""
+    uL, uC, uE = 0.0, 0.0, 0.0
+    if ritual == 'BREATH':
+        uE = -0.5; uC = +0.3; delta *= 0.5
+    elif ritual == 'LABEL':
+        uL = +0.4; delta *= 0.8
+    elif ritual == 'ACCEPT':
+        uL = +0.2; uE = -0.3
+    return ref_rlec_loop(z, p, delta, uL, uC, uE)
+
+
+def ref_context_turn(z, p, perception, text):
+    """loveos_context_bridge.ContextBridge.process_turn (physics part): new state and ritual"""
+    uV, uA = perception.estimate_VA(text)
+    impact = 0.8 * uA - 0.6 * uV
+    ritual = None
+    if z[2] > 0.8:
+        ritual = 'BREATH'
+    elif z[0] > 0.8:
+        ritual = 'LABEL'
+    return ref_bridge_step(z, p, impact, ritual), ritual
+
+
+class _RefState:
+    """Attribute view of a reference state for the school policy functions."""
+    def __init__(self, z):
+        self.R, self.L, self.E, self.C = z
+
+
+def ref_twin_step(z, spec, p, V, A):
+    """loveos_schools.DigitalTwin.step (physics part): new state and ritual"""
+    raw_delta = spec.delta_func(V, A)
+    ritual_name = spec.policy_func(_RefState(z), V, A)
+    eff = loveos_schools.RITUALS.get(ritual_name, loveos_schools.RITUALS['NONE'])
+    eff_delta = raw_delta * eff['d_scale']
+    return ref_rlec_loop(z, p, eff_delta, eff['uL'], eff['uC'], eff['uE']), ritual_name
+
+# ------------------------------
+# Core
+# ------------------------------
+def _core_turns(seed, n=TURNS):
+    rng = random.Random(seed)
+    return [(rng.uniform(-2.0, 3.0), rng.choice([None, 'BREATH', 'LABEL'])) for _ in range(n)]
+
+
+def test_core_physics_matches_reference():
+    phys = LoveOS_Physics()
+    z = phys.z.copy()
+    for d, r in _core_turns(1):
+        phys.step(d, r)
+        z = ref_core_step(z, phys.params, d, r)
+        np.testing.assert_allclose(phys.z, z, **TOL)
+
+
+def test_engine_turn_matches_reference():
+    params = LoveOS_Physics().params
+    z_ref = z = (0.1, 0.5, 0.2, 0.5)
+    for d, r in _core_turns(2):
+        z = core.ENGINE.turn(z, params, d, r)
+        z_ref = ref_core_step(z_ref, params, d, r)
+        np.testing.assert_allclose(z, z_ref, **TOL)
+
+
+def test_physics_batch_matches_reference():
+    n = 16
+    rng = np.random.default_rng(3)
+    z0 = rng.uniform(-1.0, 1.5, (n, 4))
+    bR = rng.uniform(0.5, 1.0, n)
+    batch = LoveOS_PhysicsBatch(n, z0=z0, params={'bR': bR})
+    refs = [z0[i].copy() for i in range(n)]
+    names = [None, 'BREATH', 'LABEL']
+    for _ in range(TURNS):
+        deltas = rng.uniform(-2.0, 3.0, n)
+        rituals = [names[c] for c in rng.integers(0, 3, n)]
+        batch.step(deltas, rituals)
+        for i in range(n):
+            params = dict(LoveOS_Physics().params, bR=bR[i])
+            refs[i] = ref_core_step(refs[i], params, deltas[i], rituals[i])
+        np.testing.assert_allclose(batch.z, np.array(refs), **TOL)
+
+# ------------------------------
+# ContextBridge / LoveOSState
+# ------------------------------
+def _texts(seed, n=TURNS):
+    rng = random.Random(seed)
+    return [rng.choice(TEXTS) for _ in range(n)]
+
+
+def test_bridge_state_matches_reference():
+    rng = random.Random(4)
+    state = loveos_llm_bridge.LoveOSState()
+    z = (state.R, state.L, state.E, state.C)
+    for _ in range(TURNS):
+        d, r = rng.uniform(-2.0, 3.0), rng.choice([None, 'BREATH', 'LABEL', 'ACCEPT'])
+        state.step_from_delta(d, r)
+        z = ref_bridge_step(z, state.p, d, r)
+        np.testing.assert_allclose((state.R, state.L, state.E, state.C), z, **TOL)
+
+
+def test_context_bridge_matches_reference():
+    bridge = ContextBridge()
+    s = bridge.state
+    z = (s.R, s.L, s.E, s.C)
+    for text in _texts(5):
+        out = bridge.process_turn(text)
+        z, ritual = ref_context_turn(z, s.p, bridge.perception, text)
+        assert out['ritual'] == str(ritual)
+        np.testing.assert_allclose((s.R, s.L, s.E, s.C), z, **TOL)
+
+
+def test_async_bridge_turn_batch_matches_reference():
+    """Interleaved sessions through AsyncContextBridge (grouped RLECEngine.turn_batch)."""
+    sessions = {f"s{i}": _texts(10 + i, 60) for i in range(8)}
+    bridge = AsyncContextBridge()
+
+    async def run():
+        async def user(sid, texts):
+            for text in texts:
+                await bridge.process_turn(sid, text)
+        await asyncio.gather(*(user(sid, texts) for sid, texts in sessions.items()))
+    asyncio.run(run())
+    assert bridge.stats['max_batch'] > 1
+
+    p = LoveOSParams()
+    for sid, texts in sessions.items():
+        z = (0.1, 0.5, 0.2, 0.5)
+        for text in texts:
+            z, _ = ref_context_turn(z, p, bridge.perception, text)
+        st = bridge.state(sid)
+        np.testing.assert_allclose((st['R'], st['L'], st['E'], st['C']), z, **TOL)
+
+# ------------------------------
+# DigitalTwin / TwinBatch
+# ------------------------------
+def _va(seed, n=TURNS):
+    rng = random.Random(seed)
+    return [(rng.uniform(-1.0, 1.0), rng.uniform(0.0, 2.0)) for _ in range(n)]
+
+
+@pytest.mark.parametrize('spec', SCHOOLS, ids=lambda s: s.name)
+def test_digital_twin_matches_reference(spec):
+    twin = DigitalTwin(spec)
+    p = spec.param_shifter(Params())
+    s = twin.state
+    z = (s.R, s.L, s.E, s.C)
+    for turn, (V, A) in enumerate(_va(6)):
+        row = twin.step(V, A, turn)
+        z, ritual = ref_twin_step(z, spec, p, V, A)
+        assert row['Ritual'] == ritual
+        np.testing.assert_allclose((s.R, s.L, s.E, s.C), z, **TOL)
+
+
+@pytest.mark.parametrize('spec', SCHOOLS, ids=lambda s: s.name)
+def test_twin_batch_matches_reference(spec):
+    n = 8
+    batch = TwinBatch(spec, n=n)
+    p = spec.param_shifter(Params())
+    refs = [tuple(batch.Z[i]) for i in range(n)]
+    rng = np.random.default_rng(7)
+    for _ in range(TURNS):
+        V, A = rng.uniform(-1.0, 1.0, n), rng.uniform(0.0, 2.0, n)
+        batch.step(V, A)
+        refs = [ref_twin_step(refs[i], spec, p, float(V[i]), float(A[i]))[0] for i in range(n)]
+        np.testing.assert_allclose(batch.Z, np.array(refs), **TOL)
+
+
+def test_observe_matches_reference():
+    z = np.random.default_rng(8).uniform(-2.0, 3.0, (64, 4))
+    val, aro = loveos_schools.ENGINE.observe_batch(z)
+    for (R, L, E, C), v, a in zip(z, val, aro):
+        ref = (math.tanh(1.0*(-R) + 0.8*L - 1.0*E + 0.7*C), math.log1p(math.exp(0.5*abs(R) + 0.5*E)))
+        np.testing.assert_allclose(loveos_schools.ENGINE.observe(R, L, E, C), ref, **TOL)
+        np.testing.assert_allclose((v, a), ref, **TOL)